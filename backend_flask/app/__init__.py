@@ -1,51 +1,55 @@
 from __future__ import annotations
 
 from flask import Flask, jsonify
-from sqlalchemy import text
 
+from .assets import init_assets
+from .cli import (
+    compact_table_versions_command,
+    create_history_partitions_command,
+    refresh_best_prices_command,
+    setup_command,
+)
+from .compression import init_compression
+from .conditional import init_conditional
 from .config import load_settings
-from .database import init_database, db
+from .database import db, engine_options, init_database, schema_is_current
+from .json_provider import OrjsonProvider
 from .routes import api_bp
 from .routes.ui import ui_bp
-from .seed import seed_reference_data
-
-
-def _apply_schema_migrations() -> None:
-    statements = [
-        """
-        alter table if exists products
-        alter column part_number type varchar(100) using part_number::text,
-        alter column pos_scheme type varchar(100) using pos_scheme::text
-        """,
-        """
-        alter table if exists request_items
-        alter column part_number type varchar(100) using part_number::text,
-        alter column pos_scheme type varchar(100) using pos_scheme::text
-        """
-    ]
-
-    for statement in statements:
-        try:
-            db.session.execute(text(statement))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
 
 
 def create_app() -> Flask:
     settings = load_settings()
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.update(
         SQLALCHEMY_DATABASE_URI=settings.db_uri,
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SQLALCHEMY_ENGINE_OPTIONS=engine_options(settings, settings.db_uri),
+        SQLALCHEMY_BINDS={
+            f"replica_{index}": {"url": url, **engine_options(settings, url)}
+            for index, url in enumerate(settings.db_replica_urls)
+        },
+        DB_REPLICA_BINDS=[f"replica_{index}" for index in range(len(settings.db_replica_urls))],
+        DB_REPLICA_STICKY_SECONDS=settings.db_replica_sticky_seconds,
+        DB_STATEMENT_TIMEOUT_MS=settings.db_statement_timeout_ms,
+        DB_PGBOUNCER=settings.db_pgbouncer,
         SECRET_KEY=settings.secret_key,
-        JSON_SORT_KEYS=False,
+        COMPRESS_MIN_BYTES=settings.compress_min_bytes,
+        TABLE_VERSIONS_COMPACT_SECONDS=settings.table_versions_compact_seconds,
     )
 
     init_database(app)
+    init_compression(app)
+    init_conditional(app)
+    init_assets(app)
 
     app.register_blueprint(api_bp)
     app.register_blueprint(ui_bp)
+    app.cli.add_command(setup_command)
+    app.cli.add_command(refresh_best_prices_command)
+    app.cli.add_command(compact_table_versions_command)
+    app.cli.add_command(create_history_partitions_command)
 
     @app.errorhandler(404)
     def not_found(_):
@@ -56,9 +60,10 @@ def create_app() -> Flask:
         app.logger.exception("Unhandled server error: %s", error)
         return jsonify({"message": "Internal server error"}), 500
 
+    # Migrations and seeding run once per deploy (`flask --app main setup`), not in
+    # every worker: booting only checks the schema stamp.
     with app.app_context():
-        db.create_all()
-        _apply_schema_migrations()
-        seed_reference_data()
+        schema_is_current()
+        db.session.remove()
 
     return app
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mimetypes
+import shutil
+from pathlib import Path
+from typing import Dict
+
+from flask import abort, current_app, send_from_directory, url_for
+
+from .compression import BUILD_LEVELS, COMPRESSIBLE_MIMETYPES, ENCODERS, compress, negotiate_encoding
+
+STATIC_DIRECTORY = Path(__file__).resolve().parent / "static"
+# Output of build_assets(): hashed copies, their precompressed variants and the manifest
+ASSET_DIRECTORY = STATIC_DIRECTORY / "dist"
+MANIFEST_NAME = "manifest.json"
+# Content-Encoding -> suffix of the precompressed file next to the hashed one
+ENCODING_SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+# A hashed name changes with its content, so clients may keep it for good
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+def build_assets(source: Path = STATIC_DIRECTORY, target: Path = ASSET_DIRECTORY) -> Dict[str, dict]:
+    """Copy every static file to ``target`` under a content-hashed name and precompress it.
+
+    Run at image build time (``python -c "from app.assets import build_assets; build_assets()"``).
+    Writes ``manifest.json`` mapping each source path to its hashed name and the encodings
+    stored next to it, smallest first; encodings that do not make the file smaller are skipped.
+    """
+    shutil.rmtree(target, ignore_errors=True)
+    manifest: Dict[str, dict] = {}
+    for path in sorted(source.rglob("*")):
+        if not path.is_file() or target in path.parents:
+            continue
+        relative = path.relative_to(source)
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = relative.with_name(f"{relative.stem}.{digest}{relative.suffix}")
+        destination = target / hashed
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(data)
+
+        sizes: Dict[str, int] = {}
+        if mimetypes.guess_type(path.name)[0] in COMPRESSIBLE_MIMETYPES:
+            for encoding in ENCODERS:
+                compressed = compress(data, encoding, BUILD_LEVELS[encoding])
+                if len(compressed) < len(data):
+                    destination.with_name(destination.name + ENCODING_SUFFIXES[encoding]).write_bytes(compressed)
+                    sizes[encoding] = len(compressed)
+        # Smallest first: it wins when the client accepts several encodings equally
+        encodings = sorted(sizes, key=sizes.get)
+        manifest[relative.as_posix()] = {"file": hashed.as_posix(), "encodings": encodings}
+
+    (target / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def load_manifest(directory: Path = ASSET_DIRECTORY) -> Dict[str, dict]:
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def init_assets(app) -> None:
+    """Point ``asset_url()`` in templates at the built assets, when there are any.
+
+    Without a build (local development) it falls back to the plain ``static`` URLs.
+    """
+    manifest = load_manifest()
+    app.extensions["asset_encodings"] = {entry["file"]: entry["encodings"] for entry in manifest.values()}
+
+    @app.template_global()
+    def asset_url(filename: str) -> str:
+        entry = manifest.get(filename)
+        if entry is None:
+            return url_for("static", filename=filename)
+        return url_for("ui.asset", filename=entry["file"])
+
+
+def send_asset(filename: str):
+    """Send a hashed asset, precompressed in the best encoding the client accepts."""
+    encodings = current_app.extensions["asset_encodings"].get(filename)
+    if encodings is None:
+        abort(404)
+    encoding = negotiate_encoding(encodings)
+    stored = filename + ENCODING_SUFFIXES[encoding] if encoding else filename
+    response = send_from_directory(
+        ASSET_DIRECTORY,
+        stored,
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        max_age=ASSET_MAX_AGE,
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.immutable = True
+    return response
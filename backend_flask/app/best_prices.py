@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import text
+
+from .database import db
+
+
+def refresh_best_prices(product_ids: Iterable[int]) -> None:
+    """Recompute the ``product_best_prices`` rows of ``product_ids`` in the current transaction.
+
+    Call it after flushing writes to ``supplier_product_prices``; the importer runs the same
+    SQL function after its merge, so both paths produce identical summaries.
+    """
+    ids = sorted(set(product_ids))
+    if ids:
+        db.session.execute(text("select refresh_product_best_prices(:product_ids)"), {"product_ids": ids})
+
+
+def rebuild_best_prices() -> int:
+    """Recompute the summary of every product, for writes that bypassed the API and importer."""
+    return db.session.execute(text("select refresh_product_best_prices(array(select id from products))")).scalar()
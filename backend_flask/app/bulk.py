@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, List
+
+from flask import request
+from sqlalchemy import literal_column
+
+BULK_MAX_ROWS = 100_000
+BULK_CHUNK_ROWS = 1000
+
+# RETURNING this after an upsert tells inserts from updates: xmax is only zero for new tuples
+WAS_INSERTED = literal_column("xmax = 0").label("inserted")
+
+
+def iter_bulk_payload() -> Iterator[Any]:
+    """Yield the submitted rows: a JSON array, or one JSON object per line for NDJSON bodies."""
+    if request.mimetype in ("application/x-ndjson", "application/jsonl"):
+        for line in request.stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+        return
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        raise ValueError("Body must be a JSON array or NDJSON (application/x-ndjson)")
+    yield from payload
+
+
+def bulk_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    inserted = sum(1 for result in results if result["status"] == "inserted")
+    updated = sum(1 for result in results if result["status"] == "updated")
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "failed": len(results) - inserted - updated,
+        "results": results,
+    }
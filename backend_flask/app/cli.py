@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import text
+from flask_migrate import upgrade
+from sqlalchemy.exc import IntegrityError
+
+from .best_prices import rebuild_best_prices
+from .database import db, product_identity_index_available
+from .models import Product
+from .seed import seed_reference_data
+
+
+# Price history partitions kept ready beyond the current month
+HISTORY_PARTITION_MONTHS_AHEAD = 2
+
+
+@click.command("setup")
+@with_appcontext
+def setup_command() -> None:
+    """Apply migrations and seed reference data.
+
+    Run once per deploy before starting the workers; they only check the schema stamp.
+    """
+    upgrade()
+    ensure_product_identity_index()
+    seed_reference_data()
+    disable_statement_timeout()
+    db.session.execute(text("select compact_table_versions()"))
+    db.session.execute(
+        text("select create_price_history_partitions(:months)"), {"months": HISTORY_PARTITION_MONTHS_AHEAD}
+    )
+    db.session.commit()
+    current_app.extensions["schema_current"] = True
+    click.echo("Database schema is up to date and reference data is seeded.")
+
+
+def disable_statement_timeout() -> None:
+    """Lift ``DB_STATEMENT_TIMEOUT_MS`` until the current transaction ends.
+
+    Maintenance commands build indexes and rewrite whole tables, which may outlast the limit
+    meant for API statements; migrations/env.py does the same for migrations.
+    """
+    db.session.execute(text("set local statement_timeout = 0"))
+
+
+def ensure_product_identity_index() -> None:
+    """Create ``uq_products_identity`` if migration 0002 had to skip it because of duplicates."""
+    if product_identity_index_available():
+        return
+    index = next(index for index in Product.__table__.indexes if index.name == "uq_products_identity")
+    try:
+        disable_statement_timeout()
+        index.create(db.session.connection())
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        click.echo(
+            "Warning: duplicate (part_number, name, brand) products exist, so uq_products_identity "
+            "cannot be created and POST /api/products/bulk answers 503. Merge them and rerun setup.",
+            err=True,
+        )
+
+
+@click.command("refresh-best-prices")
+@with_appcontext
+def refresh_best_prices_command() -> None:
+    """Recompute product_best_prices for the whole catalog.
+
+    The API and the importer keep it current; this is for prices changed by hand in SQL.
+    """
+    disable_statement_timeout()
+    changed = rebuild_best_prices()
+    db.session.commit()
+    click.echo(f"Best-price summary refreshed, {changed} products changed.")
+
+
+@click.command("compact-table-versions")
+@with_appcontext
+def compact_table_versions_command() -> None:
+    """Fold the logged table changes into the ETag baselines.
+
+    Every write statement appends a row to ``table_version_changes``. The workers compact it
+    every ``TABLE_VERSIONS_COMPACT_SECONDS``; this does it on demand, e.g. when that is 0.
+    """
+    disable_statement_timeout()
+    folded = db.session.execute(text("select compact_table_versions()")).scalar()
+    db.session.commit()
+    click.echo(f"Folded {folded} logged changes into table_versions.")
+
+
+@click.command("create-history-partitions")
+@click.option("--months", default=HISTORY_PARTITION_MONTHS_AHEAD, show_default=True, help="Months ahead of the current one.")
+@with_appcontext
+def create_history_partitions_command(months: int) -> None:
+    """Create the monthly price history partitions up to ``--months`` ahead.
+
+    Run it at least monthly (cron, a scheduled job); ``setup`` runs it as well. A month
+    without a partition goes to the default one, which every bounded history query still
+    scans; this moves such rows into their month's new partition. Creating a partition
+    briefly locks the history table, which is why price writes never do it themselves.
+    """
+    disable_statement_timeout()
+    created = db.session.execute(
+        text("select create_price_history_partitions(:months)"), {"months": months}
+    ).scalar()
+    db.session.commit()
+    click.echo(f"Created {created} price history partitions.")
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Levels used while answering requests, cheap enough for large JSON lists;
+# build_assets() compresses static files once with the slowest, smallest ones.
+RESPONSE_LEVELS = {"zstd": 3, "br": 5, "gzip": 6}
+BUILD_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/javascript",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/plain",
+    "image/svg+xml",
+}
+
+
+class _Gzip:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._compressor.process(data)
+        return out + self._compressor.flush() if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Content-Encoding -> compressor, in the order the server prefers when the client
+# accepts several with the same quality
+ENCODERS = {
+    **({"zstd": _Zstd} if zstandard is not None else {}),
+    **({"br": _Brotli} if brotli is not None else {}),
+    "gzip": _Gzip,
+}
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    encoder = ENCODERS[encoding](RESPONSE_LEVELS[encoding] if level is None else level)
+    return encoder.compress(data) + encoder.finish()
+
+
+def negotiate_encoding(available: Iterable[str]) -> Optional[str]:
+    """The best of ``available`` for the request's ``Accept-Encoding``, or None for identity."""
+    return request.accept_encodings.best_match(list(available))
+
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    encoder = ENCODERS[encoding](RESPONSE_LEVELS[encoding])
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            # Flush per chunk so streamed exports keep arriving while they are generated
+            out = encoder.compress(chunk, flush=True)
+            if out:
+                yield out
+        yield encoder.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def init_compression(app) -> None:
+    """Compress text responses for clients that send a matching ``Accept-Encoding``.
+
+    Bodies below ``COMPRESS_MIN_BYTES`` are sent as is; streamed responses (exports) are
+    compressed chunk by chunk. Files sent with ``send_file`` are left alone: the hashed
+    static assets are precompressed by ``build_assets``.
+    """
+    min_bytes = app.config["COMPRESS_MIN_BYTES"]
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough:
+            return response
+        response.vary.add("Accept-Encoding")
+        if response.status_code != 200 or "Content-Encoding" in response.headers or request.method == "HEAD":
+            return response
+        if not response.is_streamed and (response.content_length or 0) < min_bytes:
+            return response
+
+        encoding = negotiate_encoding(ENCODERS)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            response.set_data(compress(response.get_data(), encoding))
+        response.headers["Content-Encoding"] = encoding
+
+        # The compressed bytes differ from the identity ones: only a weak ETag still holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
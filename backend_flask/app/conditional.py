@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+
+from flask import current_app, make_response, request
+from sqlalchemy import text
+
+from .database import db
+
+# A table's version is its compacted baseline plus the changes logged since. Counting the
+# log (rather than taking a max) keeps the ETag moving when writers commit out of order;
+# the workers compact it every TABLE_VERSIONS_COMPACT_SECONDS, so the count stays short.
+VERSIONS_SQL = text(
+    """
+    select v.table_name, v.version + log.changes, greatest(v.updated_at, log.last_changed)
+    from table_versions v
+    cross join lateral (
+      select count(*) as changes, max(c.changed_at) as last_changed
+      from table_version_changes c
+      where c.table_name = v.table_name
+    ) as log
+    where v.table_name = any(:tables)
+    """
+)
+
+# Only the worker holding the lock compacts in a round; the others skip it
+COMPACT_SQL = text(
+    """
+    select compact_table_versions()
+    where pg_try_advisory_xact_lock(hashtext('compact_table_versions'))
+    """
+)
+
+
+def conditional(*tables: str):
+    """Give a GET view an ETag and Last-Modified derived from the versions of ``tables``.
+
+    Statement-level triggers append to ``table_version_changes`` on every write to those
+    tables, so reading the versions is a short index-only count per table. A matching
+    ``If-None-Match`` is answered with 304 before the view runs its query or serializes
+    anything.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            rows = db.session.execute(VERSIONS_SQL, {"tables": list(tables)}).all()
+            versions = {name: version for name, version, _ in rows}
+            etag = "-".join(str(versions.get(table, 0)) for table in tables)
+            last_modified = max((updated_at for _, _, updated_at in rows), default=None)
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                # The counters were read first: concurrent writes can only make the body newer
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def init_conditional(app) -> None:
+    """Fold ``table_version_changes`` into the baselines from a thread in every worker.
+
+    Runs every ``TABLE_VERSIONS_COMPACT_SECONDS``; 0 turns it off and leaves compaction to
+    ``flask --app main compact-table-versions``. The thread starts with the worker's first
+    request, since gunicorn forks the workers after the app is created.
+    """
+    interval = app.config["TABLE_VERSIONS_COMPACT_SECONDS"]
+    if not interval:
+        return
+    lock = threading.Lock()
+    started = {"pid": None}
+
+    @app.before_request
+    def start_compactor() -> None:
+        if started["pid"] == os.getpid():
+            return
+        with lock:
+            if started["pid"] == os.getpid():
+                return
+            started["pid"] = os.getpid()
+            thread = threading.Thread(
+                target=_compact_periodically, args=(app, interval), name="table-version-compactor", daemon=True
+            )
+            thread.start()
+
+
+def _compact_periodically(app, interval: int) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            with app.app_context(), db.engine.begin() as connection:
+                connection.execute(COMPACT_SQL)
+        except Exception as exc:  # pragma: no cover - depends on the database going away
+            app.logger.warning("Compacting table_version_changes failed: %s", exc)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import List
 
 from dotenv import load_dotenv
 
@@ -12,6 +14,24 @@ class Settings:
     secret_key: str
     db_uri: str
     port_backend: int
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    db_pgbouncer: bool = False
+    db_replica_urls: List[str] = field(default_factory=list)
+    db_replica_sticky_seconds: int = 10
+    compress_min_bytes: int = 1024
+    table_versions_compact_seconds: int = 60
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
 
 def load_settings() -> Settings:
@@ -20,8 +40,6 @@ def load_settings() -> Settings:
         load_dotenv(env_path)
     load_dotenv()
 
-    import os
-
     flask_env = os.getenv("FLASK_ENV", "development")
     secret_key = os.getenv("SECRET_KEY", "change-me")
     port_backend = int(os.getenv("PORT_BACKEND", "3000"))
@@ -35,4 +53,15 @@ def load_settings() -> Settings:
         secret_key=secret_key,
         db_uri=db_uri,
         port_backend=port_backend,
+        db_pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        db_pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        db_statement_timeout_ms=int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000")),
+        db_pgbouncer=_env_bool("DB_PGBOUNCER", False),
+        db_replica_urls=[url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()],
+        db_replica_sticky_seconds=int(os.getenv("DB_REPLICA_STICKY_SECONDS", "10")),
+        compress_min_bytes=int(os.getenv("COMPRESS_MIN_BYTES", "1024")),
+        table_versions_compact_seconds=int(os.getenv("TABLE_VERSIONS_COMPACT_SECONDS", "60")),
     )
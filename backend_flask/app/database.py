@@ -1,10 +1,188 @@
+import random
+import time
+from pathlib import Path
+
+from alembic.script import ScriptDirectory
+from flask import current_app, g, has_app_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
+from sqlalchemy import event, make_url, text
+from sqlalchemy.exc import ProgrammingError
+
+from .metrics import InstrumentedQueuePool
+
+# Requests that may read from a replica; everything else is a write and pins the client
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Holds the epoch second until which the client reads from the primary after a write
+STICKY_PRIMARY_COOKIE = "db_primary_until"
+
+
+class RoutingSession(Session):
+    """Session that sends the reads of replica-routed requests to ``g.db_replica``.
 
-db = SQLAlchemy()
+    Flushes and explicit binds always go to the primary, so a stray write inside a GET
+    fails on the read-only replica instead of going unnoticed.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            replica = g.get("db_replica")
+            if replica is not None:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Sessions are scoped to the Flask app context, a contextvar, so each thread or gevent
+# greenlet gets its own; gunicorn.conf.py makes psycopg2 yield to gevent while it waits.
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
 
+MIGRATIONS_DIRECTORY = Path(__file__).resolve().parent.parent / "migrations"
+
+# Objects that exist outside the models: optional pg_trgm indexes, the trigger-maintained
+# ETag counters and their change log, and the trigger-written price history with its
+# monthly partitions. Autogenerate should neither create nor drop them.
+UNMANAGED_OBJECTS = {
+    "ix_products_part_number_trgm",
+    "ix_products_name_trgm",
+    "table_versions",
+    "table_version_changes",
+    "supplier_product_price_history",
+}
+PRICE_HISTORY_PARTITION_PREFIX = "supplier_product_price_history_"
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(PRICE_HISTORY_PARTITION_PREFIX):
+        return False
+    return name not in UNMANAGED_OBJECTS
+
+
+def engine_options(settings, db_uri: str) -> dict:
+    """Engine options for the pool and timeout ``Settings``, for the primary or a replica."""
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    connect_args = {}
+    if settings.db_pgbouncer:
+        # Transaction pooling gives each transaction whichever server connection is free, so
+        # nothing session-level may be relied on: no startup options and no prepared
+        # statements (psycopg 3 prepares repeated queries; psycopg2 never does).
+        if make_url(db_uri).get_driver_name() == "psycopg":
+            connect_args["prepare_threshold"] = None
+    elif settings.db_statement_timeout_ms:
+        connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
 def init_database(app):
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, directory=str(MIGRATIONS_DIRECTORY), include_object=include_object)
+
+    timeout_ms = app.config.get("DB_STATEMENT_TIMEOUT_MS")
+    if app.config.get("DB_PGBOUNCER") and timeout_ms:
+        # Behind PgBouncer the timeout has to be re-applied inside every transaction
+        def set_statement_timeout(connection):
+            connection.exec_driver_sql(f"set local statement_timeout = {int(timeout_ms)}")
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, "begin", set_statement_timeout)
+
+    if app.config.get("DB_REPLICA_BINDS"):
+        init_replica_routing(app)
+
+
+def init_replica_routing(app):
+    """Route the API's read requests to a random replica, except right after a client's write.
+
+    The client is pinned to the primary with a cookie for ``DB_REPLICA_STICKY_SECONDS`` after
+    every successful write, so it reads its own changes despite replication lag.
+    """
+    replicas = app.config["DB_REPLICA_BINDS"]
+    sticky_seconds = app.config["DB_REPLICA_STICKY_SECONDS"]
+
+    @app.before_request
+    def choose_database():
+        if request.blueprint != "api" or request.method not in READ_METHODS:
+            return
+        try:
+            primary_until = float(request.cookies.get(STICKY_PRIMARY_COOKIE, 0))
+        except ValueError:
+            primary_until = 0
+        if primary_until < time.time():
+            g.db_replica = random.choice(replicas)
+
+    @app.after_request
+    def pin_writer_to_primary(response):
+        if request.blueprint == "api" and request.method not in READ_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_PRIMARY_COOKIE,
+                str(int(time.time()) + sticky_seconds),
+                max_age=sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def schema_is_current() -> bool:
+    """Compare the database's Alembic stamp with the migration head.
+
+    Costs one query, so workers can check on boot instead of migrating; the answer is
+    cached once the schema is current. ``flask --app main setup`` brings it up to date.
+    """
+    if current_app.extensions.get("schema_current"):
+        return True
+
+    expected = set(ScriptDirectory(str(MIGRATIONS_DIRECTORY)).get_heads())
+    try:
+        stamped = set(db.session.execute(text("select version_num from alembic_version")).scalars())
+    except ProgrammingError:
+        # No alembic_version table: the database was never migrated
+        db.session.rollback()
+        stamped = set()
+
+    current = stamped == expected
+    current_app.extensions["schema_current"] = current
+    if not current:
+        current_app.logger.warning(
+            "Database schema is at %s, expected %s; run `flask --app main setup`",
+            ", ".join(sorted(stamped)) or "no revision",
+            ", ".join(sorted(expected)),
+        )
+    return current
+
+
+def trigram_available() -> bool:
+    available = current_app.extensions.get("pg_trgm")
+    if available is None:
+        available = bool(
+            db.session.execute(
+                text("select exists (select 1 from pg_extension where extname = 'pg_trgm')")
+            ).scalar()
+        )
+        current_app.extensions["pg_trgm"] = available
+    return available
+
+
+def product_identity_index_available() -> bool:
+    """Whether ``uq_products_identity`` exists; migration 0002 skips it while products are duplicated.
+
+    Only a positive answer is cached, so workers notice once the duplicates are merged and
+    ``flask --app main setup`` has created the index.
+    """
+    if current_app.extensions.get("uq_products_identity"):
+        return True
+    available = db.session.execute(text("select to_regclass('uq_products_identity') is not null")).scalar()
+    current_app.extensions["uq_products_identity"] = available
+    return available
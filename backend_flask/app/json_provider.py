@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import decimal
+import uuid
+from datetime import date
+from typing import Any, Optional
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # The fallbacks of Flask's default provider for types orjson leaves to us
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Output matches the default provider except that keys keep the order the serializers
+    build them in and NaN/Infinity become ``null``. ``response`` puts the encoded bytes
+    straight into the body instead of round-tripping them through ``str``.
+    """
+
+    mimetype = "application/json"
+    # None indents in debug mode only, like the default provider
+    compact: Optional[bool] = None
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """UTF-8 JSON for ``obj``, for bodies that are cached or streamed as bytes."""
+        option = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy import text
+
+from .database import db, trigram_available
+from .models import NORMALIZED_PART_NUMBER, RequestItem
+
+# Trigram matches below this similarity are too risky to price automatically
+# (e.g. "A-20611" vs "A-20612").
+FUZZY_MIN_SIMILARITY = 0.7
+
+_FUZZY_MATCH = """
+left join lateral (
+  select p.id
+  from products p
+  where i.product_id is null and exact.id is null and normalized.id is null
+    and p.part_number % i.part_number
+    and similarity(p.part_number, i.part_number) >= :min_similarity
+  order by similarity(p.part_number, i.part_number) desc, coalesce(lower(p.brand) = lower(i.brand), false) desc, p.id
+  limit 1
+) fuzzy on true
+"""
+
+_MATCH_SQL = """
+with items as (
+  select t.position, t.product_id, t.part_number, t.brand,
+         {normalized_item} as normalized_part_number
+  from unnest(
+    cast(:positions as integer[]),
+    cast(:product_ids as integer[]),
+    cast(:part_numbers as text[]),
+    cast(:brands as text[])
+  ) as t(position, product_id, part_number, brand)
+)
+select i.position,
+       coalesce(i.product_id, exact.id, normalized.id, {fuzzy_id}) as product_id,
+       case
+         when i.product_id is not null then 'provided'
+         when exact.id is not null then 'exact'
+         when normalized.id is not null then 'normalized'
+         when {fuzzy_id} is not null then 'fuzzy'
+       end as match_type,
+       best.min_price as unit_price
+from items i
+left join lateral (
+  select p.id
+  from products p
+  where i.product_id is null and p.part_number = i.part_number
+  order by coalesce(lower(p.brand) = lower(i.brand), false) desc, p.id
+  limit 1
+) exact on true
+left join lateral (
+  select p.id
+  from products p
+  where i.product_id is null and exact.id is null and i.normalized_part_number <> ''
+    and {normalized_product} = i.normalized_part_number
+  order by coalesce(lower(p.brand) = lower(i.brand), false) desc, p.id
+  limit 1
+) normalized on true
+{fuzzy_join}
+left join lateral (
+  -- Prices in different currencies are not comparable: take the cheapest offer in the
+  -- currency most of the product's offers are quoted in
+  select b.min_price
+  from product_best_prices b
+  where b.product_id = coalesce(i.product_id, exact.id, normalized.id, {fuzzy_id})
+  order by b.min_price is null, b.offer_count desc, b.currency nulls first
+  limit 1
+) best on true
+"""
+
+
+def _match_sql(fuzzy: bool) -> str:
+    return _MATCH_SQL.format(
+        normalized_item=NORMALIZED_PART_NUMBER.format(column="t.part_number"),
+        normalized_product=NORMALIZED_PART_NUMBER.format(column="p.part_number"),
+        fuzzy_join=_FUZZY_MATCH if fuzzy else "",
+        fuzzy_id="fuzzy.id" if fuzzy else "null::integer",
+    )
+
+
+def match_request_items(items: List[RequestItem]) -> None:
+    """Resolve request items against the catalog and price them from the cheapest offer.
+
+    All items are matched in one statement: a client-supplied ``product_id`` wins, then an
+    exact part number, then a normalized one, then (with pg_trgm) the most similar part
+    number. Brand breaks ties. ``unit_price``/``total_price`` are only filled when the
+    client left them empty, from the ``product_best_prices`` row of the currency most of the
+    product's offers are quoted in.
+    """
+    if not items:
+        return
+
+    rows = db.session.execute(
+        text(_match_sql(trigram_available())),
+        {
+            "positions": list(range(len(items))),
+            "product_ids": [item.product_id for item in items],
+            "part_numbers": [item.part_number for item in items],
+            "brands": [item.brand for item in items],
+            "min_similarity": FUZZY_MIN_SIMILARITY,
+        },
+    ).mappings()
+
+    for row in rows:
+        item = items[row["position"]]
+        item.product_id = row["product_id"]
+        item.match_type = row["match_type"]
+        if item.unit_price is None:
+            item.unit_price = row["unit_price"]
+        if (
+            item.total_price is None
+            and isinstance(item.unit_price, (int, float))
+            and isinstance(item.quantity, (int, float))
+        ):
+            item.total_price = item.unit_price * item.quantity
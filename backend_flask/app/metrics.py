@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Checkout wait histogram and timeout counter for this process' connection pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.bucket_counts: List[int] = [0] * len(CHECKOUT_WAIT_BUCKETS)
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.timeouts = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            for index, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection.
+
+    The wait includes opening a new connection when the pool grows.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # Engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started)
+
+
+_METRICS = [
+    ("size", "gauge", "Configured persistent connections per process."),
+    ("checked_out", "gauge", "Connections currently in use."),
+    ("overflow", "gauge", "Connections opened beyond pool_size."),
+    ("saturation", "gauge", "Share of pool_size + max_overflow in use."),
+    ("checkout_timeouts_total", "counter", "Checkouts that gave up after pool_timeout."),
+]
+
+
+def render_pool_metrics(pools: Dict[str, InstrumentedQueuePool]) -> str:
+    """Prometheus text exposition of the pool gauges and checkout wait histogram, per pool."""
+    values: Dict[str, Dict[str, str]] = {name: {} for name, _, _ in _METRICS}
+    histogram: List[str] = []
+    for label, pool in pools.items():
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        metrics = pool.metrics
+        with metrics._lock:
+            bucket_counts = list(metrics.bucket_counts)
+            wait_count = metrics.wait_count
+            wait_sum = metrics.wait_sum
+            timeouts = metrics.timeouts
+
+        values["size"][label] = str(pool.size())
+        values["checked_out"][label] = str(checked_out)
+        values["overflow"][label] = str(max(pool.overflow(), 0))
+        values["saturation"][label] = f"{checked_out / capacity if capacity else 0:.4f}"
+        values["checkout_timeouts_total"][label] = str(timeouts)
+
+        cumulative = 0
+        for bound, count in zip(CHECKOUT_WAIT_BUCKETS, bucket_counts):
+            cumulative += count
+            histogram.append(
+                f'handbook_db_pool_checkout_wait_seconds_bucket{{pool="{label}",le="{bound}"}} {cumulative}'
+            )
+        histogram += [
+            f'handbook_db_pool_checkout_wait_seconds_bucket{{pool="{label}",le="+Inf"}} {wait_count}',
+            f'handbook_db_pool_checkout_wait_seconds_sum{{pool="{label}"}} {wait_sum:.6f}',
+            f'handbook_db_pool_checkout_wait_seconds_count{{pool="{label}"}} {wait_count}',
+        ]
+
+    lines: List[str] = []
+    for name, kind, description in _METRICS:
+        lines += [f"# HELP handbook_db_pool_{name} {description}", f"# TYPE handbook_db_pool_{name} {kind}"]
+        lines += [f'handbook_db_pool_{name}{{pool="{label}"}} {value}' for label, value in values[name].items()]
+    lines += [
+        "# HELP handbook_db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+        "# TYPE handbook_db_pool_checkout_wait_seconds histogram",
+        *histogram,
+    ]
+    return "\n".join(lines) + "\n"
@@ -3,12 +3,34 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    cast,
+    column,
+    extract,
+    table,
+    text,
+)
 from sqlalchemy.dialects.postgresql import INTERVAL
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import db
 
+# Part numbers typed as "a 20611", "A-20611" or "A20611" all normalize to "A20611"
+# (app/matching.py); backs ix_products_part_number_normalized.
+NORMALIZED_PART_NUMBER = "regexp_replace(upper({column}), '[^[:alnum:]]', '', 'g')"
+
+# How scripts/import_excel.py identifies a product; backs uq_products_identity.
+PRODUCT_IDENTITY_COLUMNS = ("part_number", "name", "coalesce(brand, '')")
+
 
 class RequestType(db.Model):
     __tablename__ = "request_types"
@@ -39,6 +61,7 @@ class ProductCategory(db.Model):
 
 class Supplier(db.Model):
     __tablename__ = "suppliers"
+    __table_args__ = (Index("ix_suppliers_name", "name"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -54,6 +77,11 @@ class Supplier(db.Model):
 
 class Product(db.Model):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_part_number", "part_number"),
+        Index("ix_products_part_number_normalized", text(NORMALIZED_PART_NUMBER.format(column="part_number"))),
+        Index("uq_products_identity", *(text(column) for column in PRODUCT_IDENTITY_COLUMNS), unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     part_number: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -79,6 +107,7 @@ class Request(db.Model):
     __tablename__ = "requests"
     __table_args__ = (
         UniqueConstraint("id_request", name="uq_requests_id_request"),
+        Index("ix_requests_datetime_coming_id", "datetime_coming", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -100,6 +129,14 @@ class SupplierProductPrice(db.Model):
     __tablename__ = "supplier_product_prices"
     __table_args__ = (
         UniqueConstraint("product_id", "supplier_id", name="uq_supplier_product"),
+        Index("ix_supplier_product_prices_supplier_id", "supplier_id"),
+        # Sort orders of GET /supplier-prices/view; the expression is LEAD_TIME_DAYS below
+        Index("ix_supplier_product_prices_total_price_id", "total_price", "id"),
+        Index(
+            "ix_supplier_product_prices_lead_time_days_id",
+            text("(CAST(EXTRACT(epoch FROM lead_time) AS FLOAT) / 86400)"),
+            "id",
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -113,10 +150,42 @@ class SupplierProductPrice(db.Model):
     supplier: Mapped[Supplier] = relationship(back_populates="prices")
 
 
+class ProductBestPrice(db.Model):
+    """Offer summary per product and currency, maintained by ``refresh_product_best_prices``.
+
+    Prices in different currencies are never compared; offers without a currency share a row.
+    """
+
+    __tablename__ = "product_best_prices"
+    __table_args__ = (
+        Index(
+            "uq_product_best_prices_product_currency",
+            "product_id",
+            "currency",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_product_best_prices_cheapest_supplier_id", "cheapest_supplier_id"),
+        Index("ix_product_best_prices_fastest_supplier_id", "fastest_supplier_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    offer_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    min_price: Mapped[Optional[float]] = mapped_column(Float)
+    currency: Mapped[Optional[str]] = mapped_column(String(30))
+    cheapest_supplier_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("suppliers.id", ondelete="SET NULL"))
+    best_lead_time_days: Mapped[Optional[float]] = mapped_column(Float)
+    fastest_supplier_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("suppliers.id", ondelete="SET NULL"))
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+
+
 class RequestItem(db.Model):
     __tablename__ = "request_items"
     __table_args__ = (
         CheckConstraint("quantity >= 0", name="chk_request_items_quantity"),
+        Index("ix_request_items_request_id", "request_id"),
+        Index("ix_request_items_product_id", "product_id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -135,6 +204,27 @@ class RequestItem(db.Model):
     total_price: Mapped[Optional[float]] = mapped_column(Float)
     request_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("requests.id"))
     product_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("products.id"))
+    match_type: Mapped[Optional[str]] = mapped_column(String(20))
 
     request: Mapped[Optional[Request]] = relationship(back_populates="items")
     product: Mapped[Optional[Product]] = relationship(back_populates="request_items")
+
+
+# Lead time as fractional days, the unit the API uses for "leadTimeDays"
+LEAD_TIME_DAYS = cast(extract("epoch", SupplierProductPrice.lead_time), Float) / 86400
+
+
+# Written only by the triggers of migration 0007 and partitioned by month, so it is not a
+# model; queries filter on valid_from so PostgreSQL can prune the months they cannot touch.
+PRICE_HISTORY = table(
+    "supplier_product_price_history",
+    column("id", Integer),
+    column("price_id", Integer),
+    column("product_id", Integer),
+    column("supplier_id", Integer),
+    column("total_price", Float),
+    column("lead_time", INTERVAL),
+    column("cy", String),
+    column("deleted", Boolean),
+    column("valid_from", DateTime(timezone=True)),
+)
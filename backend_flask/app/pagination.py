@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Dict, Optional
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not token:
+        return None
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError('Parameter "after" is not a valid cursor') from exc
+    if not isinstance(values, dict):
+        raise ValueError('Parameter "after" is not a valid cursor')
+    return values
+
+
+def parse_limit(raw: Optional[str]) -> int:
+    if raw in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError as exc:
+        raise ValueError('Parameter "limit" must be an integer') from exc
+    if limit < 1:
+        raise ValueError('Parameter "limit" must be positive')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+import select
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import current_app
+from sqlalchemy import literal, select as sql_select, union_all
+
+from .database import db
+from .models import ProductCategory, RequestStatus, RequestType
+from .seed import DEFAULT_PRODUCT_CATEGORIES, DEFAULT_REQUEST_STATUSES, DEFAULT_REQUEST_TYPES
+
+# Channel the 0004 migration's triggers notify on
+NOTIFY_CHANNEL = "reference_data"
+# Only used when notifications cannot be received (PgBouncer, drivers other than psycopg2)
+REFERENCE_CACHE_TTL = 300
+LISTEN_RETRY_SECONDS = 5
+
+REFERENCE_TABLES = {
+    "request_types": (RequestType, DEFAULT_REQUEST_TYPES),
+    "request_statuses": (RequestStatus, DEFAULT_REQUEST_STATUSES),
+    "product_categories": (ProductCategory, DEFAULT_PRODUCT_CATEGORIES),
+}
+
+
+class ReferenceCache:
+    """Reference tables loaded once per process and dropped when the database says they changed.
+
+    ``data`` maps a table name to ``{code: description}``, in the seed order (workflow order
+    for statuses) followed by any other codes. ``types_body`` is the pre-serialized
+    ``GET /api/types`` response.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Dict[str, str]]] = None
+        self._types_body: Optional[bytes] = None
+        self._loaded_at = 0.0
+        self._listener_pid: Optional[int] = None
+        self.listening = False
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._data = None
+            self._types_body = None
+
+    def _fresh(self) -> bool:
+        if self._data is None:
+            return False
+        return self.listening or time.monotonic() - self._loaded_at < REFERENCE_CACHE_TTL
+
+    def data(self) -> Dict[str, Dict[str, str]]:
+        self._ensure_listener()
+        data = self._data
+        if data is not None and self._fresh():
+            return data
+        with self._lock:
+            if not self._fresh():
+                self._data = _load_reference_data()
+                self._types_body = None
+                self._loaded_at = time.monotonic()
+            return self._data
+
+    def types_body(self) -> bytes:
+        data = self.data()
+        body = self._types_body
+        if body is None:
+            payload = {
+                table: [{"id": code, "name": description} for code, description in rows.items()]
+                for table, rows in data.items()
+            }
+            body = self._types_body = current_app.json.dumps_bytes(payload)
+        return body
+
+    def _ensure_listener(self) -> None:
+        # One listener per process; gunicorn forks after import, so check the pid
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            self.listening = False
+            engine = db.engine
+            if engine.dialect.driver != "psycopg2" or current_app.config.get("DB_PGBOUNCER"):
+                return
+            cargs, cparams = engine.dialect.create_connect_args(engine.url)
+            thread = threading.Thread(
+                target=self._listen,
+                args=(engine.dialect.loaded_dbapi, cargs, cparams, current_app.logger),
+                name="reference-cache-listener",
+                daemon=True,
+            )
+            thread.start()
+
+    def _listen(self, dbapi, cargs, cparams, logger) -> None:
+        while True:
+            connection = None
+            try:
+                connection = dbapi.connect(*cargs, **cparams)
+                connection.autocommit = True
+                connection.cursor().execute(f"listen {NOTIFY_CHANNEL}")
+                # Changes made while not listening are unknown: start from a reload
+                self.invalidate()
+                self.listening = True
+                while True:
+                    ready, _, _ = select.select([connection], [], [], 60)
+                    if not ready:
+                        # Idle for a minute: make sure the connection is still alive
+                        connection.cursor().execute("select 1")
+                        continue
+                    connection.poll()
+                    if connection.notifies:
+                        connection.notifies.clear()
+                        self.invalidate()
+            except Exception as exc:  # pragma: no cover - depends on the database going away
+                self.listening = False
+                logger.warning("Reference cache listener disconnected, falling back to a TTL: %s", exc)
+                time.sleep(LISTEN_RETRY_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+def _load_reference_data() -> Dict[str, Dict[str, str]]:
+    statement = union_all(
+        *(
+            sql_select(literal(table).label("table_name"), model.code, model.description)
+            for table, (model, _) in REFERENCE_TABLES.items()
+        )
+    )
+    rows: Dict[str, Dict[str, str]] = {table: {} for table in REFERENCE_TABLES}
+    # Always from the primary: a lagging replica right after a NOTIFY would put the old
+    # rows back into a cache that stays fresh until the next change
+    for table, code, description in db.session.execute(statement, bind_arguments={"bind": db.engine}):
+        rows[table][code] = description
+
+    data = {}
+    for table, (_, defaults) in REFERENCE_TABLES.items():
+        order = {code: position for position, code in enumerate(defaults)}
+        data[table] = dict(sorted(rows[table].items(), key=lambda item: (order.get(item[0], len(order)), item[0])))
+    return data
+
+
+def reference_cache() -> ReferenceCache:
+    cache = current_app.extensions.get("reference_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault("reference_cache", ReferenceCache())
+    return cache
+
+
+def reference_codes(table: str) -> Dict[str, str]:
+    """``{code: description}`` of a reference table, without touching the database when cached."""
+    return reference_cache().data()[table]
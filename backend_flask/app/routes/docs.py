@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from pathlib import Path
+from typing import Tuple
 
-from flask import Response, jsonify
+from flask import Response, jsonify, request
 
 from . import api_bp
 
@@ -22,15 +24,27 @@ def _locate_openapi_file() -> Path | None:
 OPENAPI_PATH = _locate_openapi_file()
 
 
-def _load_openapi_spec() -> dict | None:
+# (mtime_ns, body, etag) of the spec last read from disk
+_openapi_cache: Tuple[int, bytes, str] | None = None
+
+
+def _load_openapi_spec() -> Tuple[bytes, str] | None:
+    """Return the spec as compact JSON bytes, re-reading the file only when its mtime changes."""
+    global _openapi_cache
     if not OPENAPI_PATH:
         return None
 
     try:
-        with OPENAPI_PATH.open("r", encoding="utf-8") as fp:
-            return json.load(fp)
+        mtime_ns = OPENAPI_PATH.stat().st_mtime_ns
+        cached = _openapi_cache
+        if cached is None or cached[0] != mtime_ns:
+            with OPENAPI_PATH.open("r", encoding="utf-8") as fp:
+                spec = json.load(fp)
+            body = json.dumps(spec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            cached = _openapi_cache = (mtime_ns, body, hashlib.sha1(body).hexdigest())
     except (OSError, json.JSONDecodeError):
         return None
+    return cached[1], cached[2]
 
 
 SWAGGER_HTML = """<!DOCTYPE html>
@@ -65,7 +79,10 @@ def openapi_json():
     spec = _load_openapi_spec()
     if spec is None:
         return jsonify({"message": "OpenAPI specification not found"}), 404
-    return jsonify(spec)
+    body, etag = spec
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 
 @api_bp.get("/docs")
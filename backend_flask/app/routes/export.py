@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+from typing import Iterable, Iterator, List, Sequence, Union
+
+from flask import Response, current_app, stream_with_context
+from sqlalchemy import Select, select
+
+from ..conditional import conditional
+from ..database import db
+from ..models import LEAD_TIME_DAYS, Product, ProductCategory, Supplier, SupplierProductPrice
+from . import api_bp
+
+# Rows fetched per round trip from the server-side cursor; also the CSV flush size.
+EXPORT_BATCH_ROWS = 2000
+
+PRODUCT_EXPORT_COLUMNS = [
+    ("id", Product.id),
+    ("partNumber", Product.part_number),
+    ("name", Product.name),
+    ("brand", Product.brand),
+    ("model", Product.model),
+    ("serialNumber", Product.serial_number),
+    ("scheme", Product.scheme),
+    ("posScheme", Product.pos_scheme),
+    ("material", Product.material),
+    ("size", Product.size),
+    ("comment", Product.comment),
+    ("category", Product.category),
+    ("categoryDescription", ProductCategory.description),
+]
+
+
+def stream_rows(statement: Select) -> Iterator[Sequence]:
+    """Iterate ``statement`` through a server-side cursor, ``EXPORT_BATCH_ROWS`` at a time."""
+    result = db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_ROWS))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def batches(rows: Iterable[Sequence]) -> Iterator[List[Sequence]]:
+    iterator = iter(rows)
+    return iter(lambda: list(itertools.islice(iterator, EXPORT_BATCH_ROWS)), [])
+
+
+def csv_chunks(header: List[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # The BOM makes Excel open the UTF-8 file with Cyrillic intact
+    buffer.write("\ufeff")
+    writer.writerow(header)
+    for batch in batches(rows):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def attachment(chunks: Iterator[Union[str, bytes]], filename: str, mimetype: str) -> Response:
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@api_bp.get("/export/products.csv")
+@conditional("products", "product_categories")
+def export_products_csv():
+    statement = (
+        select(*(column for _, column in PRODUCT_EXPORT_COLUMNS))
+        .outerjoin(ProductCategory, ProductCategory.code == Product.category)
+        .order_by(Product.id)
+    )
+    header = [name for name, _ in PRODUCT_EXPORT_COLUMNS]
+    return attachment(csv_chunks(header, stream_rows(statement)), "products.csv", "text/csv")
+
+
+@api_bp.get("/export/prices.ndjson")
+@conditional("supplier_product_prices", "products", "suppliers")
+def export_prices_ndjson():
+    statement = (
+        select(
+            SupplierProductPrice.id,
+            SupplierProductPrice.product_id,
+            Product.part_number,
+            SupplierProductPrice.supplier_id,
+            Supplier.name,
+            SupplierProductPrice.total_price,
+            LEAD_TIME_DAYS,
+            SupplierProductPrice.cy,
+        )
+        .join(Product, Product.id == SupplierProductPrice.product_id)
+        .join(Supplier, Supplier.id == SupplierProductPrice.supplier_id)
+        .order_by(SupplierProductPrice.product_id, SupplierProductPrice.supplier_id)
+    )
+
+    dumps = current_app.json.dumps_bytes
+
+    def generate() -> Iterator[bytes]:
+        for batch in batches(stream_rows(statement)):
+            yield b"".join(
+                dumps(
+                    {
+                        "id": price_id,
+                        "productId": product_id,
+                        "partNumber": part_number,
+                        "supplierId": supplier_id,
+                        "supplierName": supplier_name,
+                        "totalPrice": total_price,
+                        "leadTimeDays": lead_days,
+                        "currency": currency,
+                    }
+                )
+                + b"\n"
+                for price_id, product_id, part_number, supplier_id, supplier_name, total_price, lead_days, currency in batch
+            )
+
+    return attachment(generate(), "prices.ndjson", "application/x-ndjson")
+
+
+# One row per product with a price/lead-time/currency column group per supplier,
+# mirroring the "ИТОГ" workbooks the importer reads.
+@api_bp.get("/export/price-matrix.csv")
+@conditional("supplier_product_prices", "products", "suppliers")
+def export_price_matrix_csv():
+    suppliers = db.session.execute(select(Supplier.id, Supplier.name).order_by(Supplier.id)).all()
+    slots = {supplier_id: index for index, (supplier_id, _) in enumerate(suppliers)}
+
+    product_columns = [
+        ("id", Product.id),
+        ("partNumber", Product.part_number),
+        ("name", Product.name),
+        ("brand", Product.brand),
+        ("category", Product.category),
+    ]
+    header = [name for name, _ in product_columns]
+    for _, supplier_name in suppliers:
+        header += [f"{supplier_name}: цена", f"{supplier_name}: срок, дни", f"{supplier_name}: валюта"]
+
+    # Offers arrive grouped by product, so each matrix row is complete once the product id changes
+    statement = (
+        select(
+            *(column for _, column in product_columns),
+            SupplierProductPrice.supplier_id,
+            SupplierProductPrice.total_price,
+            LEAD_TIME_DAYS,
+            SupplierProductPrice.cy,
+        )
+        .outerjoin(SupplierProductPrice, SupplierProductPrice.product_id == Product.id)
+        .order_by(Product.id)
+    )
+    width = len(product_columns)
+
+    def matrix_rows() -> Iterator[List[object]]:
+        for _, offers in itertools.groupby(stream_rows(statement), key=lambda row: row[0]):
+            row = None
+            for offer in offers:
+                if row is None:
+                    row = list(offer[:width]) + [None] * (3 * len(suppliers))
+                supplier_id, total_price, lead_days, currency = offer[width:]
+                slot = slots.get(supplier_id)
+                if slot is not None:
+                    row[width + 3 * slot : width + 3 * slot + 3] = [total_price, lead_days, currency]
+            yield row
+
+    return attachment(csv_chunks(header, matrix_rows()), "price-matrix.csv", "text/csv")
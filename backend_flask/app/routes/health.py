@@ -1,10 +1,12 @@
 from flask import jsonify
 
-from ..database import db
+from ..database import db, schema_is_current
 from . import api_bp
 
 
 @api_bp.get("/health")
 def healthcheck():
     db.session.execute(db.text("select 1"))
+    if not schema_is_current():
+        return jsonify({"status": "migrations pending", "message": "Run `flask --app main setup`"}), 503
     return jsonify({"status": "ok"})
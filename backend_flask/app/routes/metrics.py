@@ -0,0 +1,14 @@
+from flask import Response
+
+from ..database import db
+from ..metrics import render_pool_metrics
+from . import api_bp
+
+
+# Prometheus scrape target. Each gunicorn worker has its own pool, so the values describe
+# the worker that answered.
+@api_bp.get("/metrics")
+def metrics():
+    pools = {"primary": db.engine.pool}
+    pools.update((bind, engine.pool) for bind, engine in db.engines.items() if bind is not None)
+    return Response(render_pool_metrics(pools), mimetype="text/plain; version=0.0.4")
@@ -1,40 +1,156 @@
-from flask import jsonify, request
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy.orm import joinedload
+from flask import jsonify, request
 
-from ..database import db
-from ..models import Product, ProductCategory, SupplierProductPrice, Supplier
+from sqlalchemy import Float, case, cast, extract, func, literal, literal_column, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from ..bulk import (
+    BULK_CHUNK_ROWS,
+    BULK_MAX_ROWS,
+    WAS_INSERTED,
+    bulk_summary,
+    iter_bulk_payload,
+)
+from ..conditional import conditional
+from ..database import db, product_identity_index_available, trigram_available
+from ..models import PRICE_HISTORY, PRODUCT_IDENTITY_COLUMNS, Product, ProductBestPrice, Supplier
+from ..pagination import decode_cursor, encode_cursor, escape_like, parse_limit
+from ..reference import reference_codes
 from . import api_bp
+from .requests import parse_date_filter, parse_iso_datetime
+
+
+# Fields of a product response; list endpoints select these columns instead of loading
+# Product objects, and categoryDescription comes from the reference cache.
+PRODUCT_COLUMNS = [
+    ("id", Product.id),
+    ("partNumber", Product.part_number),
+    ("name", Product.name),
+    ("brand", Product.brand),
+    ("model", Product.model),
+    ("serialNumber", Product.serial_number),
+    ("scheme", Product.scheme),
+    ("posScheme", Product.pos_scheme),
+    ("material", Product.material),
+    ("size", Product.size),
+    ("comment", Product.comment),
+    ("category", Product.category),
+]
+PRODUCT_KEYS = tuple(name for name, _ in PRODUCT_COLUMNS)
+PRODUCT_SELECT = [column for _, column in PRODUCT_COLUMNS]
+
+
+def serialize_product_row(row: Sequence[Any], categories: Dict[str, str]) -> dict:
+    """Product response from a row starting with ``PRODUCT_SELECT``; extra columns are ignored."""
+    product = dict(zip(PRODUCT_KEYS, row))
+    product["categoryDescription"] = categories.get(product["category"])
+    return product
 
 
 def serialize_product(product: Product) -> dict:
-    category_description = product.category_rel.description if product.category_rel else None
-
-    return {
-        "id": product.id,
-        "partNumber": product.part_number,
-        "name": product.name,
-        "brand": product.brand,
-        "model": product.model,
-        "serialNumber": product.serial_number,
-        "scheme": product.scheme,
-        "posScheme": product.pos_scheme,
-        "material": product.material,
-        "size": product.size,
-        "comment": product.comment,
-        "category": product.category,
-        "categoryDescription": category_description,
-    }
+    return serialize_product_row(
+        [getattr(product, column.key) for column in PRODUCT_SELECT], reference_codes("product_categories")
+    )
 
 
 @api_bp.get("/products")
+@conditional("products", "product_categories")
 def list_products():
-    products = (
-        Product.query.order_by(Product.id.desc())
-        .options(joinedload(Product.category_rel))
-        .all()
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = decode_cursor(request.args.get("after"))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    statement = select(*PRODUCT_SELECT)
+
+    if cursor is not None:
+        last_id = cursor.get("id")
+        if not isinstance(last_id, int):
+            return jsonify({"message": 'Parameter "after" is not a valid cursor'}), 400
+        statement = statement.where(Product.id < last_id)
+
+    brand = (request.args.get("brand") or "").strip()
+    if brand:
+        statement = statement.where(Product.brand == brand)
+
+    category = (request.args.get("category") or "").strip()
+    if category:
+        statement = statement.where(Product.category == category)
+
+    part_number_prefix = (request.args.get("partNumber") or "").strip()
+    if part_number_prefix:
+        statement = statement.where(Product.part_number.like(f"{escape_like(part_number_prefix)}%", escape="\\"))
+
+    rows = db.session.execute(statement.order_by(Product.id.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"id": rows[-1].id})
+
+    categories = reference_codes("product_categories")
+    return jsonify(
+        {
+            "items": [serialize_product_row(row, categories) for row in rows],
+            "nextCursor": next_cursor,
+        }
+    )
+
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+
+@api_bp.get("/products/search")
+@conditional("products", "product_categories")
+def search_products():
+    query_text = " ".join((request.args.get("q") or "").split())
+    if not query_text:
+        return jsonify({"message": 'Parameter "q" is required'}), 400
+
+    limit = request.args.get("limit", default=SEARCH_DEFAULT_LIMIT, type=int)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+
+    prefix_match = Product.part_number.ilike(f"{escape_like(query_text)}%", escape="\\")
+
+    if trigram_available():
+        # word_similarity scores the best matching stretch of the name, so either half
+        # of bilingual names such as "OIL FILTER / МАСЛЯНЫЙ ФИЛЬТР" can match on its own.
+        score = func.greatest(
+            func.similarity(Product.part_number, query_text),
+            func.word_similarity(query_text, Product.name),
+        )
+        condition = or_(
+            prefix_match,
+            Product.part_number.op("%")(query_text),
+            literal(query_text).op("<%")(Product.name),
+        )
+    else:
+        contains = f"%{escape_like(query_text)}%"
+        name_match = Product.name.ilike(contains, escape="\\")
+        score = case((prefix_match, 1.0), (name_match, 0.5), else_=0.0)
+        condition = or_(Product.part_number.ilike(contains, escape="\\"), name_match)
+
+    rows = db.session.execute(
+        select(*PRODUCT_SELECT, score.label("score"))
+        .where(condition)
+        .order_by(prefix_match.desc(), score.desc(), Product.id.desc())
+        .limit(limit)
+    ).all()
+
+    categories = reference_codes("product_categories")
+    return jsonify(
+        {
+            "items": [
+                {**serialize_product_row(row, categories), "score": round(float(row.score), 4)}
+                for row in rows
+            ]
+        }
     )
-    return jsonify([serialize_product(product) for product in products])
 
 
 @api_bp.post("/products")
@@ -62,10 +178,7 @@ def create_product():
 
     category_code = payload.get("category")
     if category_code:
-        exists = db.session.query(
-            db.exists().where(ProductCategory.code == category_code)
-        ).scalar()
-        if not exists:
+        if category_code not in reference_codes("product_categories"):
             return (
                 jsonify(
                     {
@@ -110,6 +223,152 @@ def create_product():
     return jsonify(serialize_product(product)), 201
 
 
+PRODUCT_TEXT_FIELDS = (
+    ("brand", "brand"),
+    ("model", "model"),
+    ("scheme", "scheme"),
+    ("pos_scheme", "posScheme"),
+    ("material", "material"),
+    ("size", "size"),
+    ("comment", "comment"),
+)
+
+
+def parse_bulk_product(row: Any, categories: Set[str]) -> Dict[str, Any]:
+    if not isinstance(row, dict):
+        raise ValueError("Row must be a JSON object")
+
+    part_number = row.get("partNumber")
+    if isinstance(part_number, (int, float)) and not isinstance(part_number, bool):
+        part_number = str(part_number).strip()
+    elif isinstance(part_number, str):
+        part_number = part_number.strip()
+    else:
+        raise ValueError('Field "partNumber" must be a string or number')
+    if not part_number:
+        raise ValueError('Field "partNumber" is required')
+
+    name = row.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError('Field "name" is required')
+
+    serial_raw = row.get("serialNumber")
+    serial_value = None
+    if serial_raw not in (None, ""):
+        try:
+            serial_value = int(serial_raw.strip() if isinstance(serial_raw, str) else serial_raw)
+        except (TypeError, ValueError):
+            raise ValueError('Field "serialNumber" must be an integer if provided')
+
+    category = row.get("category") or None
+    if category is not None and not isinstance(category, str):
+        raise ValueError('Field "category" must be a string')
+    if category is not None and category not in categories:
+        raise ValueError(f'Category "{category}" does not exist')
+
+    values = {
+        "part_number": part_number,
+        "name": name.strip(),
+        "serial_number": serial_value,
+        "category": category,
+    }
+    for field, key in PRODUCT_TEXT_FIELDS:
+        value = row.get(key)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f'Field "{key}" must be a string')
+        values[field] = value
+
+    for field, key in (("part_number", "partNumber"), ("name", "name"), *PRODUCT_TEXT_FIELDS):
+        length = Product.__table__.c[field].type.length
+        if values[field] is not None and len(values[field]) > length:
+            raise ValueError(f'Field "{key}" must be at most {length} characters')
+    return values
+
+
+def product_identity(values: Dict[str, Any]) -> Tuple[str, str, str]:
+    return values["part_number"], values["name"], values["brand"] or ""
+
+
+@api_bp.post("/products/bulk")
+def bulk_upsert_products():
+    categories = set(reference_codes("product_categories"))
+    results: List[Dict[str, Any]] = []
+    values: Dict[Tuple[str, str, str], Tuple[int, Dict[str, Any]]] = {}
+    duplicates: List[Tuple[int, Tuple[str, str, str]]] = []
+
+    try:
+        for index, row in enumerate(iter_bulk_payload()):
+            if index >= BULK_MAX_ROWS:
+                return jsonify({"message": f"At most {BULK_MAX_ROWS} rows per request"}), 400
+            result: Dict[str, Any] = {"index": index}
+            results.append(result)
+            try:
+                parsed = parse_bulk_product(row, categories)
+            except ValueError as exc:
+                result.update(status="invalid", message=str(exc))
+                continue
+            key = product_identity(parsed)
+            previous = values.get(key)
+            if previous is not None:
+                # A statement may not touch the same row twice; the last occurrence wins
+                results[previous[0]].update(status="duplicate", message=f"Superseded by row {index}")
+                duplicates.append((previous[0], key))
+            values[key] = (index, parsed)
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    if not results:
+        return jsonify({"message": "No rows submitted"}), 400
+
+    # The upsert's conflict target; without it PostgreSQL rejects the statement
+    if not product_identity_index_available():
+        return (
+            jsonify(
+                {
+                    "message": "Bulk upsert is unavailable: products with the same (partNumber, name, brand) "
+                    "exist, so the unique index uq_products_identity was not created. Merge the duplicates "
+                    "and run `flask --app main setup` again."
+                }
+            ),
+            503,
+        )
+
+    statement = insert(Product)
+    statement = statement.on_conflict_do_update(
+        index_elements=[literal_column(column) for column in PRODUCT_IDENTITY_COLUMNS],
+        set_={
+            column: statement.excluded[column]
+            for column in (
+                "brand",
+                "model",
+                "serial_number",
+                "scheme",
+                "pos_scheme",
+                "material",
+                "size",
+                "comment",
+                "category",
+            )
+        },
+    ).returning(Product.id, WAS_INSERTED, sort_by_parameter_order=True)
+
+    rows = list(values.values())
+    if rows:
+        # executemany with RETURNING: SQLAlchemy batches the rows into multi-row VALUES
+        # statements and hands the ids back in parameter order
+        written = db.session.execute(
+            statement, [parsed for _, parsed in rows], execution_options={"insertmanyvalues_page_size": BULK_CHUNK_ROWS}
+        ).all()
+        for (index, _), (product_id, inserted) in zip(rows, written):
+            results[index].update(status="inserted" if inserted else "updated", id=product_id)
+    db.session.commit()
+
+    for index, key in duplicates:
+        results[index]["id"] = results[values[key][0]]["id"]
+
+    return jsonify(bulk_summary(results))
+
+
 @api_bp.put("/products/<int:product_id>")
 def update_product(product_id: int):
     payload = request.get_json(silent=True) or {}
@@ -154,10 +413,7 @@ def update_product(product_id: int):
     if "category" in payload:
         category_code = payload.get("category")
         if category_code:
-            exists = db.session.query(
-                db.exists().where(ProductCategory.code == category_code)
-            ).scalar()
-            if not exists:
+            if category_code not in reference_codes("product_categories"):
                 return (
                     jsonify(
                         {
@@ -193,38 +449,358 @@ def delete_product(product_id: int):
 
 
 @api_bp.get("/products/<int:product_id>")
+@conditional("products", "product_categories")
 def get_product(product_id: int):
-    product = (
-        Product.query.options(joinedload(Product.category_rel))
-        .filter(Product.id == product_id)
-        .first_or_404()
-    )
+    product = Product.query.filter(Product.id == product_id).first_or_404()
     return jsonify(serialize_product(product))
 
 
-@api_bp.get("/products/<int:product_id>/competition")
-def product_competition(product_id: int):
-    product = Product.query.get_or_404(product_id)
-    offers = (
-        SupplierProductPrice.query.filter_by(product_id=product.id)
-        .join(SupplierProductPrice.supplier)
-        .order_by(Supplier.name.asc())
-        .all()
+COMPETITION_MAX_PRODUCTS = 1000
+
+# Offers plus price/lead-time statistics per product and currency in one round trip; the
+# stats are repeated on every offer row of a currency and split apart in _load_competition.
+# Prices in different currencies are never compared.
+_COMPETITION_SQL = """
+    with offers as ({offers}),
+    stats as (
+      select product_id,
+             cy,
+             count(*) as offer_count,
+             min(total_price) as min_price,
+             percentile_cont(0.5) within group (order by total_price) as median_price,
+             max(total_price) as max_price,
+             (array_agg(supplier_id order by total_price, supplier_name)
+                filter (where total_price is not null))[1] as cheapest_supplier_id,
+             min(lead_time_days) as fastest_lead_time_days,
+             (array_agg(supplier_id order by lead_time_days, total_price, supplier_name)
+                filter (where lead_time_days is not null))[1] as fastest_supplier_id
+      from offers
+      group by product_id, cy
     )
-    result = []
-    for offer in offers:
-        if offer.lead_time is not None:
-            lead_days = offer.lead_time.days + offer.lead_time.seconds / 86400
-            lead_time_value = lead_days
-        else:
-            lead_time_value = None
-        result.append(
+    select o.product_id, o.supplier_id, o.supplier_name, o.total_price, o.lead_time_days, o.cy,
+           st.offer_count, st.min_price, st.median_price, st.max_price,
+           st.cheapest_supplier_id, st.fastest_lead_time_days, st.fastest_supplier_id
+    from offers o
+    join stats st on st.product_id = o.product_id and st.cy is not distinct from o.cy
+    order by o.product_id, o.supplier_name
+"""
+
+CURRENT_OFFERS = """
+      select spp.product_id,
+             spp.supplier_id,
+             s.name as supplier_name,
+             spp.total_price,
+             extract(epoch from spp.lead_time)::float8 / 86400 as lead_time_days,
+             spp.cy
+      from supplier_product_prices spp
+      join suppliers s on s.id = spp.supplier_id
+      where spp.product_id = any(:product_ids)
+"""
+
+# The last version of each offer recorded up to :as_of, unless that version is a deletion.
+# Only partitions up to :as_of, and the default one, are scanned.
+OFFERS_AS_OF = """
+      select h.product_id,
+             h.supplier_id,
+             s.name as supplier_name,
+             h.total_price,
+             extract(epoch from h.lead_time)::float8 / 86400 as lead_time_days,
+             h.cy
+      from (
+        select distinct on (product_id, supplier_id) *
+        from supplier_product_price_history
+        where product_id = any(:product_ids) and valid_from <= :as_of
+        order by product_id, supplier_id, valid_from desc, id desc
+      ) h
+      left join suppliers s on s.id = h.supplier_id
+      where not h.deleted
+"""
+
+COMPETITION_SQL = text(_COMPETITION_SQL.format(offers=CURRENT_OFFERS))
+COMPETITION_AS_OF_SQL = text(_COMPETITION_SQL.format(offers=OFFERS_AS_OF))
+
+
+def _load_competition(product_ids: list[int], as_of: Optional[datetime] = None) -> dict[int, dict]:
+    """Offers of ``product_ids`` and one summary per currency they are quoted in, most offers first."""
+    competition = {product_id: {"offers": [], "summaries": []} for product_id in product_ids}
+    if not product_ids:
+        return competition
+
+    if as_of is None:
+        rows = db.session.execute(COMPETITION_SQL, {"product_ids": product_ids})
+    else:
+        rows = db.session.execute(COMPETITION_AS_OF_SQL, {"product_ids": product_ids, "as_of": as_of})
+
+    supplier_names: dict[int, str] = {}
+    summaries: dict[Tuple[int, Optional[str]], dict] = {}
+    for row in rows.mappings():
+        entry = competition[row["product_id"]]
+        supplier_names[row["supplier_id"]] = row["supplier_name"]
+        entry["offers"].append(
             {
-                "supplierId": offer.supplier_id,
-                "supplierName": offer.supplier.name if offer.supplier else None,
-                "totalPrice": offer.total_price,
-                "leadTimeDays": lead_time_value,
-                "currency": offer.cy,
+                "supplierId": row["supplier_id"],
+                "supplierName": row["supplier_name"],
+                "totalPrice": row["total_price"],
+                "leadTimeDays": row["lead_time_days"],
+                "currency": row["cy"],
+            }
+        )
+        key = (row["product_id"], row["cy"])
+        if key not in summaries:
+            summaries[key] = {
+                "currency": row["cy"],
+                "offerCount": row["offer_count"],
+                "minPrice": row["min_price"],
+                "medianPrice": row["median_price"],
+                "maxPrice": row["max_price"],
+                "cheapestSupplierId": row["cheapest_supplier_id"],
+                "fastestLeadTimeDays": row["fastest_lead_time_days"],
+                "fastestSupplierId": row["fastest_supplier_id"],
             }
+            entry["summaries"].append(summaries[key])
+
+    for entry in competition.values():
+        for summary in entry["summaries"]:
+            summary["cheapestSupplierName"] = supplier_names.get(summary["cheapestSupplierId"])
+            summary["fastestSupplierName"] = supplier_names.get(summary["fastestSupplierId"])
+        entry["summaries"].sort(
+            key=lambda summary: (-summary["offerCount"], summary["currency"] is not None, summary["currency"] or "")
+        )
+    return competition
+
+
+@api_bp.get("/products/<int:product_id>/competition")
+@conditional("products", "product_categories", "suppliers", "supplier_product_prices")
+def product_competition(product_id: int):
+    try:
+        as_of = parse_date_filter("asOf")
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    product = Product.query.filter(Product.id == product_id).first_or_404()
+    competition = _load_competition([product.id], as_of)[product.id]
+    return jsonify({"product": serialize_product(product), **competition})
+
+
+@api_bp.post("/products/competition")
+def batch_competition():
+    payload = request.get_json(silent=True) or {}
+    product_ids = payload.get("productIds")
+
+    if not isinstance(product_ids, list) or not product_ids:
+        return jsonify({"message": 'Field "productIds" must be a non-empty list'}), 400
+    if any(isinstance(value, bool) or not isinstance(value, int) for value in product_ids):
+        return jsonify({"message": 'Field "productIds" must contain integers only'}), 400
+    if len(product_ids) > COMPETITION_MAX_PRODUCTS:
+        return (
+            jsonify({"message": f'Field "productIds" accepts at most {COMPETITION_MAX_PRODUCTS} ids'}),
+            400,
         )
-    return jsonify({"product": serialize_product(product), "offers": result})
+
+    as_of = None
+    if payload.get("asOf") is not None:
+        if not isinstance(payload["asOf"], str):
+            return jsonify({"message": 'Field "asOf" must be a valid ISO string'}), 400
+        try:
+            as_of = parse_iso_datetime(payload["asOf"], "asOf")
+        except ValueError as exc:
+            return jsonify({"message": str(exc)}), 400
+
+    unique_ids = list(dict.fromkeys(product_ids))
+    categories = reference_codes("product_categories")
+    products = {
+        row.id: serialize_product_row(row, categories)
+        for row in db.session.execute(select(*PRODUCT_SELECT).where(Product.id.in_(unique_ids)))
+    }
+    found_ids = [product_id for product_id in unique_ids if product_id in products]
+    competition = _load_competition(found_ids, as_of)
+
+    return jsonify(
+        {
+            "items": [
+                {"product": products[product_id], **competition[product_id]}
+                for product_id in found_ids
+            ],
+            "missingIds": [product_id for product_id in unique_ids if product_id not in products],
+        }
+    )
+
+
+def decode_history_cursor(token: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    cursor = decode_cursor(token)
+    if cursor is None:
+        return None
+    valid_from, last_id = cursor.get("validFrom"), cursor.get("id")
+    if not isinstance(valid_from, str) or not isinstance(last_id, int):
+        raise ValueError('Parameter "after" is not a valid cursor')
+    try:
+        return datetime.fromisoformat(valid_from), last_id
+    except ValueError as exc:
+        raise ValueError('Parameter "after" is not a valid cursor') from exc
+
+
+@api_bp.get("/products/<int:product_id>/price-history")
+@conditional("products", "product_categories", "suppliers", "supplier_product_prices")
+def product_price_history(product_id: int):
+    """Every recorded version of the product's offers, newest first."""
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = decode_history_cursor(request.args.get("after"))
+        valid_from = parse_date_filter("from")
+        valid_to = parse_date_filter("to")
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    product = Product.query.filter(Product.id == product_id).first_or_404()
+
+    history = PRICE_HISTORY
+    statement = (
+        select(
+            history.c.id,
+            history.c.price_id,
+            history.c.supplier_id,
+            Supplier.name,
+            history.c.total_price,
+            cast(extract("epoch", history.c.lead_time), Float) / 86400,
+            history.c.cy,
+            history.c.deleted,
+            history.c.valid_from,
+        )
+        .outerjoin(Supplier, Supplier.id == history.c.supplier_id)
+        .where(history.c.product_id == product.id)
+    )
+
+    # Bounds on valid_from, including the cursor's, limit the scan to the matching months
+    if cursor is not None:
+        statement = statement.where(tuple_(history.c.valid_from, history.c.id) < tuple_(*cursor))
+    if valid_from is not None:
+        statement = statement.where(history.c.valid_from >= valid_from)
+    if valid_to is not None:
+        statement = statement.where(history.c.valid_from < valid_to)
+
+    supplier_id = request.args.get("supplierId", type=int)
+    if supplier_id is not None:
+        statement = statement.where(history.c.supplier_id == supplier_id)
+
+    rows = db.session.execute(
+        statement.order_by(history.c.valid_from.desc(), history.c.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"validFrom": rows[-1].valid_from.isoformat(), "id": rows[-1].id})
+
+    return jsonify(
+        {
+            "product": serialize_product(product),
+            "items": [
+                {
+                    "priceId": price_id,
+                    "supplierId": supplier_id,
+                    "supplierName": supplier_name,
+                    "totalPrice": total_price,
+                    "leadTimeDays": lead_days,
+                    "currency": currency,
+                    "deleted": deleted,
+                    "validFrom": version_from.isoformat(),
+                }
+                for _, price_id, supplier_id, supplier_name, total_price, lead_days, currency, deleted, version_from in rows
+            ],
+            "nextCursor": next_cursor,
+        }
+    )
+
+
+# Fields of a best-price response, selected as columns like PRODUCT_COLUMNS; the supplier
+# names come from two joins of suppliers.
+CHEAPEST_SUPPLIER = aliased(Supplier, name="cheapest_supplier")
+FASTEST_SUPPLIER = aliased(Supplier, name="fastest_supplier")
+BEST_PRICE_COLUMNS = [
+    ("productId", ProductBestPrice.product_id),
+    ("partNumber", Product.part_number),
+    ("name", Product.name),
+    ("brand", Product.brand),
+    ("category", Product.category),
+    ("offerCount", ProductBestPrice.offer_count),
+    ("minPrice", ProductBestPrice.min_price),
+    ("currency", ProductBestPrice.currency),
+    ("cheapestSupplierId", ProductBestPrice.cheapest_supplier_id),
+    ("cheapestSupplierName", CHEAPEST_SUPPLIER.name),
+    ("bestLeadTimeDays", ProductBestPrice.best_lead_time_days),
+    ("fastestSupplierId", ProductBestPrice.fastest_supplier_id),
+    ("fastestSupplierName", FASTEST_SUPPLIER.name),
+    ("refreshedAt", ProductBestPrice.refreshed_at),
+]
+BEST_PRICE_KEYS = tuple(name for name, _ in BEST_PRICE_COLUMNS)
+BEST_PRICE_SELECT = [column for _, column in BEST_PRICE_COLUMNS]
+
+
+def serialize_best_price_row(row: Sequence[Any], categories: Dict[str, str]) -> dict:
+    """Best-price response from a row starting with ``BEST_PRICE_SELECT``; extra columns are ignored."""
+    item = dict(zip(BEST_PRICE_KEYS, row))
+    item["categoryDescription"] = categories.get(item["category"])
+    item["refreshedAt"] = item["refreshedAt"].isoformat()
+    return item
+
+
+@api_bp.get("/products/best-prices")
+@conditional("product_best_prices", "products", "suppliers", "product_categories")
+def list_best_prices():
+    """Cheapest and fastest offer per product and currency from the ``product_best_prices`` summary."""
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = decode_cursor(request.args.get("after"))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    statement = (
+        select(*BEST_PRICE_SELECT, ProductBestPrice.id)
+        .join(Product, Product.id == ProductBestPrice.product_id)
+        .outerjoin(CHEAPEST_SUPPLIER, CHEAPEST_SUPPLIER.id == ProductBestPrice.cheapest_supplier_id)
+        .outerjoin(FASTEST_SUPPLIER, FASTEST_SUPPLIER.id == ProductBestPrice.fastest_supplier_id)
+    )
+
+    if cursor is not None:
+        last_id, last_summary_id = cursor.get("id"), cursor.get("summaryId")
+        if not isinstance(last_id, int) or not isinstance(last_summary_id, int):
+            return jsonify({"message": 'Parameter "after" is not a valid cursor'}), 400
+        statement = statement.where(
+            tuple_(ProductBestPrice.product_id, ProductBestPrice.id) < tuple_(last_id, last_summary_id)
+        )
+
+    for name, column in (("brand", Product.brand), ("category", Product.category), ("currency", ProductBestPrice.currency)):
+        value = (request.args.get(name) or "").strip()
+        if value:
+            statement = statement.where(column == value)
+
+    part_number_prefix = (request.args.get("partNumber") or "").strip()
+    if part_number_prefix:
+        statement = statement.where(Product.part_number.like(f"{escape_like(part_number_prefix)}%", escape="\\"))
+
+    supplier_id = request.args.get("supplierId", type=int)
+    if supplier_id is not None:
+        statement = statement.where(ProductBestPrice.cheapest_supplier_id == supplier_id)
+
+    for name, column in (("maxPrice", ProductBestPrice.min_price), ("maxLeadTimeDays", ProductBestPrice.best_lead_time_days)):
+        if name in request.args:
+            value = request.args.get(name, type=float)
+            if value is None:
+                return jsonify({"message": f'Parameter "{name}" must be a number'}), 400
+            statement = statement.where(column <= value)
+
+    rows = db.session.execute(
+        statement.order_by(ProductBestPrice.product_id.desc(), ProductBestPrice.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"id": rows[-1].product_id, "summaryId": rows[-1].id})
+
+    categories = reference_codes("product_categories")
+    return jsonify(
+        {
+            "items": [serialize_best_price_row(row, categories) for row in rows],
+            "nextCursor": next_cursor,
+        }
+    )
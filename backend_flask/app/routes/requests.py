@@ -1,63 +1,91 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from flask import jsonify, request
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
 
+from ..conditional import conditional
 from ..database import db
+from ..matching import match_request_items
 from ..models import Request, RequestItem
+from ..pagination import decode_cursor, encode_cursor, parse_limit
+from ..reference import reference_codes
 from . import api_bp
 
 
+# Fields of a request item response; GET /requests?include=items selects these columns
+# instead of loading RequestItem objects.
+REQUEST_ITEM_COLUMNS = [
+    ("id", RequestItem.id),
+    ("partNumber", RequestItem.part_number),
+    ("name", RequestItem.name),
+    ("quantity", RequestItem.quantity),
+    ("unit", RequestItem.unit),
+    ("brand", RequestItem.brand),
+    ("model", RequestItem.model),
+    ("serialNumber", RequestItem.serial_number),
+    ("scheme", RequestItem.scheme),
+    ("posScheme", RequestItem.pos_scheme),
+    ("material", RequestItem.material),
+    ("comment", RequestItem.comment),
+    ("unitPrice", RequestItem.unit_price),
+    ("totalPrice", RequestItem.total_price),
+    ("requestId", RequestItem.request_id),
+    ("productId", RequestItem.product_id),
+    ("matchType", RequestItem.match_type),
+]
+REQUEST_ITEM_KEYS = tuple(name for name, _ in REQUEST_ITEM_COLUMNS)
+
+# Columns behind serialize_request_header_row, in its unpacking order
+REQUEST_HEADER_SELECT = [
+    Request.id,
+    Request.id_request,
+    Request.type_request,
+    Request.datetime_coming,
+    Request.datetime_delivery,
+    Request.status,
+    Request.total_price,
+]
+
+
 def serialize_request_item(item: RequestItem) -> Dict[str, Any]:
+    return {name: getattr(item, column.key) for name, column in REQUEST_ITEM_COLUMNS}
+
+
+def serialize_request_header_row(row: Sequence[Any], types: Dict[str, str], statuses: Dict[str, str]) -> Dict[str, Any]:
+    """Request header from a row starting with ``REQUEST_HEADER_SELECT``; extra columns are ignored."""
+    request_id, id_request, type_request, datetime_coming, datetime_delivery, status, total_price = row[:7]
     return {
-        "id": item.id,
-        "partNumber": item.part_number,
-        "name": item.name,
-        "quantity": item.quantity,
-        "unit": item.unit,
-        "brand": item.brand,
-        "model": item.model,
-        "serialNumber": item.serial_number,
-        "scheme": item.scheme,
-        "posScheme": item.pos_scheme,
-        "material": item.material,
-        "comment": item.comment,
-        "unitPrice": item.unit_price,
-        "totalPrice": item.total_price,
-        "requestId": item.request_id,
-        "productId": item.product_id,
+        "id": request_id,
+        "idRequest": id_request,
+        "typeRequest": type_request,
+        "typeDescription": types.get(type_request),
+        "datetimeComing": datetime_coming.isoformat(),
+        "datetimeDelivery": datetime_delivery.isoformat() if datetime_delivery else None,
+        "status": status,
+        "statusDescription": statuses.get(status),
+        "totalPrice": total_price,
     }
 
 
+def serialize_request_header(req: Request) -> Dict[str, Any]:
+    return serialize_request_header_row(
+        [getattr(req, column.key) for column in REQUEST_HEADER_SELECT],
+        reference_codes("request_types"),
+        reference_codes("request_statuses"),
+    )
+
+
 def serialize_request(req: Request) -> Dict[str, Any]:
     return {
-        "id": req.id,
-        "idRequest": req.id_request,
-        "typeRequest": req.type_request,
-        "typeDescription": req.type.description if req.type else None,
-        "datetimeComing": req.datetime_coming.isoformat(),
-        "datetimeDelivery": req.datetime_delivery.isoformat() if req.datetime_delivery else None,
-        "status": req.status,
-        "statusDescription": req.status_rel.description if req.status_rel else None,
-        "totalPrice": req.total_price,
+        **serialize_request_header(req),
         "items": [serialize_request_item(item) for item in req.items],
     }
 
 
-@api_bp.get("/requests")
-def list_requests():
-    requests = (
-        Request.query.order_by(Request.datetime_coming.desc())
-        .options(joinedload(Request.items), joinedload(Request.type), joinedload(Request.status_rel))
-        .all()
-    )
-    return jsonify([serialize_request(req) for req in requests])
-
-
 def parse_iso_datetime(value: str, field_name: str) -> datetime:
     try:
         return datetime.fromisoformat(value.replace("Z", "+00:00"))
@@ -65,6 +93,98 @@ def parse_iso_datetime(value: str, field_name: str) -> datetime:
         raise ValueError(f'Field "{field_name}" must be a valid ISO string') from exc
 
 
+def decode_request_cursor(token: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    cursor = decode_cursor(token)
+    if cursor is None:
+        return None
+    last_coming, last_id = cursor.get("datetimeComing"), cursor.get("id")
+    if not isinstance(last_coming, str) or not isinstance(last_id, int):
+        raise ValueError('Parameter "after" is not a valid cursor')
+    try:
+        return datetime.fromisoformat(last_coming), last_id
+    except ValueError as exc:
+        raise ValueError('Parameter "after" is not a valid cursor') from exc
+
+
+def parse_date_filter(name: str) -> Optional[datetime]:
+    value = (request.args.get(name) or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise ValueError(f'Parameter "{name}" must be a valid ISO string') from exc
+
+
+@api_bp.get("/requests")
+@conditional("requests", "request_items", "request_types", "request_statuses")
+def list_requests():
+    include = {part.strip() for part in (request.args.get("include") or "").split(",") if part.strip()}
+    if not include <= {"items"}:
+        return jsonify({"message": 'Parameter "include" only supports "items"'}), 400
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = decode_request_cursor(request.args.get("after"))
+        coming_from = parse_date_filter("comingFrom")
+        coming_to = parse_date_filter("comingTo")
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    item_count = (
+        select(func.count(RequestItem.id))
+        .where(RequestItem.request_id == Request.id)
+        .correlate(Request)
+        .scalar_subquery()
+    )
+    statement = select(*REQUEST_HEADER_SELECT, item_count.label("item_count"))
+
+    if cursor is not None:
+        statement = statement.where(tuple_(Request.datetime_coming, Request.id) < tuple_(*cursor))
+
+    status = (request.args.get("status") or "").strip()
+    if status:
+        statement = statement.where(Request.status == status)
+
+    type_request = (request.args.get("typeRequest") or "").strip()
+    if type_request:
+        statement = statement.where(Request.type_request == type_request)
+
+    if coming_from is not None:
+        statement = statement.where(Request.datetime_coming >= coming_from)
+    if coming_to is not None:
+        statement = statement.where(Request.datetime_coming < coming_to)
+
+    rows = db.session.execute(
+        statement.order_by(Request.datetime_coming.desc(), Request.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor({"datetimeComing": last.datetime_coming.isoformat(), "id": last.id})
+
+    # Type and status descriptions come from the reference cache
+    types, statuses = reference_codes("request_types"), reference_codes("request_statuses")
+    items = [{**serialize_request_header_row(row, types, statuses), "itemCount": row.item_count} for row in rows]
+
+    # Items are only loaded on request, in one extra "request_id in (...)" query
+    if "items" in include:
+        by_request: Dict[int, List[Dict[str, Any]]] = {data["id"]: [] for data in items}
+        item_rows = db.session.execute(
+            select(*(column for _, column in REQUEST_ITEM_COLUMNS))
+            .where(RequestItem.request_id.in_(list(by_request)))
+            .order_by(RequestItem.id)
+        )
+        for row in item_rows:
+            by_request[row.request_id].append(dict(zip(REQUEST_ITEM_KEYS, row)))
+        for data in items:
+            data["items"] = by_request[data["id"]]
+
+    return jsonify({"items": items, "nextCursor": next_cursor})
+
+
 @api_bp.post("/requests")
 def create_request():
     payload = request.get_json(silent=True) or {}
@@ -88,12 +208,20 @@ def create_request():
     except ValueError as err:
         return jsonify({"message": str(err)}), 400
 
+    type_request = payload.get("typeRequest")
+    if type_request and type_request not in reference_codes("request_types"):
+        return jsonify({"message": f'Request type "{type_request}" does not exist'}), 400
+
+    status = payload.get("status")
+    if status and status not in reference_codes("request_statuses"):
+        return jsonify({"message": f'Request status "{status}" does not exist'}), 400
+
     request_model = Request(
         id_request=id_request,
-        type_request=payload.get("typeRequest"),
+        type_request=type_request,
         datetime_coming=parsed_coming,
         datetime_delivery=parsed_delivery,
-        status=payload.get("status"),
+        status=status,
         total_price=payload.get("totalPrice"),
     )
 
@@ -147,6 +275,7 @@ def create_request():
         )
         request_model.items.append(item_model)
 
+    match_request_items(request_model.items)
     db.session.add(request_model)
 
     try:
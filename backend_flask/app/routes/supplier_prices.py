@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from typing import Any, Dict, List, Tuple
 
 from flask import jsonify, request
+from sqlalchemy import and_, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 
+from ..best_prices import refresh_best_prices
+from ..bulk import BULK_CHUNK_ROWS, BULK_MAX_ROWS, WAS_INSERTED, bulk_summary, iter_bulk_payload
+from ..conditional import conditional
 from ..database import db
-from ..models import SupplierProductPrice, Supplier, Product
+from ..models import LEAD_TIME_DAYS, SupplierProductPrice, Supplier, Product
+from ..pagination import decode_cursor, encode_cursor, escape_like, parse_limit
+from ..reference import reference_codes
 from . import api_bp
 
 
@@ -24,6 +33,18 @@ def serialize_price(price: SupplierProductPrice) -> dict:
     }
 
 
+# serialize_price's fields as columns, for the list endpoint's column-only select
+PRICE_COLUMNS = [
+    ("id", SupplierProductPrice.id),
+    ("productId", SupplierProductPrice.product_id),
+    ("supplierId", SupplierProductPrice.supplier_id),
+    ("totalPrice", SupplierProductPrice.total_price),
+    ("leadTimeDays", LEAD_TIME_DAYS),
+    ("currency", SupplierProductPrice.cy),
+]
+PRICE_KEYS = tuple(name for name, _ in PRICE_COLUMNS)
+
+
 def parse_lead_time(days_value):
     if days_value in (None, ""):
         return None
@@ -35,19 +56,187 @@ def parse_lead_time(days_value):
 
 
 @api_bp.get("/supplier-prices")
+@conditional("supplier_product_prices")
 def list_supplier_prices():
-    query = SupplierProductPrice.query
+    statement = select(*(column for _, column in PRICE_COLUMNS))
 
     product_id = request.args.get("productId", type=int)
     supplier_id = request.args.get("supplierId", type=int)
 
     if product_id is not None:
-        query = query.filter(SupplierProductPrice.product_id == product_id)
+        statement = statement.where(SupplierProductPrice.product_id == product_id)
     if supplier_id is not None:
-        query = query.filter(SupplierProductPrice.supplier_id == supplier_id)
+        statement = statement.where(SupplierProductPrice.supplier_id == supplier_id)
+
+    rows = db.session.execute(statement.order_by(SupplierProductPrice.id.desc()))
+    return jsonify([dict(zip(PRICE_KEYS, row)) for row in rows])
+
+
+# sort parameter -> column; rows with the same value are ordered by id in the same direction
+PRICE_VIEW_SORTS = {
+    "id": SupplierProductPrice.id,
+    "price": SupplierProductPrice.total_price,
+    "leadTime": LEAD_TIME_DAYS,
+    "partNumber": Product.part_number,
+    "productName": Product.name,
+    "supplierName": Supplier.name,
+}
+
+
+# Above this many matching products (or suppliers) a search keeps the id subquery
+PRICE_VIEW_SEARCH_IDS = 1000
 
-    prices = query.order_by(SupplierProductPrice.id.desc()).all()
-    return jsonify([serialize_price(price) for price in prices])
+
+def keyset_after(column, value, last_id: int, descending: bool):
+    """Rows after (``value``, ``last_id``) in ``column``/id order.
+
+    NULLs sort as PostgreSQL sorts them by default, above every value (last ascending, first
+    descending), so one btree on (``column``, id) serves both directions.
+    """
+    id_after = SupplierProductPrice.id < last_id if descending else SupplierProductPrice.id > last_id
+    if column is SupplierProductPrice.id:
+        return id_after
+    if value is None:
+        null_rows = and_(column.is_(None), id_after)
+        return or_(null_rows, column.is_not(None)) if descending else null_rows
+    if descending:
+        return or_(column < value, and_(column == value, id_after))
+    return or_(column > value, and_(column == value, id_after), column.is_(None))
+
+
+@api_bp.get("/supplier-prices/view")
+@conditional("supplier_product_prices", "products", "suppliers", "product_categories")
+def view_supplier_prices():
+    """Prices joined to their product and supplier, filtered, sorted and keyset-paginated."""
+    sort = request.args.get("sort") or "id"
+    order = request.args.get("order") or ("desc" if sort == "id" else "asc")
+    if sort not in PRICE_VIEW_SORTS:
+        return jsonify({"message": f'Parameter "sort" must be one of: {", ".join(PRICE_VIEW_SORTS)}'}), 400
+    if order not in ("asc", "desc"):
+        return jsonify({"message": 'Parameter "order" must be "asc" or "desc"'}), 400
+    descending = order == "desc"
+    sort_column = PRICE_VIEW_SORTS[sort]
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        cursor = decode_cursor(request.args.get("after"))
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    statement = (
+        select(
+            SupplierProductPrice.id,
+            SupplierProductPrice.product_id,
+            Product.part_number,
+            Product.name,
+            Product.category,
+            SupplierProductPrice.supplier_id,
+            Supplier.name,
+            SupplierProductPrice.total_price,
+            LEAD_TIME_DAYS,
+            SupplierProductPrice.cy,
+            sort_column,
+        )
+        .join(Product, Product.id == SupplierProductPrice.product_id)
+        .join(Supplier, Supplier.id == SupplierProductPrice.supplier_id)
+    )
+
+    if cursor is not None:
+        last_id = cursor.get("id")
+        if not isinstance(last_id, int) or cursor.get("sort") != [sort, order]:
+            return jsonify({"message": 'Parameter "after" is not a valid cursor'}), 400
+        statement = statement.where(keyset_after(sort_column, cursor.get("value"), last_id, descending))
+
+    for name, column in (("productId", SupplierProductPrice.product_id), ("supplierId", SupplierProductPrice.supplier_id)):
+        value = request.args.get(name, type=int)
+        if value is not None:
+            statement = statement.where(column == value)
+
+    category = (request.args.get("category") or "").strip()
+    if category:
+        statement = statement.where(Product.category == category)
+
+    currency = (request.args.get("currency") or "").strip()
+    if currency:
+        statement = statement.where(SupplierProductPrice.cy == currency)
+
+    # Substring search. Matching products/suppliers are looked up first (trigram indexes) and,
+    # when there are few, passed as literal id lists: the planner then fetches their prices
+    # through the foreign-key indexes. Common terms keep the subqueries, where walking the
+    # sort order until the page is full is the cheaper plan.
+    query_text = (request.args.get("q") or "").strip()
+    if query_text:
+        pattern = f"%{escape_like(query_text)}%"
+        matching_products = select(Product.id).where(
+            or_(
+                Product.part_number.ilike(pattern, escape="\\"),
+                Product.name.ilike(pattern, escape="\\"),
+                Product.category.in_(
+                    [
+                        code
+                        for code, description in reference_codes("product_categories").items()
+                        if query_text.lower() in description.lower()
+                    ]
+                ),
+            )
+        )
+        matching_suppliers = select(Supplier.id).where(Supplier.name.ilike(pattern, escape="\\"))
+        conditions = []
+        for column, ids_statement in (
+            (SupplierProductPrice.product_id, matching_products),
+            (SupplierProductPrice.supplier_id, matching_suppliers),
+        ):
+            ids = db.session.execute(ids_statement.limit(PRICE_VIEW_SEARCH_IDS + 1)).scalars().all()
+            if len(ids) > PRICE_VIEW_SEARCH_IDS:
+                conditions.append(column.in_(ids_statement))
+            elif ids:
+                conditions.append(column.in_(ids))
+        if not conditions:
+            return jsonify({"items": [], "nextCursor": None})
+        statement = statement.where(or_(*conditions))
+
+    if descending:
+        statement = statement.order_by(sort_column.desc(), SupplierProductPrice.id.desc())
+    else:
+        statement = statement.order_by(sort_column.asc(), SupplierProductPrice.id.asc())
+
+    rows = db.session.execute(statement.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"sort": [sort, order], "value": rows[-1][-1], "id": rows[-1][0]})
+
+    categories = reference_codes("product_categories")
+    items = [
+        {
+            "id": price_id,
+            "productId": product_id,
+            "partNumber": part_number,
+            "productName": product_name,
+            "category": category_code,
+            "categoryDescription": categories.get(category_code),
+            "supplierId": supplier_id,
+            "supplierName": supplier_name,
+            "totalPrice": total_price,
+            "leadTimeDays": lead_days,
+            "currency": currency_code,
+        }
+        for (
+            price_id,
+            product_id,
+            part_number,
+            product_name,
+            category_code,
+            supplier_id,
+            supplier_name,
+            total_price,
+            lead_days,
+            currency_code,
+            _,
+        ) in rows
+    ]
+    return jsonify({"items": items, "nextCursor": next_cursor})
 
 
 @api_bp.post("/supplier-prices")
@@ -83,10 +272,130 @@ def create_supplier_price():
     )
 
     db.session.add(price)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return (
+            jsonify({"message": f"Supplier {supplier_id} already has a price for product {product_id}"}),
+            409,
+        )
+    refresh_best_prices([product_id])
     db.session.commit()
     return jsonify(serialize_price(price)), 201
 
 
+def parse_bulk_row(row: Any) -> Dict[str, Any]:
+    if not isinstance(row, dict):
+        raise ValueError("Row must be a JSON object")
+
+    product_id = row.get("productId")
+    supplier_id = row.get("supplierId")
+    if not isinstance(product_id, int) or isinstance(product_id, bool):
+        raise ValueError('Field "productId" must be an integer')
+    if not isinstance(supplier_id, int) or isinstance(supplier_id, bool):
+        raise ValueError('Field "supplierId" must be an integer')
+
+    total_price = row.get("totalPrice")
+    if total_price in (None, ""):
+        total_price = None
+    else:
+        try:
+            total_price = float(total_price)
+        except (TypeError, ValueError):
+            raise ValueError('Field "totalPrice" must be a number')
+
+    currency = row.get("currency")
+    if currency is not None and not isinstance(currency, str):
+        raise ValueError('Field "currency" must be a string')
+
+    return {
+        "product_id": product_id,
+        "supplier_id": supplier_id,
+        "total_price": total_price,
+        "lead_time": parse_lead_time(row.get("leadTimeDays")),
+        "cy": currency,
+    }
+
+
+def existing_keys(product_ids: List[int], supplier_ids: List[int]) -> Tuple[set, set]:
+    rows = db.session.execute(
+        text(
+            """
+            select 'product' as kind, id from products where id = any(:product_ids)
+            union all
+            select 'supplier', id from suppliers where id = any(:supplier_ids)
+            """
+        ),
+        {"product_ids": product_ids, "supplier_ids": supplier_ids},
+    ).all()
+    products = {row.id for row in rows if row.kind == "product"}
+    suppliers = {row.id for row in rows if row.kind == "supplier"}
+    return products, suppliers
+
+
+@api_bp.post("/supplier-prices/bulk")
+def bulk_upsert_supplier_prices():
+    results: List[Dict[str, Any]] = []
+    values: Dict[Tuple[int, int], Tuple[int, Dict[str, Any]]] = {}
+
+    try:
+        for index, row in enumerate(iter_bulk_payload()):
+            if index >= BULK_MAX_ROWS:
+                return jsonify({"message": f"At most {BULK_MAX_ROWS} rows per request"}), 400
+            result: Dict[str, Any] = {"index": index}
+            results.append(result)
+            try:
+                parsed = parse_bulk_row(row)
+            except ValueError as exc:
+                result.update(status="invalid", message=str(exc))
+                continue
+            key = (parsed["product_id"], parsed["supplier_id"])
+            previous = values.get(key)
+            if previous is not None:
+                # A statement may not touch the same row twice; the last occurrence wins
+                results[previous[0]].update(status="duplicate", message=f"Superseded by row {index}")
+            values[key] = (index, parsed)
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    if not results:
+        return jsonify({"message": "No rows submitted"}), 400
+
+    products, suppliers = existing_keys(
+        sorted({product_id for product_id, _ in values}), sorted({supplier_id for _, supplier_id in values})
+    )
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    for (product_id, supplier_id), (index, parsed) in values.items():
+        if product_id not in products:
+            results[index].update(status="not_found", message=f"Product {product_id} not found")
+        elif supplier_id not in suppliers:
+            results[index].update(status="not_found", message=f"Supplier {supplier_id} not found")
+        else:
+            rows.append((index, parsed))
+
+    statement = insert(SupplierProductPrice)
+    statement = statement.on_conflict_do_update(
+        constraint="uq_supplier_product",
+        set_={
+            "total_price": statement.excluded.total_price,
+            "lead_time": statement.excluded.lead_time,
+            "cy": statement.excluded.cy,
+        },
+    ).returning(SupplierProductPrice.id, WAS_INSERTED, sort_by_parameter_order=True)
+
+    if rows:
+        written = db.session.execute(
+            statement, [parsed for _, parsed in rows], execution_options={"insertmanyvalues_page_size": BULK_CHUNK_ROWS}
+        ).all()
+        for (index, _), (price_id, inserted) in zip(rows, written):
+            results[index].update(status="inserted" if inserted else "updated", id=price_id)
+        refresh_best_prices(parsed["product_id"] for _, parsed in rows)
+    db.session.commit()
+
+    return jsonify(bulk_summary(results))
+
+
 @api_bp.put("/supplier-prices/<int:price_id>")
 def update_supplier_price(price_id: int):
     payload = request.get_json(silent=True) or {}
@@ -111,6 +420,8 @@ def update_supplier_price(price_id: int):
     if "currency" in payload:
         price.cy = payload.get("currency")
 
+    db.session.flush()
+    refresh_best_prices([price.product_id])
     db.session.commit()
     return jsonify(serialize_price(price))
 
@@ -118,6 +429,9 @@ def update_supplier_price(price_id: int):
 @api_bp.delete("/supplier-prices/<int:price_id>")
 def delete_supplier_price(price_id: int):
     price = SupplierProductPrice.query.get_or_404(price_id)
+    product_id = price.product_id
     db.session.delete(price)
+    db.session.flush()
+    refresh_best_prices([product_id])
     db.session.commit()
     return ("", 204)
@@ -1,25 +1,33 @@
 from flask import jsonify, request
+from sqlalchemy import select
 
+from ..best_prices import refresh_best_prices
+from ..conditional import conditional
 from ..database import db
 from ..models import Supplier
 from . import api_bp
 
 
+SUPPLIER_COLUMNS = [
+    ("id", Supplier.id),
+    ("name", Supplier.name),
+    ("address", Supplier.address),
+    ("contact", Supplier.contact),
+    ("website", Supplier.website),
+    ("rating", Supplier.rating),
+]
+SUPPLIER_KEYS = tuple(name for name, _ in SUPPLIER_COLUMNS)
+
+
 def serialize_supplier(supplier: Supplier) -> dict:
-    return {
-        "id": supplier.id,
-        "name": supplier.name,
-        "address": supplier.address,
-        "contact": supplier.contact,
-        "website": supplier.website,
-        "rating": supplier.rating,
-    }
+    return {name: getattr(supplier, column.key) for name, column in SUPPLIER_COLUMNS}
 
 
 @api_bp.get("/suppliers")
+@conditional("suppliers")
 def list_suppliers():
-    suppliers = Supplier.query.order_by(Supplier.name.asc()).all()
-    return jsonify([serialize_supplier(supplier) for supplier in suppliers])
+    rows = db.session.execute(select(*(column for _, column in SUPPLIER_COLUMNS)).order_by(Supplier.name.asc()))
+    return jsonify([dict(zip(SUPPLIER_KEYS, row)) for row in rows])
 
 
 @api_bp.post("/suppliers")
@@ -66,6 +74,10 @@ def update_supplier(supplier_id: int):
 @api_bp.delete("/suppliers/<int:supplier_id>")
 def delete_supplier(supplier_id: int):
     supplier = Supplier.query.get_or_404(supplier_id)
+    # The delete cascades to the supplier's prices: their products need a new best offer
+    product_ids = [price.product_id for price in supplier.prices]
     db.session.delete(supplier)
+    db.session.flush()
+    refresh_best_prices(product_ids)
     db.session.commit()
     return ("", 204)
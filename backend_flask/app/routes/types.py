@@ -1,26 +1,14 @@
-from flask import jsonify, request
+from flask import Response
 
+from ..reference import reference_cache
 from . import api_bp
 
-from app.seed import (
-        DEFAULT_REQUEST_TYPES,
-        DEFAULT_REQUEST_STATUSES,
-        DEFAULT_PRODUCT_CATEGORIES,
-    )
-
 
 @api_bp.get("/types")
 def get_types():
     """
     Возвращает список типов (категорий) для выпадающего списка.
     Формат: [{ "id": <id>, "name": "<display name>" }, ...]
+    Справочники кэшируются в процессе и сбрасываются по уведомлению из БД.
     """
-    def _map_dict(d):
-        return [{"id": k, "name": v} for k, v in d.items()]
-
-    payload = {
-        "request_types": _map_dict(DEFAULT_REQUEST_TYPES),
-        "request_statuses": _map_dict(DEFAULT_REQUEST_STATUSES),
-        "product_categories": _map_dict(DEFAULT_PRODUCT_CATEGORIES),
-    }
-    return jsonify(payload)
\ No newline at end of file
+    return Response(reference_cache().types_body(), mimetype="application/json")
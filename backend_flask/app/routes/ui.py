@@ -1,8 +1,15 @@
 from flask import Blueprint, render_template
 
+from ..assets import send_asset
+
 ui_bp = Blueprint("ui", __name__)
 
 
 @ui_bp.get("/")
 def index():
     return render_template("index.html")
+
+
+@ui_bp.get("/assets/<path:filename>")
+def asset(filename: str):
+    return send_asset(filename)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from flask import current_app
+from sqlalchemy.dialects.postgresql import insert
 
 from .database import db
 from .models import ProductCategory, RequestStatus, RequestType
@@ -26,15 +26,21 @@ DEFAULT_PRODUCT_CATEGORIES = {
 }
 
 
-def seed_reference_data() -> None:
-    with current_app.app_context():
-        for code, description in DEFAULT_REQUEST_TYPES.items():
-            db.session.merge(RequestType(code=code, description=description))
-
-        for code, description in DEFAULT_REQUEST_STATUSES.items():
-            db.session.merge(RequestStatus(code=code, description=description))
+def _upsert_reference(model, values: dict) -> None:
+    statement = insert(model).values(
+        [{"code": code, "description": description} for code, description in values.items()]
+    )
+    db.session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[model.code],
+            set_={"description": statement.excluded.description},
+        )
+    )
 
-        for code, description in DEFAULT_PRODUCT_CATEGORIES.items():
-            db.session.merge(ProductCategory(code=code, description=description))
 
-        db.session.commit()
+def seed_reference_data() -> None:
+    """Insert or refresh the reference codes: one statement per table."""
+    _upsert_reference(RequestType, DEFAULT_REQUEST_TYPES)
+    _upsert_reference(RequestStatus, DEFAULT_REQUEST_STATUSES)
+    _upsert_reference(ProductCategory, DEFAULT_PRODUCT_CATEGORIES)
+    db.session.commit()
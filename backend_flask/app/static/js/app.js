@@ -4,9 +4,14 @@ const state = {
   suppliers: [],
   supplierFilter: "",
   products: [],
+  productsCursor: null,
   productFilter: "",
   prices: [],
+  pricesCursor: null,
+  pricesLoading: false,
+  pricesGeneration: 0,
   priceFilter: "",
+  priceSort: "id:desc",
   types: {
     productCategories: [],
     requestTypes: [],
@@ -30,14 +35,27 @@ function showMessage(message, type = "success") {
   }, 4000);
 }
 
+// Last ETag and body per GET url: unchanged lists come back as an empty 304
+const RESPONSE_CACHE_LIMIT = 50;
+const responseCache = new Map();
+
 async function fetchJSON(url, options = {}) {
+  const method = (options.method ?? "GET").toUpperCase();
+  const cached = method === "GET" ? responseCache.get(url) : undefined;
   const response = await fetch(url, {
     headers: {
       "Content-Type": "application/json",
+      ...(cached ? { "If-None-Match": cached.etag } : {}),
     },
+    // The validators are managed here, the browser cache would only answer 200 from disk
+    cache: "no-store",
     ...options,
   });
 
+  if (response.status === 304 && cached) {
+    return cached.data;
+  }
+
   if (response.status === 204) {
     return null;
   }
@@ -53,7 +71,16 @@ async function fetchJSON(url, options = {}) {
     throw new Error(`Ошибка запроса (${response.status})${detail}`);
   }
 
-  return response.json();
+  const data = await response.json();
+  const etag = response.headers.get("ETag");
+  if (method === "GET" && etag) {
+    responseCache.delete(url);
+    responseCache.set(url, { etag, data });
+    if (responseCache.size > RESPONSE_CACHE_LIMIT) {
+      responseCache.delete(responseCache.keys().next().value);
+    }
+  }
+  return data;
 }
 
 function supplierMap() {
@@ -93,12 +120,9 @@ function switchTab(tabId, { silent = false } = {}) {
   if (tabId === "competition") {
     const select = document.querySelector("#competition-product-select");
     if (select) {
-      const currentId = state.selectedProductId;
-      if (currentId && !select.value) {
-        const hasOption = Array.from(select.options).some((option) => Number(option.value) === currentId);
-        if (hasOption) {
-          select.value = String(currentId);
-        }
+      const selected = productMap().get(state.selectedProductId);
+      if (selected && !select.value) {
+        ensureProductOption(select, selected.id, productOptionLabel(selected));
       }
       if (select.value) {
         refreshCompetition({ silent: true }).catch((error) => {
@@ -106,9 +130,14 @@ function switchTab(tabId, { silent = false } = {}) {
         });
       } else {
         renderCompetition([], "Выберите товар, чтобы увидеть предложения");
+        renderCompetitionSummary([]);
       }
     }
   }
+  if (tabId === "prices") {
+    // The scroll container had no height while the tab was hidden
+    schedulePriceRender();
+  }
 }
 
 async function loadTypes() {
@@ -279,8 +308,18 @@ async function deleteSupplier(id) {
   }
 }
 
-async function loadProducts() {
-  state.products = await fetchJSON(`${API_BASE}/products`);
+const PRODUCTS_PAGE_SIZE = 200;
+
+async function loadProducts({ append = false } = {}) {
+  const params = new URLSearchParams({ limit: String(PRODUCTS_PAGE_SIZE) });
+  if (append && state.productsCursor) {
+    params.set("after", state.productsCursor);
+  }
+  const page = await fetchJSON(`${API_BASE}/products?${params}`);
+  const items = page?.items ?? [];
+  state.products = append ? state.products.concat(items) : items;
+  state.productsCursor = page?.nextCursor ?? null;
+  updateProductsMoreButton();
   if (state.selectedProductId && !state.products.some((product) => product.id === state.selectedProductId)) {
     state.selectedProductId = null;
   }
@@ -289,23 +328,51 @@ async function loadProducts() {
   renderProducts();
 }
 
+function updateProductsMoreButton() {
+  const button = document.querySelector("#products-more");
+  if (button) {
+    button.hidden = !state.productsCursor;
+  }
+}
+
+async function loadMoreProducts() {
+  if (!state.productsCursor) return;
+  try {
+    await loadProducts({ append: true });
+  } catch (error) {
+    showMessage(error.message, "error");
+  }
+}
+
+const PRODUCT_SEARCH_LIMIT = 50;
+const PRODUCT_SEARCH_DELAY_MS = 250;
+let productSearchTimer = null;
+
+async function searchProducts() {
+  const query = (state.productFilter || "").trim();
+  if (!query) {
+    await loadProducts();
+    return;
+  }
+  const params = new URLSearchParams({ q: query, limit: String(PRODUCT_SEARCH_LIMIT) });
+  const data = await fetchJSON(`${API_BASE}/products/search?${params}`);
+  if ((state.productFilter || "").trim() !== query) return;
+  state.products = data?.items ?? [];
+  state.productsCursor = null;
+  updateProductsMoreButton();
+  renderProducts();
+}
+
+function scheduleProductSearch() {
+  clearTimeout(productSearchTimer);
+  productSearchTimer = setTimeout(() => {
+    searchProducts().catch((error) => showMessage(error.message, "error"));
+  }, PRODUCT_SEARCH_DELAY_MS);
+}
+
 function renderProducts() {
   const tbody = document.querySelector("#products-table tbody");
-  const filter = (state.productFilter || "").trim().toLowerCase();
-  const products = filter
-    ? state.products.filter((product) => {
-        const categoryName = getCategoryName(product.category);
-        const values = [
-          product.partNumber,
-          product.name,
-          product.brand,
-          product.model,
-          product.comment,
-          categoryName,
-        ].filter(Boolean);
-        return values.some((value) => value.toLowerCase().includes(filter));
-      })
-    : [...state.products];
+  const products = state.products;
 
   tbody.innerHTML = "";
 
@@ -341,23 +408,75 @@ function renderProducts() {
   });
 }
 
-function populateProductSelects() {
-  const competitionSelect = document.querySelector("#competition-product-select");
-  const priceSelect = document.querySelector("#price-product");
-  const options =
+// Product pickers list the loaded page of products; typing in their filter searches the
+// whole catalog through /products/search
+const PRODUCT_PICKERS = [
+  { select: "#competition-product-select", filter: "#competition-product-filter" },
+  { select: "#price-product", filter: "#price-product-filter" },
+];
+const productPickerTimers = new Map();
+
+function productOptionLabel(product) {
+  return `${product.partNumber} — ${product.name}`;
+}
+
+function ensureProductOption(select, id, label) {
+  if (!select || !id) return;
+  if (!select.querySelector(`option[value="${id}"]`)) {
+    select.add(new Option(label, String(id)));
+  }
+  select.value = String(id);
+}
+
+function fillProductSelect(select, products) {
+  // Keep the current choice even when it is not among the listed products
+  const current = select.value;
+  const currentLabel = select.selectedOptions[0]?.textContent;
+  select.innerHTML =
     '<option value="">Выберите товар</option>' +
-    state.products
-      .map((product) => `<option value="${product.id}">${product.partNumber} — ${product.name}</option>`)
-      .join("");
-  if (competitionSelect) {
-    competitionSelect.innerHTML = options;
-    if (state.selectedProductId && state.products.some((product) => product.id === state.selectedProductId)) {
-      competitionSelect.value = String(state.selectedProductId);
+    products.map((product) => `<option value="${product.id}">${productOptionLabel(product)}</option>`).join("");
+  if (current) {
+    ensureProductOption(select, current, currentLabel ?? current);
+  }
+}
+
+function populateProductSelects() {
+  PRODUCT_PICKERS.forEach((picker) => {
+    const select = document.querySelector(picker.select);
+    const filter = document.querySelector(picker.filter);
+    if (select && !(filter?.value ?? "").trim()) {
+      fillProductSelect(select, state.products);
     }
+  });
+  const competitionSelect = document.querySelector("#competition-product-select");
+  const selected = productMap().get(state.selectedProductId);
+  if (competitionSelect && selected && !competitionSelect.value) {
+    ensureProductOption(competitionSelect, selected.id, productOptionLabel(selected));
   }
-  if (priceSelect) {
-    priceSelect.innerHTML = options;
+}
+
+async function searchProductPicker(picker) {
+  const select = document.querySelector(picker.select);
+  const query = (document.querySelector(picker.filter)?.value ?? "").trim();
+  if (!select) return;
+  if (!query) {
+    fillProductSelect(select, state.products);
+    return;
   }
+  const params = new URLSearchParams({ q: query, limit: String(PRODUCT_SEARCH_LIMIT) });
+  const data = await fetchJSON(`${API_BASE}/products/search?${params}`);
+  if ((document.querySelector(picker.filter)?.value ?? "").trim() !== query) return;
+  fillProductSelect(select, data?.items ?? []);
+}
+
+function scheduleProductPickerSearch(picker) {
+  clearTimeout(productPickerTimers.get(picker.select));
+  productPickerTimers.set(
+    picker.select,
+    setTimeout(() => {
+      searchProductPicker(picker).catch((error) => showMessage(error.message, "error"));
+    }, PRODUCT_SEARCH_DELAY_MS)
+  );
 }
 
 function selectProduct(id) {
@@ -478,6 +597,7 @@ async function refreshCompetition({ silent = false } = {}) {
   const candidateId = Number(select.value || state.selectedProductId);
   if (!candidateId) {
     renderCompetition([], "Выберите товар, чтобы увидеть предложения");
+    renderCompetitionSummary([]);
     if (!silent) {
       showMessage("Выберите товар для просмотра конкурентной карты", "error");
     }
@@ -496,8 +616,10 @@ async function refreshCompetition({ silent = false } = {}) {
   try {
     const data = await fetchJSON(`${API_BASE}/products/${candidateId}/competition`);
     renderCompetition(data.offers || []);
+    renderCompetitionSummary(data.summaries || []);
   } catch (error) {
     renderCompetition([], "Не удалось загрузить данные");
+    renderCompetitionSummary([]);
     if (!silent) {
       showMessage(error.message, "error");
     }
@@ -526,55 +648,135 @@ function renderCompetition(offers, emptyMessage = "Предложений пок
   });
 }
 
+// One summary per currency: prices in different currencies are not compared
+function renderCompetitionSummary(summaries) {
+  const target = document.querySelector("#competition-summary");
+  if (!target) return;
+  target.textContent = summaries.map(formatCompetitionSummary).join(" | ");
+}
+
+function formatCompetitionSummary(summary) {
+  const parts = [`${summary.currency ?? "Без валюты"} — предложений: ${summary.offerCount}`];
+  if (summary.minPrice !== null) {
+    parts.push(`цена мин/медиана/макс: ${summary.minPrice} / ${summary.medianPrice} / ${summary.maxPrice}`);
+    parts.push(`дешевле всех: ${summary.cheapestSupplierName ?? summary.cheapestSupplierId}`);
+  }
+  if (summary.fastestLeadTimeDays !== null) {
+    parts.push(
+      `быстрее всех: ${summary.fastestSupplierName ?? summary.fastestSupplierId} (${summary.fastestLeadTimeDays} дн.)`
+    );
+  }
+  return parts.join(" · ");
+}
+
+// The price list can hold hundreds of thousands of rows: pages are fetched from the server
+// view as the table is scrolled, and only the rows in sight are in the DOM.
+const PRICES_PAGE_SIZE = 200;
+const PRICE_SEARCH_DELAY_MS = 250;
+// Rows rendered above and below the visible ones, and how close to the end the next page loads
+const PRICE_OVERSCAN_ROWS = 10;
+const PRICE_PREFETCH_ROWS = 50;
+let priceRowHeight = 45;
+let priceSearchTimer = null;
+let priceRenderFrame = null;
+
+function priceViewParams() {
+  const [sort, order] = state.priceSort.split(":");
+  const params = new URLSearchParams({ sort, order, limit: String(PRICES_PAGE_SIZE) });
+  const query = (state.priceFilter || "").trim();
+  if (query) params.set("q", query);
+  return params;
+}
+
 async function loadPrices() {
-  state.prices = await fetchJSON(`${API_BASE}/supplier-prices`);
+  const generation = ++state.pricesGeneration;
+  state.pricesLoading = true;
+  try {
+    const data = await fetchJSON(`${API_BASE}/supplier-prices/view?${priceViewParams()}`);
+    if (generation !== state.pricesGeneration) return;
+    state.prices = data?.items ?? [];
+    state.pricesCursor = data?.nextCursor ?? null;
+  } finally {
+    if (generation === state.pricesGeneration) state.pricesLoading = false;
+  }
+  const scroller = document.querySelector("#prices-scroll");
+  if (scroller) scroller.scrollTop = 0;
+  renderPrices();
+}
+
+async function loadMorePrices() {
+  if (state.pricesLoading || !state.pricesCursor) return;
+  const generation = state.pricesGeneration;
+  const params = priceViewParams();
+  params.set("after", state.pricesCursor);
+  state.pricesLoading = true;
+  try {
+    const data = await fetchJSON(`${API_BASE}/supplier-prices/view?${params}`);
+    if (generation !== state.pricesGeneration) return;
+    state.prices = state.prices.concat(data?.items ?? []);
+    state.pricesCursor = data?.nextCursor ?? null;
+  } finally {
+    if (generation === state.pricesGeneration) state.pricesLoading = false;
+  }
   renderPrices();
 }
 
+function schedulePriceSearch() {
+  clearTimeout(priceSearchTimer);
+  priceSearchTimer = setTimeout(() => {
+    loadPrices().catch((error) => showMessage(error.message, "error"));
+  }, PRICE_SEARCH_DELAY_MS);
+}
+
+function schedulePriceRender() {
+  if (priceRenderFrame !== null) return;
+  priceRenderFrame = requestAnimationFrame(() => {
+    priceRenderFrame = null;
+    renderPrices();
+  });
+}
+
+function priceSpacerRow(height) {
+  const tr = document.createElement("tr");
+  tr.className = "spacer";
+  tr.innerHTML = `<td colspan="7" style="height: ${height}px"></td>`;
+  return tr;
+}
+
 function renderPrices() {
+  const scroller = document.querySelector("#prices-scroll");
   const tbody = document.querySelector("#prices-table tbody");
-  const filter = (state.priceFilter || "").trim().toLowerCase();
-  const productsLookup = productMap();
-  const suppliersLookup = supplierMap();
-  const prices = filter
-    ? state.prices.filter((price) => {
-        const product = productsLookup.get(price.productId);
-        const supplier = suppliersLookup.get(price.supplierId);
-        const categoryName = product ? getCategoryName(product.category) : "";
-        const values = [
-          price.totalPrice?.toString(),
-          price.currency,
-          product?.partNumber,
-          product?.name,
-          supplier?.name,
-          categoryName,
-        ].filter(Boolean);
-        return values.some((value) => value.toLowerCase().includes(filter));
-      })
-    : [...state.prices];
+  if (!scroller || !tbody) return;
+  const prices = state.prices;
 
   tbody.innerHTML = "";
 
   if (!prices.length) {
     const tr = document.createElement("tr");
-    tr.innerHTML = '<td class="table-empty" colspan="7">По вашему запросу ничего не найдено</td>';
+    tr.innerHTML = state.pricesLoading
+      ? '<td class="table-empty" colspan="7">Загрузка...</td>'
+      : '<td class="table-empty" colspan="7">По вашему запросу ничего не найдено</td>';
     tbody.appendChild(tr);
     return;
   }
 
-  prices.forEach((price) => {
+  const headerHeight = document.querySelector("#prices-table thead")?.offsetHeight ?? 0;
+  const top = Math.max(0, scroller.scrollTop - headerHeight);
+  const visibleRows = Math.ceil(scroller.clientHeight / priceRowHeight);
+  const first = Math.max(0, Math.floor(top / priceRowHeight) - PRICE_OVERSCAN_ROWS);
+  const last = Math.min(prices.length, first + visibleRows + 2 * PRICE_OVERSCAN_ROWS);
+
+  if (first > 0) tbody.appendChild(priceSpacerRow(first * priceRowHeight));
+  prices.slice(first, last).forEach((price) => {
     const tr = document.createElement("tr");
     tr.dataset.id = price.id;
-    const product = productsLookup.get(price.productId);
-    const supplier = suppliersLookup.get(price.supplierId);
-    const categoryName = product ? getCategoryName(product.category) : "";
-    const productCell = product
-      ? `${product.partNumber} — ${product.name}${categoryName ? ` (${categoryName})` : ""}`
-      : price.productId;
+    const productCell = `${price.partNumber} — ${price.productName}${
+      price.categoryDescription ? ` (${price.categoryDescription})` : ""
+    }`;
     tr.innerHTML = `
       <td>${price.id}</td>
-      <td>${productCell}</td>
-      <td>${supplier ? supplier.name : price.supplierId}</td>
+      <td><div class="cell-clip" title="${productCell}">${productCell}</div></td>
+      <td><div class="cell-clip">${price.supplierName}</div></td>
       <td>${price.totalPrice ?? ""}</td>
       <td>${price.leadTimeDays ?? ""}</td>
       <td>${price.currency ?? ""}</td>
@@ -591,6 +793,18 @@ function renderPrices() {
 
     tbody.appendChild(tr);
   });
+  if (last < prices.length) tbody.appendChild(priceSpacerRow((prices.length - last) * priceRowHeight));
+
+  const rendered = tbody.querySelector("tr:not(.spacer)");
+  if (rendered && rendered.offsetHeight && rendered.offsetHeight !== priceRowHeight) {
+    // Row height depends on fonts and zoom: measure once, then lay out again with it
+    priceRowHeight = rendered.offsetHeight;
+    schedulePriceRender();
+  }
+
+  if (last + PRICE_PREFETCH_ROWS >= prices.length) {
+    loadMorePrices().catch((error) => showMessage(error.message, "error"));
+  }
 }
 
 function selectPrice(id) {
@@ -598,7 +812,12 @@ function selectPrice(id) {
   const price = state.prices.find((item) => item.id === id);
   if (!price) return;
   document.querySelector("#price-id").value = price.id;
-  document.querySelector("#price-product").value = price.productId;
+  // The picker may list other products: add the one this price belongs to
+  ensureProductOption(
+    document.querySelector("#price-product"),
+    price.productId,
+    productOptionLabel({ partNumber: price.partNumber, name: price.productName })
+  );
   document.querySelector("#price-supplier").value = price.supplierId;
   document.querySelector("#price-total").value =
     price.totalPrice !== null && price.totalPrice !== undefined ? price.totalPrice : "";
@@ -696,26 +915,35 @@ function bindEvents() {
   document.querySelector("#product-reset")?.addEventListener("click", resetProductForm);
   document.querySelector("#product-search")?.addEventListener("input", (event) => {
     state.productFilter = event.target.value;
-    renderProducts();
+    scheduleProductSearch();
   });
+  document.querySelector("#products-more")?.addEventListener("click", loadMoreProducts);
 
   document.querySelector("#competition-refresh")?.addEventListener("click", () => refreshCompetition());
   document.querySelector("#competition-product-select")?.addEventListener("change", () => refreshCompetition());
+  PRODUCT_PICKERS.forEach((picker) => {
+    document.querySelector(picker.filter)?.addEventListener("input", () => scheduleProductPickerSearch(picker));
+  });
 
   document.querySelector("#price-form")?.addEventListener("submit", submitPrice);
   document.querySelector("#price-reset")?.addEventListener("click", resetPriceForm);
   document.querySelector("#price-search")?.addEventListener("input", (event) => {
     state.priceFilter = event.target.value;
-    renderPrices();
+    schedulePriceSearch();
   });
+  document.querySelector("#price-sort")?.addEventListener("change", (event) => {
+    state.priceSort = event.target.value;
+    loadPrices().catch((error) => showMessage(error.message, "error"));
+  });
+  document.querySelector("#prices-scroll")?.addEventListener("scroll", schedulePriceRender, { passive: true });
+  window.addEventListener("resize", schedulePriceRender);
 }
 
 async function bootstrap() {
   bindEvents();
   await loadTypes();
   try {
-    await Promise.all([loadSuppliers(), loadProducts()]);
-    await loadPrices();
+    await Promise.all([loadSuppliers(), loadProducts(), loadPrices()]);
   } catch (error) {
     showMessage(error.message, "error");
   }
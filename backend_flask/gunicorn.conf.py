@@ -0,0 +1,50 @@
+"""Gunicorn settings for the Flask API (``gunicorn -c gunicorn.conf.py main:app``).
+
+``GUNICORN_MODE`` picks the concurrency model:
+
+- ``threads`` (default): ``gthread`` workers, each serving ``GUNICORN_THREADS`` requests at once
+- ``sync``: one request per worker, the gunicorn default
+- ``gevent``: one greenlet per request, up to ``GUNICORN_WORKER_CONNECTIONS`` per worker; psycopg2
+  waits for the database through gevent (psycogreen) instead of blocking the worker
+
+Each worker keeps its own SQLAlchemy pool (``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW``), so size the pool
+to the requests a worker runs at once and ``workers x pool`` to PostgreSQL's ``max_connections``.
+"""
+import multiprocessing
+import os
+
+mode = os.getenv("GUNICORN_MODE", "threads")
+if mode not in ("sync", "threads", "gevent"):
+    raise ValueError(f"GUNICORN_MODE must be sync, threads or gevent, not {mode!r}")
+
+bind = f"0.0.0.0:{os.getenv('PORT_BACKEND', '3000')}"
+# gevent and threads multiplex I/O inside a worker, so one worker per core is enough there
+workers = int(
+    os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1 if mode == "sync" else multiprocessing.cpu_count())
+)
+
+if mode == "threads":
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", "8"))
+elif mode == "gevent":
+    worker_class = "gevent"
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+
+# Streaming exports can legitimately run for a while; sync workers are killed after this
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+# The app must not be imported before fork: the engine's pooled connections cannot be shared
+preload_app = False
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    if mode == "gevent":
+        # Without the wait callback every query blocks all greenlets of the worker
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
@@ -0,0 +1,143 @@
+"""Baseline schema previously created by db.create_all() at startup
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created before migrations already have these tables; only fill the gaps
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'request_types' not in existing:
+        op.create_table(
+            'request_types',
+            sa.Column('code', sa.String(length=50), primary_key=True),
+            sa.Column('description', sa.String(length=255), nullable=False),
+        )
+    if 'request_statuses' not in existing:
+        op.create_table(
+            'request_statuses',
+            sa.Column('code', sa.String(length=50), primary_key=True),
+            sa.Column('description', sa.String(length=255), nullable=False),
+        )
+    if 'product_categories' not in existing:
+        op.create_table(
+            'product_categories',
+            sa.Column('code', sa.String(length=50), primary_key=True),
+            sa.Column('description', sa.String(length=255), nullable=False),
+        )
+    if 'suppliers' not in existing:
+        op.create_table(
+            'suppliers',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('address', sa.String(length=200)),
+            sa.Column('contact', sa.String(length=100)),
+            sa.Column('website', sa.String(length=100)),
+            sa.Column('rating', sa.Float()),
+        )
+    if 'products' not in existing:
+        op.create_table(
+            'products',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('part_number', sa.String(length=100), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('brand', sa.String(length=100)),
+            sa.Column('model', sa.String(length=100)),
+            sa.Column('serial_number', sa.Integer()),
+            sa.Column('scheme', sa.String(length=50)),
+            sa.Column('pos_scheme', sa.String(length=100)),
+            sa.Column('material', sa.String(length=100)),
+            sa.Column('size', sa.String(length=300)),
+            sa.Column('comment', sa.String(length=300)),
+            sa.Column('category', sa.String(length=50), sa.ForeignKey('product_categories.code')),
+        )
+    if 'requests' not in existing:
+        op.create_table(
+            'requests',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('id_request', sa.Integer(), nullable=False),
+            sa.Column('type_request', sa.String(length=50), sa.ForeignKey('request_types.code')),
+            sa.Column('datetime_coming', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('datetime_delivery', sa.DateTime(timezone=True)),
+            sa.Column('status', sa.String(length=50), sa.ForeignKey('request_statuses.code')),
+            sa.Column('total_price', sa.Float()),
+            sa.UniqueConstraint('id_request', name='uq_requests_id_request'),
+        )
+    if 'supplier_product_prices' not in existing:
+        op.create_table(
+            'supplier_product_prices',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.id'), nullable=False),
+            sa.Column('supplier_id', sa.Integer(), sa.ForeignKey('suppliers.id'), nullable=False),
+            sa.Column('total_price', sa.Float()),
+            sa.Column('lead_time', postgresql.INTERVAL()),
+            sa.Column('cy', sa.String(length=30)),
+            sa.UniqueConstraint('product_id', 'supplier_id', name='uq_supplier_product'),
+        )
+    if 'request_items' not in existing:
+        op.create_table(
+            'request_items',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('part_number', sa.String(length=100)),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('quantity', sa.Integer()),
+            sa.Column('unit', sa.String(length=20)),
+            sa.Column('brand', sa.String(length=100)),
+            sa.Column('model', sa.String(length=100)),
+            sa.Column('serial_number', sa.Integer()),
+            sa.Column('scheme', sa.String(length=50)),
+            sa.Column('pos_scheme', sa.String(length=100)),
+            sa.Column('material', sa.String(length=100)),
+            sa.Column('comment', sa.String(length=300)),
+            sa.Column('unit_price', sa.Float()),
+            sa.Column('total_price', sa.Float()),
+            sa.Column('request_id', sa.Integer(), sa.ForeignKey('requests.id')),
+            sa.Column('product_id', sa.Integer(), sa.ForeignKey('products.id')),
+            sa.Column('match_type', sa.String(length=20)),
+            sa.CheckConstraint('quantity >= 0', name='chk_request_items_quantity'),
+        )
+
+    # Formerly _apply_schema_migrations(): early databases stored these as numbers
+    op.execute(
+        """
+        alter table products
+        alter column part_number type varchar(100) using part_number::text,
+        alter column pos_scheme type varchar(100) using pos_scheme::text
+        """
+    )
+    op.execute(
+        """
+        alter table request_items
+        alter column part_number type varchar(100) using part_number::text,
+        alter column pos_scheme type varchar(100) using pos_scheme::text
+        """
+    )
+    op.execute("alter table request_items add column if not exists match_type varchar(20)")
+
+
+def downgrade():
+    for table in (
+        'request_items',
+        'supplier_product_prices',
+        'requests',
+        'products',
+        'suppliers',
+        'product_categories',
+        'request_statuses',
+        'request_types',
+    ):
+        op.drop_table(table)
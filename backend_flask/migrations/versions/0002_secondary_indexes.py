@@ -0,0 +1,101 @@
+"""Secondary indexes for foreign keys, list ordering, lookups and search
+
+Revision ID: 0002_secondary_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_secondary_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+NORMALIZED_PART_NUMBER = "regexp_replace(upper(part_number), '[^[:alnum:]]', '', 'g')"
+
+INDEXES = [
+    # GET /supplier-prices?supplierId= and cascades from DELETE /suppliers/<id>
+    ('ix_supplier_product_prices_supplier_id', 'supplier_product_prices', ['supplier_id']),
+    # Items of a request (GET /requests item counts, selectinload) and of a product
+    ('ix_request_items_request_id', 'request_items', ['request_id']),
+    ('ix_request_items_product_id', 'request_items', ['product_id']),
+    # Keyset pagination of GET /requests
+    ('ix_requests_datetime_coming_id', 'requests', ['datetime_coming', 'id']),
+    ('ix_suppliers_name', 'suppliers', ['name']),
+    # Catalog matching of request items
+    ('ix_products_part_number', 'products', ['part_number']),
+    ('ix_products_part_number_normalized', 'products', [sa.text(NORMALIZED_PART_NUMBER)]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+    bind = op.get_bind()
+
+    # Product identity used by the Excel importer and POST /products/bulk. Legacy data may
+    # hold duplicates; those have to be merged by hand before the index can exist.
+    duplicates = bind.execute(
+        sa.text(
+            """
+            select count(*) from (
+              select 1 from products
+              group by part_number, name, coalesce(brand, '')
+              having count(*) > 1
+            ) as duplicated
+            """
+        )
+    ).scalar()
+    if duplicates:
+        logger.warning(
+            'Skipping uq_products_identity: %s (part_number, name, brand) groups are duplicated', duplicates
+        )
+    else:
+        op.create_index(
+            'uq_products_identity',
+            'products',
+            ['part_number', 'name', sa.text("coalesce(brand, '')")],
+            unique=True,
+            if_not_exists=True,
+        )
+
+    # Trigram search is optional: without pg_trgm the app falls back to ILIKE
+    try:
+        with bind.begin_nested():
+            op.execute('create extension if not exists pg_trgm')
+    except sa.exc.DBAPIError as exc:
+        logger.warning('pg_trgm is not available, skipping trigram indexes: %s', exc.orig)
+        return
+    op.create_index(
+        'ix_products_part_number_trgm',
+        'products',
+        ['part_number'],
+        postgresql_using='gin',
+        postgresql_ops={'part_number': 'gin_trgm_ops'},
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_products_name_trgm',
+        'products',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_products_name_trgm', table_name='products', if_exists=True)
+    op.drop_index('ix_products_part_number_trgm', table_name='products', if_exists=True)
+    op.drop_index('uq_products_identity', table_name='products', if_exists=True)
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,68 @@
+"""Per-table change counters for ETags
+
+Revision ID: 0003_table_versions
+Revises: 0002_secondary_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_table_versions'
+down_revision = '0002_secondary_indexes'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = [
+    'suppliers',
+    'products',
+    'product_categories',
+    'supplier_product_prices',
+    'requests',
+    'request_items',
+    'request_types',
+    'request_statuses',
+]
+
+
+def upgrade():
+    op.execute(
+        """
+        create table table_versions (
+          table_name text primary key,
+          version bigint not null default 1,
+          updated_at timestamptz not null default clock_timestamp()
+        )
+        """
+    )
+    # Statement-level, so a bulk upsert or an importer merge bumps the counter once. Writers
+    # of the same table queue on its counter row until they commit.
+    op.execute(
+        """
+        create function bump_table_version() returns trigger language plpgsql as $$
+        begin
+          insert into table_versions (table_name) values (TG_TABLE_NAME)
+          on conflict (table_name) do update
+            set version = table_versions.version + 1, updated_at = clock_timestamp();
+          return null;
+        end
+        $$
+        """
+    )
+    for table in VERSIONED_TABLES:
+        op.execute(f"insert into table_versions (table_name) values ('{table}')")
+        op.execute(
+            f"""
+            create trigger {table}_version
+            after insert or update or delete or truncate on {table}
+            for each statement execute function bump_table_version()
+            """
+        )
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.execute(f"drop trigger if exists {table}_version on {table}")
+    op.execute("drop function if exists bump_table_version()")
+    op.execute("drop table if exists table_versions")
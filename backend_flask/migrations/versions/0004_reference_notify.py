@@ -0,0 +1,45 @@
+"""Notify workers when reference tables change
+
+Revision ID: 0004_reference_notify
+Revises: 0003_table_versions
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_reference_notify'
+down_revision = '0003_table_versions'
+branch_labels = None
+depends_on = None
+
+REFERENCE_TABLES = ['product_categories', 'request_statuses', 'request_types']
+
+
+def upgrade():
+    # Workers LISTEN on this channel and drop their in-process reference cache
+    op.execute(
+        """
+        create function notify_reference_change() returns trigger language plpgsql as $$
+        begin
+          perform pg_notify('reference_data', TG_TABLE_NAME);
+          return null;
+        end
+        $$
+        """
+    )
+    for table in REFERENCE_TABLES:
+        op.execute(
+            f"""
+            create trigger {table}_notify
+            after insert or update or delete or truncate on {table}
+            for each statement execute function notify_reference_change()
+            """
+        )
+
+
+def downgrade():
+    for table in REFERENCE_TABLES:
+        op.execute(f"drop trigger if exists {table}_notify on {table}")
+    op.execute("drop function if exists notify_reference_change()")
@@ -0,0 +1,35 @@
+"""Indexes for the sort orders of the price view
+
+Revision ID: 0005_price_sort_indexes
+Revises: 0004_reference_notify
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_price_sort_indexes'
+down_revision = '0004_reference_notify'
+branch_labels = None
+depends_on = None
+
+# Must match app.models.LEAD_TIME_DAYS as compiled, or the planner cannot use the index
+LEAD_TIME_DAYS = 'CAST(EXTRACT(epoch FROM lead_time) AS FLOAT) / 86400'
+
+INDEXES = [
+    # GET /supplier-prices/view?sort=price|leadTime, scanned forwards or backwards
+    ('ix_supplier_product_prices_total_price_id', ['total_price', 'id']),
+    ('ix_supplier_product_prices_lead_time_days_id', [sa.text(f'({LEAD_TIME_DAYS})'), 'id']),
+]
+
+
+def upgrade():
+    for name, columns in INDEXES:
+        op.create_index(name, 'supplier_product_prices', columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='supplier_product_prices', if_exists=True)
@@ -0,0 +1,124 @@
+"""Per-product best-price summary with an incremental refresh function
+
+Revision ID: 0006_product_best_prices
+Revises: 0005_price_sort_indexes
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_product_best_prices'
+down_revision = '0005_price_sort_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'product_best_prices',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('offer_count', sa.Integer(), nullable=False),
+        sa.Column('min_price', sa.Float(), nullable=True),
+        sa.Column('currency', sa.String(length=30), nullable=True),
+        sa.Column('cheapest_supplier_id', sa.Integer(), nullable=True),
+        sa.Column('best_lead_time_days', sa.Float(), nullable=True),
+        sa.Column('fastest_supplier_id', sa.Integer(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['cheapest_supplier_id'], ['suppliers.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['fastest_supplier_id'], ['suppliers.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    # ?supplierId= filter, and the ON DELETE SET NULL of a supplier delete
+    op.create_index('ix_product_best_prices_cheapest_supplier_id', 'product_best_prices', ['cheapest_supplier_id'])
+    op.create_index('ix_product_best_prices_fastest_supplier_id', 'product_best_prices', ['fastest_supplier_id'])
+
+    # Recomputes the rows of the given products from their offers: the importer calls it
+    # for the products it wrote, the API for the products whose offers it changed. Rows
+    # that did not change are not rewritten.
+    op.execute(
+        """
+        create function refresh_product_best_prices(product_ids integer[]) returns integer
+        language sql as $$
+          with offers as (
+            select spp.product_id,
+                   spp.supplier_id,
+                   s.name as supplier_name,
+                   spp.total_price,
+                   spp.cy,
+                   extract(epoch from spp.lead_time)::float8 / 86400 as lead_time_days
+            from supplier_product_prices spp
+            join suppliers s on s.id = spp.supplier_id
+            where spp.product_id = any(product_ids)
+          ),
+          summary as (
+            select product_id,
+                   count(*)::integer as offer_count,
+                   min(total_price) as min_price,
+                   (array_agg(cy order by total_price, supplier_name)
+                      filter (where total_price is not null))[1] as currency,
+                   (array_agg(supplier_id order by total_price, supplier_name)
+                      filter (where total_price is not null))[1] as cheapest_supplier_id,
+                   min(lead_time_days) as best_lead_time_days,
+                   (array_agg(supplier_id order by lead_time_days, total_price, supplier_name)
+                      filter (where lead_time_days is not null))[1] as fastest_supplier_id
+            from offers
+            group by product_id
+          ),
+          removed as (
+            delete from product_best_prices b
+            where b.product_id = any(product_ids)
+              and not exists (select 1 from summary s where s.product_id = b.product_id)
+            returning 1
+          ),
+          written as (
+            insert into product_best_prices as b (
+              product_id, offer_count, min_price, currency,
+              cheapest_supplier_id, best_lead_time_days, fastest_supplier_id
+            )
+            select product_id, offer_count, min_price, currency,
+                   cheapest_supplier_id, best_lead_time_days, fastest_supplier_id
+            from summary
+            on conflict (product_id) do update set
+              offer_count = excluded.offer_count,
+              min_price = excluded.min_price,
+              currency = excluded.currency,
+              cheapest_supplier_id = excluded.cheapest_supplier_id,
+              best_lead_time_days = excluded.best_lead_time_days,
+              fastest_supplier_id = excluded.fastest_supplier_id,
+              refreshed_at = now()
+            where (b.offer_count, b.min_price, b.currency, b.cheapest_supplier_id,
+                   b.best_lead_time_days, b.fastest_supplier_id)
+                  is distinct from
+                  (excluded.offer_count, excluded.min_price, excluded.currency,
+                   excluded.cheapest_supplier_id, excluded.best_lead_time_days,
+                   excluded.fastest_supplier_id)
+            returning 1
+          )
+          select ((select count(*) from removed) + (select count(*) from written))::integer
+        $$
+        """
+    )
+    op.execute('select refresh_product_best_prices(array(select id from products))')
+
+    # Bump the ETag counter like the other tables (0003)
+    op.execute("insert into table_versions (table_name) values ('product_best_prices') on conflict do nothing")
+    op.execute(
+        """
+        create trigger product_best_prices_version
+        after insert or update or delete or truncate on product_best_prices
+        for each statement execute function bump_table_version()
+        """
+    )
+
+
+def downgrade():
+    op.execute('drop trigger if exists product_best_prices_version on product_best_prices')
+    op.execute("delete from table_versions where table_name = 'product_best_prices'")
+    op.execute('drop function if exists refresh_product_best_prices(integer[])')
+    op.drop_index('ix_product_best_prices_fastest_supplier_id', table_name='product_best_prices')
+    op.drop_index('ix_product_best_prices_cheapest_supplier_id', table_name='product_best_prices')
+    op.drop_table('product_best_prices')
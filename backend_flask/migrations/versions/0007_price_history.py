@@ -0,0 +1,146 @@
+"""Append-only, monthly partitioned history of supplier offers
+
+Revision ID: 0007_price_history
+Revises: 0006_product_best_prices
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_price_history'
+down_revision = '0006_product_best_prices'
+branch_labels = None
+depends_on = None
+
+# Transition tables are only allowed on single-event triggers
+HISTORY_TRIGGERS = [
+    ('supplier_product_prices_history_insert', 'insert', 'new table as new_rows'),
+    ('supplier_product_prices_history_update', 'update', 'old table as old_rows new table as new_rows'),
+    ('supplier_product_prices_history_delete', 'delete', 'old table as old_rows'),
+]
+
+
+def upgrade():
+    # One row per version of an offer, valid from the writing transaction's start until the
+    # next row of the same (product_id, supplier_id); deleted offers end with a tombstone.
+    op.execute(
+        """
+        create table supplier_product_price_history (
+          id bigserial not null,
+          price_id integer not null,
+          product_id integer not null,
+          supplier_id integer not null,
+          total_price double precision,
+          lead_time interval,
+          cy varchar(30),
+          deleted boolean not null default false,
+          valid_from timestamptz not null,
+          primary key (id, valid_from)
+        ) partition by range (valid_from)
+        """
+    )
+    # Created on the parent, so every partition gets it
+    op.execute(
+        """
+        create index ix_supplier_product_price_history_product_valid_from
+        on supplier_product_price_history (product_id, valid_from, id)
+        """
+    )
+
+    # Months are UTC calendar months; partitions are created on first use. The advisory
+    # lock makes concurrent first writers of a month create it once.
+    op.execute(
+        """
+        create function ensure_price_history_partition(at timestamptz) returns void
+        language plpgsql as $$
+        declare
+          month_start timestamp := date_trunc('month', at at time zone 'UTC');
+          partition_name text := 'supplier_product_price_history_' || to_char(month_start, 'YYYY_MM');
+        begin
+          if to_regclass(partition_name) is not null then
+            return;
+          end if;
+          perform pg_advisory_xact_lock(hashtext('supplier_product_price_history'));
+          if to_regclass(partition_name) is not null then
+            return;
+          end if;
+          execute format(
+            'create table %I partition of supplier_product_price_history for values from (%L) to (%L)',
+            partition_name,
+            month_start at time zone 'UTC',
+            (month_start + interval '1 month') at time zone 'UTC'
+          );
+        end
+        $$
+        """
+    )
+
+    # Statement-level: an importer merge or a bulk upsert appends its history with one
+    # INSERT ... SELECT over the transition table, never row by row. Updates that leave the
+    # offer unchanged are not recorded.
+    op.execute(
+        """
+        create function record_price_history() returns trigger language plpgsql as $$
+        begin
+          perform ensure_price_history_partition(now());
+          if TG_OP = 'INSERT' then
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n;
+          elsif TG_OP = 'UPDATE' then
+            -- An offer moved to another product or supplier ends under its old key
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o
+            join new_rows n on n.id = o.id
+            where (n.product_id, n.supplier_id) is distinct from (o.product_id, o.supplier_id);
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n
+            join old_rows o on o.id = n.id
+            where (n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy)
+                  is distinct from (o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy);
+          else
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o;
+          end if;
+          return null;
+        end
+        $$
+        """
+    )
+    for name, event, referencing in HISTORY_TRIGGERS:
+        op.execute(
+            f"""
+            create trigger {name}
+            after {event} on supplier_product_prices
+            referencing {referencing}
+            for each statement execute function record_price_history()
+            """
+        )
+
+    # Current offers are the first version on record
+    op.execute("select ensure_price_history_partition(now())")
+    op.execute(
+        """
+        insert into supplier_product_price_history
+          (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+        select id, product_id, supplier_id, total_price, lead_time, cy, now()
+        from supplier_product_prices
+        """
+    )
+
+
+def downgrade():
+    for name, _, _ in HISTORY_TRIGGERS:
+        op.execute(f'drop trigger if exists {name} on supplier_product_prices')
+    op.execute('drop function if exists record_price_history()')
+    op.execute('drop function if exists ensure_price_history_partition(timestamptz)')
+    op.execute('drop table if exists supplier_product_price_history')
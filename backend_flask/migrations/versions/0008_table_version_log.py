@@ -0,0 +1,78 @@
+"""Append-only change log behind the ETag counters
+
+Revision ID: 0008_table_version_log
+Revises: 0007_price_history
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_table_version_log'
+down_revision = '0007_price_history'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Writers only append here, so they never wait on each other's counter row. A table's
+    # version is its table_versions baseline plus its rows in this log; compaction
+    # (compact_table_versions) folds the log into the baseline in one statement.
+    op.execute(
+        """
+        create table table_version_changes (
+          table_name text not null,
+          changed_at timestamptz not null default clock_timestamp()
+        )
+        """
+    )
+    op.execute("create index ix_table_version_changes_table_name on table_version_changes (table_name, changed_at)")
+    op.execute(
+        """
+        create or replace function bump_table_version() returns trigger language plpgsql as $$
+        begin
+          insert into table_version_changes (table_name) values (TG_TABLE_NAME);
+          return null;
+        end
+        $$
+        """
+    )
+    op.execute(
+        """
+        create function compact_table_versions() returns bigint language sql as $$
+          with moved as (
+            delete from table_version_changes returning table_name, changed_at
+          ), counts as (
+            select table_name, count(*) as changes, max(changed_at) as last_changed
+            from moved
+            group by table_name
+          ), folded as (
+            insert into table_versions (table_name, version, updated_at)
+            select table_name, changes, last_changed from counts
+            on conflict (table_name) do update
+              set version = table_versions.version + excluded.version,
+                  updated_at = greatest(table_versions.updated_at, excluded.updated_at)
+          )
+          select coalesce(sum(changes), 0)::bigint from counts
+        $$
+        """
+    )
+
+
+def downgrade():
+    op.execute("select compact_table_versions()")
+    op.execute("drop function if exists compact_table_versions()")
+    op.execute(
+        """
+        create or replace function bump_table_version() returns trigger language plpgsql as $$
+        begin
+          insert into table_versions (table_name) values (TG_TABLE_NAME)
+          on conflict (table_name) do update
+            set version = table_versions.version + 1, updated_at = clock_timestamp();
+          return null;
+        end
+        $$
+        """
+    )
+    op.execute("drop table if exists table_version_changes")
@@ -0,0 +1,137 @@
+"""Create price history partitions ahead of time instead of from the trigger
+
+Revision ID: 0009_history_partitions_ahead
+Revises: 0008_table_version_log
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_history_partitions_ahead'
+down_revision = '0008_table_version_log'
+branch_labels = None
+depends_on = None
+
+# Months created by the migration: the current one and the next two
+MONTHS_AHEAD = 2
+
+
+def upgrade():
+    op.execute(
+        """
+        create function price_history_partition_name(at timestamptz) returns text
+        language sql stable as $$
+          select 'supplier_product_price_history_' || to_char(date_trunc('month', at at time zone 'UTC'), 'YYYY_MM')
+        $$
+        """
+    )
+    # Called by `flask --app main setup` and the create-history-partitions command, outside
+    # any write transaction; returns how many partitions it created
+    op.execute(
+        """
+        create function create_price_history_partitions(months_ahead integer) returns integer
+        language plpgsql as $$
+        declare
+          created integer := 0;
+          month_start timestamptz;
+        begin
+          for offset_months in 0..months_ahead loop
+            month_start := (date_trunc('month', now() at time zone 'UTC') + make_interval(months => offset_months))
+                           at time zone 'UTC';
+            if to_regclass(price_history_partition_name(month_start)) is null then
+              perform ensure_price_history_partition(month_start);
+              created := created + 1;
+            end if;
+          end loop;
+          return created;
+        end
+        $$
+        """
+    )
+    op.execute(f"select create_price_history_partitions({MONTHS_AHEAD})")
+    op.execute(
+        """
+        create or replace function record_price_history() returns trigger language plpgsql as $$
+        begin
+          -- Partitions are created ahead of time (create_price_history_partitions); creating
+          -- one here would take an ACCESS EXCLUSIVE lock on the history inside the writer's
+          -- transaction, so a missing month is an error instead
+          if to_regclass(price_history_partition_name(now())) is null then
+            raise exception 'No supplier_product_price_history partition for %',
+              to_char(now() at time zone 'UTC', 'YYYY-MM')
+              using hint = 'Run `flask --app main create-history-partitions` (also part of `flask --app main setup`).';
+          end if;
+          if TG_OP = 'INSERT' then
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n;
+          elsif TG_OP = 'UPDATE' then
+            -- An offer moved to another product or supplier ends under its old key
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o
+            join new_rows n on n.id = o.id
+            where (n.product_id, n.supplier_id) is distinct from (o.product_id, o.supplier_id);
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n
+            join old_rows o on o.id = n.id
+            where (n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy)
+                  is distinct from (o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy);
+          else
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o;
+          end if;
+          return null;
+        end
+        $$
+        """
+    )
+
+
+def downgrade():
+    op.execute(
+        """
+        create or replace function record_price_history() returns trigger language plpgsql as $$
+        begin
+          perform ensure_price_history_partition(now());
+          if TG_OP = 'INSERT' then
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n;
+          elsif TG_OP = 'UPDATE' then
+            -- An offer moved to another product or supplier ends under its old key
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o
+            join new_rows n on n.id = o.id
+            where (n.product_id, n.supplier_id) is distinct from (o.product_id, o.supplier_id);
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n
+            join old_rows o on o.id = n.id
+            where (n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy)
+                  is distinct from (o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy);
+          else
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o;
+          end if;
+          return null;
+        end
+        $$
+        """
+    )
+    op.execute('drop function if exists create_price_history_partitions(integer)')
+    op.execute('drop function if exists price_history_partition_name(timestamptz)')
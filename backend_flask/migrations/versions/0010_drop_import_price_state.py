@@ -0,0 +1,26 @@
+"""Drop the importer's import_price_state table
+
+Revision ID: 0010_drop_import_price_state
+Revises: 0009_history_partitions_ahead
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_drop_import_price_state'
+down_revision = '0009_history_partitions_ahead'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier importer versions created this table to remember the last imported offers;
+    # unchanged offers are now detected against supplier_product_prices itself.
+    op.execute("drop table if exists import_price_state")
+
+
+def downgrade():
+    # The importer no longer reads the table, so there is nothing to restore
+    pass
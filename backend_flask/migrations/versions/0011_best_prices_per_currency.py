@@ -0,0 +1,165 @@
+"""Summarise best prices per product and currency
+
+Revision ID: 0011_best_prices_per_currency
+Revises: 0010_drop_import_price_state
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_best_prices_per_currency'
+down_revision = '0010_drop_import_price_state'
+branch_labels = None
+depends_on = None
+
+# Prices quoted in different currencies are never compared: each (product, currency) pair
+# gets its own row, and offers without a currency share one (NULLS NOT DISTINCT).
+REFRESH_FUNCTION = """
+    create or replace function refresh_product_best_prices(product_ids integer[]) returns integer
+    language sql as $$
+      with offers as (
+        select spp.product_id,
+               spp.supplier_id,
+               s.name as supplier_name,
+               spp.total_price,
+               spp.cy,
+               extract(epoch from spp.lead_time)::float8 / 86400 as lead_time_days
+        from supplier_product_prices spp
+        join suppliers s on s.id = spp.supplier_id
+        where spp.product_id = any(product_ids)
+      ),
+      summary as (
+        select product_id,
+               cy as currency,
+               count(*)::integer as offer_count,
+               min(total_price) as min_price,
+               (array_agg(supplier_id order by total_price, supplier_name)
+                  filter (where total_price is not null))[1] as cheapest_supplier_id,
+               min(lead_time_days) as best_lead_time_days,
+               (array_agg(supplier_id order by lead_time_days, total_price, supplier_name)
+                  filter (where lead_time_days is not null))[1] as fastest_supplier_id
+        from offers
+        group by product_id, cy
+      ),
+      removed as (
+        delete from product_best_prices b
+        where b.product_id = any(product_ids)
+          and not exists (
+            select 1 from summary s
+            where s.product_id = b.product_id and s.currency is not distinct from b.currency
+          )
+        returning 1
+      ),
+      written as (
+        insert into product_best_prices as b (
+          product_id, currency, offer_count, min_price,
+          cheapest_supplier_id, best_lead_time_days, fastest_supplier_id
+        )
+        select product_id, currency, offer_count, min_price,
+               cheapest_supplier_id, best_lead_time_days, fastest_supplier_id
+        from summary
+        on conflict (product_id, currency) do update set
+          offer_count = excluded.offer_count,
+          min_price = excluded.min_price,
+          cheapest_supplier_id = excluded.cheapest_supplier_id,
+          best_lead_time_days = excluded.best_lead_time_days,
+          fastest_supplier_id = excluded.fastest_supplier_id,
+          refreshed_at = now()
+        where (b.offer_count, b.min_price, b.cheapest_supplier_id,
+               b.best_lead_time_days, b.fastest_supplier_id)
+              is distinct from
+              (excluded.offer_count, excluded.min_price, excluded.cheapest_supplier_id,
+               excluded.best_lead_time_days, excluded.fastest_supplier_id)
+        returning 1
+      )
+      select ((select count(*) from removed) + (select count(*) from written))::integer
+    $$
+"""
+
+# 0006's version: one row per product, cheapest across all currencies
+PREVIOUS_REFRESH_FUNCTION = """
+    create or replace function refresh_product_best_prices(product_ids integer[]) returns integer
+    language sql as $$
+      with offers as (
+        select spp.product_id,
+               spp.supplier_id,
+               s.name as supplier_name,
+               spp.total_price,
+               spp.cy,
+               extract(epoch from spp.lead_time)::float8 / 86400 as lead_time_days
+        from supplier_product_prices spp
+        join suppliers s on s.id = spp.supplier_id
+        where spp.product_id = any(product_ids)
+      ),
+      summary as (
+        select product_id,
+               count(*)::integer as offer_count,
+               min(total_price) as min_price,
+               (array_agg(cy order by total_price, supplier_name)
+                  filter (where total_price is not null))[1] as currency,
+               (array_agg(supplier_id order by total_price, supplier_name)
+                  filter (where total_price is not null))[1] as cheapest_supplier_id,
+               min(lead_time_days) as best_lead_time_days,
+               (array_agg(supplier_id order by lead_time_days, total_price, supplier_name)
+                  filter (where lead_time_days is not null))[1] as fastest_supplier_id
+        from offers
+        group by product_id
+      ),
+      removed as (
+        delete from product_best_prices b
+        where b.product_id = any(product_ids)
+          and not exists (select 1 from summary s where s.product_id = b.product_id)
+        returning 1
+      ),
+      written as (
+        insert into product_best_prices as b (
+          product_id, offer_count, min_price, currency,
+          cheapest_supplier_id, best_lead_time_days, fastest_supplier_id
+        )
+        select product_id, offer_count, min_price, currency,
+               cheapest_supplier_id, best_lead_time_days, fastest_supplier_id
+        from summary
+        on conflict (product_id) do update set
+          offer_count = excluded.offer_count,
+          min_price = excluded.min_price,
+          currency = excluded.currency,
+          cheapest_supplier_id = excluded.cheapest_supplier_id,
+          best_lead_time_days = excluded.best_lead_time_days,
+          fastest_supplier_id = excluded.fastest_supplier_id,
+          refreshed_at = now()
+        where (b.offer_count, b.min_price, b.currency, b.cheapest_supplier_id,
+               b.best_lead_time_days, b.fastest_supplier_id)
+              is distinct from
+              (excluded.offer_count, excluded.min_price, excluded.currency,
+               excluded.cheapest_supplier_id, excluded.best_lead_time_days,
+               excluded.fastest_supplier_id)
+        returning 1
+      )
+      select ((select count(*) from removed) + (select count(*) from written))::integer
+    $$
+"""
+
+
+def upgrade():
+    op.drop_constraint('product_best_prices_pkey', 'product_best_prices', type_='primary')
+    op.execute('alter table product_best_prices add column id serial primary key')
+    op.create_index(
+        'uq_product_best_prices_product_currency',
+        'product_best_prices',
+        ['product_id', 'currency'],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    op.execute(REFRESH_FUNCTION)
+    op.execute('select refresh_product_best_prices(array(select id from products))')
+
+
+def downgrade():
+    op.execute('delete from product_best_prices')
+    op.drop_index('uq_product_best_prices_product_currency', table_name='product_best_prices')
+    op.execute('alter table product_best_prices drop column id')
+    op.create_primary_key('product_best_prices_pkey', 'product_best_prices', ['product_id'])
+    op.execute(PREVIOUS_REFRESH_FUNCTION)
+    op.execute('select refresh_product_best_prices(array(select id from products))')
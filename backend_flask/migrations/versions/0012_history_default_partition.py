@@ -0,0 +1,169 @@
+"""Catch price history of months without a partition in a default partition
+
+Revision ID: 0012_history_default_partition
+Revises: 0011_best_prices_per_currency
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_history_default_partition'
+down_revision = '0011_best_prices_per_currency'
+branch_labels = None
+depends_on = None
+
+DEFAULT_PARTITION = 'supplier_product_price_history_default'
+
+# Shared by both versions of record_price_history(): the statement-level inserts
+RECORD_STATEMENTS = """
+          if TG_OP = 'INSERT' then
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n;
+          elsif TG_OP = 'UPDATE' then
+            -- An offer moved to another product or supplier ends under its old key
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o
+            join new_rows n on n.id = o.id
+            where (n.product_id, n.supplier_id) is distinct from (o.product_id, o.supplier_id);
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, valid_from)
+            select n.id, n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy, now()
+            from new_rows n
+            join old_rows o on o.id = n.id
+            where (n.product_id, n.supplier_id, n.total_price, n.lead_time, n.cy)
+                  is distinct from (o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy);
+          else
+            insert into supplier_product_price_history
+              (price_id, product_id, supplier_id, total_price, lead_time, cy, deleted, valid_from)
+            select o.id, o.product_id, o.supplier_id, o.total_price, o.lead_time, o.cy, true, now()
+            from old_rows o;
+          end if;
+          return null;
+"""
+
+
+def upgrade():
+    # A month nobody created a partition for lands here instead of failing the price write
+    op.execute(f'create table {DEFAULT_PARTITION} partition of supplier_product_price_history default')
+    # A month's partition cannot be created while the default one holds rows of that month,
+    # so they are moved into a detached table that is then attached. Locking the default
+    # partition first keeps writers from adding rows of the month in between.
+    op.execute(
+        f"""
+        create or replace function ensure_price_history_partition(at timestamptz) returns void
+        language plpgsql as $$
+        declare
+          month_start timestamp := date_trunc('month', at at time zone 'UTC');
+          partition_name text := 'supplier_product_price_history_' || to_char(month_start, 'YYYY_MM');
+          range_start timestamptz := month_start at time zone 'UTC';
+          range_end timestamptz := (month_start + interval '1 month') at time zone 'UTC';
+        begin
+          if to_regclass(partition_name) is not null then
+            return;
+          end if;
+          perform pg_advisory_xact_lock(hashtext('supplier_product_price_history'));
+          if to_regclass(partition_name) is not null then
+            return;
+          end if;
+          lock table {DEFAULT_PARTITION} in exclusive mode;
+          if not exists (
+            select 1 from {DEFAULT_PARTITION} where valid_from >= range_start and valid_from < range_end
+          ) then
+            execute format(
+              'create table %I partition of supplier_product_price_history for values from (%L) to (%L)',
+              partition_name, range_start, range_end
+            );
+            return;
+          end if;
+          execute format(
+            'create table %I (like supplier_product_price_history including defaults including constraints)',
+            partition_name
+          );
+          execute format(
+            'with moved as (
+               delete from {DEFAULT_PARTITION} where valid_from >= %L and valid_from < %L returning *
+             )
+             insert into %I select * from moved',
+            range_start, range_end, partition_name
+          );
+          execute format(
+            'alter table supplier_product_price_history attach partition %I for values from (%L) to (%L)',
+            partition_name, range_start, range_end
+          );
+        end
+        $$
+        """
+    )
+    op.execute(
+        f"""
+        create or replace function record_price_history() returns trigger language plpgsql as $$
+        begin
+          -- Partitions are created ahead of time (create_price_history_partitions); a month
+          -- without one goes to the default partition until it is created
+{RECORD_STATEMENTS}
+        end
+        $$
+        """
+    )
+
+
+def downgrade():
+    # Give every month left in the default partition its own partition before dropping it
+    op.execute(
+        f"""
+        select ensure_price_history_partition(month_start)
+        from (
+          select distinct date_trunc('month', valid_from at time zone 'UTC') at time zone 'UTC' as month_start
+          from {DEFAULT_PARTITION}
+        ) months
+        """
+    )
+    op.execute(
+        f"""
+        create or replace function record_price_history() returns trigger language plpgsql as $$
+        begin
+          -- Partitions are created ahead of time (create_price_history_partitions); creating
+          -- one here would take an ACCESS EXCLUSIVE lock on the history inside the writer's
+          -- transaction, so a missing month is an error instead
+          if to_regclass(price_history_partition_name(now())) is null then
+            raise exception 'No supplier_product_price_history partition for %',
+              to_char(now() at time zone 'UTC', 'YYYY-MM')
+              using hint = 'Run `flask --app main create-history-partitions` (also part of `flask --app main setup`).';
+          end if;
+{RECORD_STATEMENTS}
+        end
+        $$
+        """
+    )
+    op.execute(f'drop table {DEFAULT_PARTITION}')
+    op.execute(
+        """
+        create or replace function ensure_price_history_partition(at timestamptz) returns void
+        language plpgsql as $$
+        declare
+          month_start timestamp := date_trunc('month', at at time zone 'UTC');
+          partition_name text := 'supplier_product_price_history_' || to_char(month_start, 'YYYY_MM');
+        begin
+          if to_regclass(partition_name) is not null then
+            return;
+          end if;
+          perform pg_advisory_xact_lock(hashtext('supplier_product_price_history'));
+          if to_regclass(partition_name) is not null then
+            return;
+          end if;
+          execute format(
+            'create table %I partition of supplier_product_price_history for values from (%L) to (%L)',
+            partition_name,
+            month_start at time zone 'UTC',
+            (month_start + interval '1 month') at time zone 'UTC'
+          );
+        end
+        $$
+        """
+    )
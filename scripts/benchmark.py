@@ -0,0 +1,684 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import http.client
+import importlib.util
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+import psycopg2
+from openpyxl import Workbook
+
+from import_excel import (
+    SUPPLIER_GROUP_START,
+    extract_suppliers,
+    load_environment,
+    mask_connection_url,
+    open_excel,
+    parse_rows,
+    prepare_connection_url,
+)
+
+SEARCH_NAMES = [
+    "OIL FILTER / МАСЛЯНЫЙ ФИЛЬТР",
+    "CARRIER PISTON RING (WEAR BAND) / НЕСУЩЕЕ ПОРШНЕВОЕ КОЛЬЦО (ИЗНОСНОЕ КОЛЬЦО)",
+    "GASKET / ПРОКЛАДКА",
+    "VALVE PLATE / ПЛАСТИНА КЛАПАНА",
+    "BEARING / ПОДШИПНИК",
+    "SEAL KIT / КОМПЛЕКТ УПЛОТНЕНИЙ",
+]
+
+SHEET_HEADER = [
+    "№",
+    "НАПРАВЛЕНИЕ",
+    "ПРОИЗВОДИТЕЛЬ",
+    "АРТИКУЛ",
+    "НАИМЕНОВАНИЕ",
+    "ИЗДЕЛИЕ",
+    "НОМЕР ИЗДЕЛИЯ",
+    "МЕТЕРИАЛ",
+    "РАЗМЕР",
+    "ЧЕРТЕЖ",
+    "ПОЗИЦИЯ",
+    "КОМПЛЕКТАЦИЯ",
+]
+
+LEAD_TIMES = ["30 days", "4-6 weeks", "45", "6 недель / 6 weeks", None]
+
+SEARCH_QUERIES = ["A-20611", "масляный фильтр", "piston ring", "ПРОКЛАДКА"]
+
+# Mirrors the query behind GET /api/products/search
+SEARCH_SQL = """
+select id, part_number, name,
+       greatest(similarity(part_number, %(q)s), word_similarity(%(q)s, name)) as score
+from bench_products
+where part_number ilike %(prefix)s
+   or part_number %% %(q)s
+   or %(q)s <%% name
+order by part_number ilike %(prefix)s desc, score desc, id desc
+limit %(limit)s
+"""
+
+
+# (label, query, index the plan must use) for `benchmark.py indexes`
+INDEX_CHECKS = [
+    (
+        "prices by supplier",
+        "select * from supplier_product_prices where supplier_id = %(supplier_id)s",
+        "ix_supplier_product_prices_supplier_id",
+    ),
+    (
+        "items of a request",
+        "select count(*) from request_items where request_id = %(request_id)s",
+        "ix_request_items_request_id",
+    ),
+    (
+        "items of a product",
+        "select * from request_items where product_id = %(product_id)s",
+        "ix_request_items_product_id",
+    ),
+    (
+        "latest requests page",
+        "select * from requests order by datetime_coming desc, id desc limit 100",
+        "ix_requests_datetime_coming_id",
+    ),
+    (
+        "product identity",
+        """
+        select id from products
+        where part_number = %(part_number)s and name = %(name)s
+          and coalesce(brand, '') = coalesce(%(brand)s, '')
+        """,
+        "uq_products_identity",
+    ),
+    (
+        "exact part numbers",
+        "select id, name from products where part_number = any(%(part_numbers)s)",
+        "ix_products_part_number",
+    ),
+    (
+        "normalized part number",
+        "select id from products where regexp_replace(upper(part_number), '[^[:alnum:]]', '', 'g') = %(normalized)s",
+        "ix_products_part_number_normalized",
+    ),
+    (
+        "supplier by name",
+        "select id from suppliers where name = %(supplier_name)s",
+        "ix_suppliers_name",
+    ),
+    (
+        "prices by price desc",
+        "select id from supplier_product_prices order by total_price desc, id desc limit 100",
+        "ix_supplier_product_prices_total_price_id",
+    ),
+    (
+        "prices by lead time",
+        """
+        select id from supplier_product_prices
+        order by CAST(EXTRACT(epoch FROM lead_time) AS FLOAT) / 86400, id limit 100
+        """,
+        "ix_supplier_product_prices_lead_time_days_id",
+    ),
+]
+
+# Only checked when pg_trgm is installed; migration 0002 skips these indexes otherwise
+TRIGRAM_INDEX_CHECKS = [
+    (
+        "similar part numbers",
+        "select id from products where part_number %% %(part_number)s",
+        "ix_products_part_number_trgm",
+    ),
+    (
+        "similar names",
+        "select id from products where %(name)s <%% name",
+        "ix_products_name_trgm",
+    ),
+]
+
+# Fills the real tables inside the benchmark transaction (rolled back afterwards)
+INDEX_FIXTURE_SQL = [
+    """
+    insert into suppliers (name)
+    select 'Bench supplier ' || g from generate_series(1, %(suppliers)s) as g
+    """,
+    """
+    insert into products (part_number, name, brand)
+    select 'BENCH-' || g, 'Bench product ' || g %% 500, 'Brand ' || g %% 50
+    from generate_series(1, %(rows)s) as g
+    """,
+    """
+    with p as (
+      select id, row_number() over (order by id) as rn from products where part_number like 'BENCH-%%'
+    ), s as (
+      select id, row_number() over (order by id) - 1 as rn from suppliers where name like 'Bench supplier %%'
+    )
+    insert into supplier_product_prices (product_id, supplier_id, total_price)
+    select p.id, s.id, (p.rn * 7 + k) %% 1000
+    from p
+    cross join generate_series(0, 4) as k
+    join s on s.rn = (p.rn + k) %% %(suppliers)s
+    """,
+    """
+    insert into requests (id_request, datetime_coming)
+    select -g, now() - g * interval '1 minute' from generate_series(1, %(rows)s / 2) as g
+    """,
+    """
+    with p as (
+      select id, row_number() over (order by id) as rn from products where part_number like 'BENCH-%%'
+    )
+    insert into request_items (name, quantity, request_id, product_id)
+    select 'Bench item', 1, r.id, p.id
+    from requests r
+    cross join generate_series(0, 3) as k
+    join p on p.rn = (-r.id_request * 4 + k) %% %(rows)s + 1
+    where r.id_request < 0
+    """,
+    "analyze suppliers, products, supplier_product_prices, requests, request_items",
+]
+
+
+def connect(args: argparse.Namespace):
+    load_environment(args.env)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL is not defined in environment variables.", file=sys.stderr)
+        sys.exit(1)
+    prepared_url = prepare_connection_url(database_url, args.host, args.port)
+    print(f"Using DATABASE_URL: {mask_connection_url(prepared_url)}")
+    return psycopg2.connect(prepared_url)
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of ``func`` in milliseconds."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def plan_summary(cur, sql: str, params: dict) -> str:
+    cur.execute("explain " + sql, params)
+    nodes = [row[0].strip().lstrip("-> ").split("  ")[0] for row in cur.fetchall()]
+    scans = [node for node in nodes if "Scan" in node]
+    return ", ".join(scans) or nodes[0]
+
+
+def synthetic_sheet_rows(rows: int, supplier_groups: int = 25, fill_rate: float = 0.3) -> Iterator[List[object]]:
+    """Yield the title, supplier and header rows, then ``rows`` ИТОГ-style product rows."""
+    rng = random.Random(42)
+    supplier_names = [f"Supplier {group + 1}" for group in range(supplier_groups)]
+    supplier_row: List[object] = [None] * SUPPLIER_GROUP_START
+    header_row: List[object] = list(SHEET_HEADER)
+    for name in supplier_names:
+        supplier_row += [name, None, None]
+        header_row += ["ПОСТАВЩИК", "ЦЕНА", "СРОКИ"]
+
+    yield ["ОРИГИНАЛ"]
+    yield supplier_row
+    yield header_row
+    for index in range(rows):
+        row: List[object] = [
+            index + 1,
+            None,
+            "Ariel",
+            f"A-{index:07d}",
+            SEARCH_NAMES[index % len(SEARCH_NAMES)],
+        ]
+        row += [None] * (SUPPLIER_GROUP_START - len(row))
+        for name in supplier_names:
+            if rng.random() >= fill_rate:
+                row += [None, None, None]
+                continue
+            price: object = round(rng.uniform(5, 5000), 2)
+            if rng.random() < 0.3:
+                # Text prices as typed by hand: "1 234,50"
+                price = f"{price:,.2f}".replace(",", " ").replace(".", ",")
+            row += [name, price, rng.choice(LEAD_TIMES)]
+        yield row
+
+
+def write_synthetic_workbook(path: Path, rows: int) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in synthetic_sheet_rows(rows):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def synthetic_workbook(args: argparse.Namespace) -> Path:
+    if args.excel:
+        return args.excel
+    path = Path(tempfile.gettempdir()) / f"handbook-bench-{args.rows}.xlsx"
+    if not path.is_file():
+        print(f"Writing synthetic workbook with {args.rows} rows to {path}...")
+        write_synthetic_workbook(path, args.rows)
+    return path
+
+
+def _read_workbook(path: Path, reader: str) -> Tuple[int, float, float]:
+    started = time.perf_counter()
+    supplier_row, header_row, rows = open_excel(path, reader)
+    suppliers = extract_suppliers(supplier_row, header_row)
+    parsed = sum(1 for _ in parse_rows(rows, suppliers))
+    elapsed = time.perf_counter() - started
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return parsed, elapsed, peak_mib
+
+
+def bench_reader(args: argparse.Namespace) -> None:
+    path = synthetic_workbook(args)
+    print(f"{'reader':<8} {'rows':>10} {'seconds':>10} {'peak RSS MiB':>14}")
+    context = multiprocessing.get_context("spawn")
+    for reader in ("pandas", "stream"):
+        # A fresh process per reader keeps peak RSS comparable
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            parsed, elapsed, peak_mib = pool.submit(_read_workbook, path, reader).result()
+        print(f"{reader:<8} {parsed:>10} {elapsed:>10.2f} {peak_mib:>14.1f}")
+
+
+def bench_search(args: argparse.Namespace) -> None:
+    conn = connect(args)
+    cur = conn.cursor()
+    try:
+        cur.execute("create extension if not exists pg_trgm")
+    except psycopg2.Error as exc:
+        print(f"pg_trgm is not available: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Generating {args.rows} synthetic products...")
+    cur.execute(
+        """
+        create temp table bench_products (
+          id serial primary key,
+          part_number varchar(100) not null,
+          name varchar(100) not null
+        )
+        """
+    )
+    cur.execute(
+        """
+        insert into bench_products (part_number, name)
+        select chr(65 + g %% 26) || '-' || lpad((g::bigint * 7919 %% 1000000)::text, 6, '0'),
+               (%(names)s::text[])[1 + g %% %(name_count)s] || ' ' || g
+        from generate_series(1, %(rows)s) as g
+        """,
+        {"names": SEARCH_NAMES, "name_count": len(SEARCH_NAMES), "rows": args.rows},
+    )
+    cur.execute("create index on bench_products using gin (part_number gin_trgm_ops)")
+    cur.execute("create index on bench_products using gin (name gin_trgm_ops)")
+    cur.execute("analyze bench_products")
+
+    print(f"{'query':<24} {'indexed ms':>12} {'seq scan ms':>12}  plan")
+    for query in args.query or SEARCH_QUERIES:
+        params = {"q": query, "prefix": f"{query}%", "limit": args.limit}
+
+        def run() -> None:
+            cur.execute(SEARCH_SQL, params)
+            cur.fetchall()
+
+        indexed_plan = plan_summary(cur, SEARCH_SQL, params)
+        indexed_ms = measure(run, args.repeat)
+
+        cur.execute("set local enable_bitmapscan = off")
+        cur.execute("set local enable_indexscan = off")
+        seq_ms = measure(run, args.repeat)
+        cur.execute("reset enable_bitmapscan")
+        cur.execute("reset enable_indexscan")
+
+        print(f"{query:<24} {indexed_ms:>12.1f} {seq_ms:>12.1f}  {indexed_plan}")
+
+    conn.rollback()
+    conn.close()
+
+
+def migration_indexes() -> List[str]:
+    """Index names listed in migration 0002's ``INDEXES``; each needs an ``INDEX_CHECKS`` entry."""
+    path = BACKEND_DIRECTORY / "migrations" / "versions" / "0002_secondary_indexes.py"
+    spec = importlib.util.spec_from_file_location("migration_0002", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return [name for name, _, _ in module.INDEXES]
+
+
+def bench_indexes(args: argparse.Namespace) -> None:
+    checked = {index for _, _, index in INDEX_CHECKS}
+    unchecked = [name for name in migration_indexes() if name not in checked]
+    if unchecked:
+        print(f"No EXPLAIN check for {', '.join(unchecked)}; add them to INDEX_CHECKS.", file=sys.stderr)
+        sys.exit(1)
+
+    conn = connect(args)
+    cur = conn.cursor()
+    print(f"Loading {args.rows} products, {args.rows * 5} prices and {args.rows * 2} request items...")
+    params = {"rows": args.rows, "suppliers": args.suppliers}
+    for statement in INDEX_FIXTURE_SQL:
+        cur.execute(statement, params)
+
+    cur.execute(
+        """
+        select p.id, p.part_number, p.name, p.brand, s.id, s.name, r.id
+        from products p, suppliers s, requests r
+        where p.part_number = 'BENCH-12345' and s.name = 'Bench supplier 7' and r.id_request = -42
+        """
+    )
+    product_id, part_number, name, brand, supplier_id, supplier_name, request_id = cur.fetchone()
+    params = {
+        "product_id": product_id,
+        "part_number": part_number,
+        "name": name,
+        "brand": brand,
+        "normalized": "BENCH12345",
+        "supplier_id": supplier_id,
+        "supplier_name": supplier_name,
+        "request_id": request_id,
+        "part_numbers": [part_number, "BENCH-777", "BENCH-4242"],
+    }
+
+    checks = list(INDEX_CHECKS)
+    cur.execute("select exists (select 1 from pg_extension where extname = 'pg_trgm')")
+    if cur.fetchone()[0]:
+        checks += TRIGRAM_INDEX_CHECKS
+    else:
+        print("pg_trgm is not installed: trigram indexes are not checked.")
+
+    failures = 0
+    print(f"{'query':<24} {'ms':>8}  {'index':<46} plan")
+    for label, sql, index in checks:
+        cur.execute("explain " + sql, params)
+        plan = "\n".join(row[0] for row in cur.fetchall())
+        uses_index = index in plan
+        failures += not uses_index
+
+        def run() -> None:
+            cur.execute(sql, params)
+            cur.fetchall()
+
+        elapsed_ms = measure(run, args.repeat)
+        status = index if uses_index else f"MISSING {index}"
+        print(f"{label:<24} {elapsed_ms:>8.2f}  {status:<46} {plan_summary(cur, sql, params)}")
+
+    conn.rollback()
+    conn.close()
+    if failures:
+        print(f"{failures} queries do not use their index; run `flask --app main setup` first.", file=sys.stderr)
+        sys.exit(1)
+
+
+BACKEND_DIRECTORY = Path(__file__).resolve().parents[1] / "backend_flask"
+
+# Runs in a fresh interpreter, like a gunicorn worker booting the app
+STARTUP_PROBE = """
+import time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+print((imported - started) * 1000, (time.perf_counter() - imported) * 1000)
+"""
+
+
+def bench_startup(args: argparse.Namespace) -> None:
+    load_environment(args.env)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL is not defined in environment variables.", file=sys.stderr)
+        sys.exit(1)
+    prepared_url = prepare_connection_url(database_url, args.host, args.port)
+    # The app goes through SQLAlchemy, which needs the driver spelled out again
+    env = dict(os.environ, DATABASE_URL=prepared_url.replace("postgresql://", "postgresql+psycopg2://", 1))
+    print(f"Using DATABASE_URL: {mask_connection_url(env['DATABASE_URL'])}")
+
+    import_timings: List[float] = []
+    boot_timings: List[float] = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            cwd=BACKEND_DIRECTORY,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        import_ms, boot_ms = map(float, output.split()[-2:])
+        import_timings.append(import_ms)
+        boot_timings.append(boot_ms)
+
+    print(f"import app     {statistics.median(import_timings):9.1f} ms")
+    print(f"create_app()   {statistics.median(boot_timings):9.1f} ms  (median of {args.repeat})")
+
+
+def bench_serialize(args: argparse.Namespace) -> None:
+    load_environment(args.env)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL is not defined in environment variables.", file=sys.stderr)
+        sys.exit(1)
+    prepared_url = prepare_connection_url(database_url, args.host, args.port)
+    os.environ["DATABASE_URL"] = prepared_url.replace("postgresql://", "postgresql+psycopg2://", 1)
+    print(f"Using DATABASE_URL: {mask_connection_url(os.environ['DATABASE_URL'])}")
+
+    # Runs the app's own serializers in-process, without HTTP in the way
+    sys.path.insert(0, str(BACKEND_DIRECTORY))
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy import func, select
+
+    from app import create_app
+    from app.database import db
+    from app.models import Product, SupplierProductPrice
+    from app.reference import reference_codes
+    from app.routes.products import PRODUCT_SELECT, serialize_product, serialize_product_row
+    from app.routes.supplier_prices import PRICE_COLUMNS, PRICE_KEYS, serialize_price
+
+    app = create_app()
+    with app.app_context():
+        connection = db.session.connection()
+        products = db.session.scalar(select(func.count()).select_from(Product))
+        if products < args.rows:
+            # Fixture rows live in the benchmark transaction and are rolled back at the end
+            print(f"Loading {args.rows} synthetic products and {args.rows * 5} prices...")
+            params = {"rows": args.rows, "suppliers": 200}
+            for statement in INDEX_FIXTURE_SQL[:3]:
+                connection.exec_driver_sql(statement, params)
+
+        stdlib_json = DefaultJSONProvider(app)
+        categories = reference_codes("product_categories")
+        price_select = select(*(column for _, column in PRICE_COLUMNS)).order_by(SupplierProductPrice.id).limit(args.rows)
+        product_select = select(*PRODUCT_SELECT).order_by(Product.id).limit(args.rows)
+
+        def orm_prices() -> bytes:
+            prices = db.session.query(SupplierProductPrice).order_by(SupplierProductPrice.id).limit(args.rows).all()
+            body = stdlib_json.dumps([serialize_price(price) for price in prices]).encode()
+            db.session.expunge_all()
+            return body
+
+        def row_prices() -> bytes:
+            rows = db.session.execute(price_select).all()
+            return app.json.dumps_bytes([dict(zip(PRICE_KEYS, row)) for row in rows])
+
+        def orm_products() -> bytes:
+            items = db.session.query(Product).order_by(Product.id).limit(args.rows).all()
+            body = stdlib_json.dumps([serialize_product(product) for product in items]).encode()
+            db.session.expunge_all()
+            return body
+
+        def row_products() -> bytes:
+            rows = db.session.execute(product_select).all()
+            return app.json.dumps_bytes([serialize_product_row(row, categories) for row in rows])
+
+        print(f"{'response':<10} {'path':<24} {'ms':>9} {'rows/s':>10} {'MB':>7} {'speed-up':>9}")
+        cases = (
+            ("prices", price_select, orm_prices, row_prices),
+            ("products", product_select, orm_products, row_products),
+        )
+        for label, statement, old, new in cases:
+            rows = db.session.scalar(select(func.count()).select_from(statement.subquery()))
+            baseline = None
+            for path, serializer in (("ORM + json", old), ("Row + orjson", new)):
+                size = len(serializer())
+                elapsed_ms = measure(serializer, args.repeat)
+                speedup = "" if baseline is None else f"{baseline / elapsed_ms:>8.1f}x"
+                baseline = baseline or elapsed_ms
+                print(
+                    f"{label:<10} {path:<24} {elapsed_ms:>9.1f} {rows / elapsed_ms * 1000:>10.0f} "
+                    f"{size / 1e6:>7.1f} {speedup:>9}"
+                )
+
+        db.session.rollback()
+
+
+def _http_client(port: int, path: str, deadline: float, latencies: List[float]) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"GET {path} answered {response.status}")
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+
+
+def _wait_for_server(port: int, server: subprocess.Popen) -> None:
+    for _ in range(100):
+        if server.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become healthy")
+
+
+def bench_http(args: argparse.Namespace) -> None:
+    load_environment(args.env)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("DATABASE_URL is not defined in environment variables.", file=sys.stderr)
+        sys.exit(1)
+    prepared_url = prepare_connection_url(database_url, args.host, args.port)
+    print(f"Using DATABASE_URL: {mask_connection_url(prepared_url)}")
+    print(
+        f"{args.clients} clients on {args.path} for {args.duration}s, "
+        f"{args.slow_clients} more streaming {args.slow_path}"
+    )
+    print(f"{'mode':<8} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'slow done':>10}")
+
+    for mode in args.modes:
+        env = dict(
+            os.environ,
+            DATABASE_URL=prepared_url.replace("postgresql://", "postgresql+psycopg2://", 1),
+            GUNICORN_MODE=mode,
+            PORT_BACKEND=str(args.http_port),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+            cwd=BACKEND_DIRECTORY,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_for_server(args.http_port, server)
+            deadline = time.perf_counter() + args.duration
+            latencies: List[float] = []
+            slow_latencies: List[float] = []
+            clients = [
+                threading.Thread(target=_http_client, args=(args.http_port, args.path, deadline, latencies))
+                for _ in range(args.clients)
+            ] + [
+                threading.Thread(target=_http_client, args=(args.http_port, args.slow_path, deadline, slow_latencies))
+                for _ in range(args.slow_clients)
+            ]
+            started = time.perf_counter()
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait()
+
+        if not latencies:
+            print(f"{mode:<8} {'no fast request completed':>40}")
+            continue
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"{mode:<8} {len(latencies) / elapsed:>8.1f} {p50:>9.1f} {p99:>9.1f} {len(slow_latencies):>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the Handbook service.")
+    parser.add_argument(
+        "--env",
+        type=Path,
+        help="Optional path to .env file containing DATABASE_URL (defaults to backend/.env or backend_flask/.env).",
+    )
+    parser.add_argument("--host", type=str, help="Override the database host.")
+    parser.add_argument("--port", type=int, help="Override the database port.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (median is reported).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search = subparsers.add_parser("search", help="Trigram product search vs. sequential scan.")
+    search.add_argument("--rows", type=int, default=1_000_000, help="Synthetic catalog size.")
+    search.add_argument("--limit", type=int, default=20, help="Results per query.")
+    search.add_argument(
+        "--query",
+        action="append",
+        help="Search string to benchmark (repeatable).",
+    )
+    search.set_defaults(handler=bench_search)
+
+    reader = subparsers.add_parser("reader", help="Streaming openpyxl reader vs. pandas DataFrame.")
+    reader.add_argument("--excel", type=Path, help="Workbook to read (defaults to a synthetic one).")
+    reader.add_argument("--rows", type=int, default=100_000, help="Rows in the synthetic workbook.")
+    reader.set_defaults(handler=bench_reader)
+
+    indexes = subparsers.add_parser("indexes", help="EXPLAIN checks that hot queries use their indexes.")
+    indexes.add_argument("--rows", type=int, default=100_000, help="Synthetic products (5 prices, 2 request items each).")
+    indexes.add_argument("--suppliers", type=int, default=2000, help="Synthetic suppliers.")
+    indexes.set_defaults(handler=bench_indexes)
+
+    startup = subparsers.add_parser("startup", help="Time create_app() in a fresh interpreter, as a worker boots.")
+    startup.set_defaults(handler=bench_startup)
+
+    serialize = subparsers.add_parser("serialize", help="ORM objects + stdlib json vs. Row tuples + orjson.")
+    serialize.add_argument("--rows", type=int, default=100_000, help="Rows per response (synthetic ones are added if needed).")
+    serialize.set_defaults(handler=bench_serialize)
+
+    http_parser = subparsers.add_parser("http", help="Load test gunicorn in sync, threads and gevent mode.")
+    http_parser.add_argument("--modes", nargs="+", default=["sync", "threads", "gevent"], help="GUNICORN_MODE values.")
+    http_parser.add_argument("--clients", type=int, default=16, help="Concurrent clients on --path.")
+    http_parser.add_argument("--path", default="/api/products?limit=50", help="Request measured for req/s and latency.")
+    http_parser.add_argument("--slow-clients", type=int, default=2, help="Clients streaming --slow-path meanwhile.")
+    http_parser.add_argument("--slow-path", default="/api/export/products.csv", help="Long request competing for workers.")
+    http_parser.add_argument("--duration", type=float, default=20, help="Seconds per mode.")
+    http_parser.add_argument("--http-port", type=int, default=8765, help="Port gunicorn listens on.")
+    http_parser.set_defaults(handler=bench_http)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,23 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import io
+import itertools
 import os
 import re
 import sys
-from dataclasses import dataclass
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import pandas as pd
 import psycopg2
+from alembic.script import ScriptDirectory
+from openpyxl import load_workbook
 from psycopg2.extensions import connection as PgConnection
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
@@ -34,6 +41,40 @@ COL_INDEXES = {
 SUPPLIER_GROUP_START = 12
 SUPPLIER_GROUP_WIDTH = 3  # supplier name, price, lead time
 
+EXCEL_SUFFIXES = {".xlsx", ".xlsm"}
+
+# The backend's Alembic migrations; the database must be at their head before an import
+MIGRATIONS_DIRECTORY = Path(__file__).resolve().parent.parent / "backend_flask" / "migrations"
+
+# Rows parsed and staged at a time in copy mode; bounds the importer's memory whatever the sheet size
+PARSE_CHUNK_ROWS = 20_000
+
+# Strings pandas.read_excel treats as missing by default; the streaming reader honours them too
+NA_STRINGS = frozenset(
+    {
+        "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+        "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    }
+)
+
+ProductKey = Tuple[str, str, Optional[str]]
+Offer = Tuple[str, Optional[float], Optional[str]]  # supplier name, price, lead time
+PriceMap = Dict[Tuple[ProductKey, str], Tuple[Optional[float], Optional[str]]]
+
+PRODUCT_COLUMNS = (
+    "part_number",
+    "name",
+    "brand",
+    "model",
+    "serial_number",
+    "scheme",
+    "pos_scheme",
+    "material",
+    "size",
+    "comment",
+    "category",
+)
+
 
 @dataclass(slots=True)
 class SupplierColumn:
@@ -42,6 +83,28 @@ class SupplierColumn:
     lead_idx: int
 
 
+@dataclass(slots=True)
+class ImportSummary:
+    products_inserted: int = 0
+    prices_inserted: int = 0
+    prices_updated: int = 0
+    prices_unchanged: int = 0
+
+    @property
+    def prices_written(self) -> int:
+        return self.prices_inserted + self.prices_updated
+
+
+@dataclass(slots=True)
+class ParsedBatch:
+    """Products and merged supplier offers parsed from a chunk of workbook rows."""
+
+    source: str
+    rows: int = 0
+    products: Dict[ProductKey, Dict[str, Optional[str]]] = field(default_factory=dict)
+    price_map: PriceMap = field(default_factory=dict)
+
+
 def load_environment(explicit_env: Optional[Path]) -> None:
     """Load environment variables from .env files."""
     candidates: List[Path] = []
@@ -122,7 +185,10 @@ def mask_connection_url(url: str) -> str:
     return urlunparse((scheme, netloc, path, "", query, ""))
 
 
-def read_excel(path: Path) -> Tuple[pd.Series, pd.Series, pd.DataFrame]:
+Row = Sequence[object]
+
+
+def read_excel(path: Path) -> Tuple[List[object], List[object], pd.DataFrame]:
     """Return supplier row, header row, and data frame with product rows."""
     df = pd.read_excel(path, header=None)
     if df.shape[0] < 4:
@@ -134,20 +200,56 @@ def read_excel(path: Path) -> Tuple[pd.Series, pd.Series, pd.DataFrame]:
     data.columns = header_row
     data.reset_index(drop=True, inplace=True)
     data = data.dropna(how="all")
-    return supplier_row, header_row, data
+    return supplier_row.tolist(), header_row.tolist(), data
+
+
+def dataframe_rows(data: pd.DataFrame) -> Iterator[List[object]]:
+    for _, row in data.iterrows():
+        yield row.tolist()
+
+
+def stream_excel(path: Path) -> Tuple[List[object], List[object], Iterator[Row]]:
+    """Return supplier row, header row, and a lazy iterator over product rows.
+
+    The first worksheet is read with openpyxl in read-only mode, so memory use does not
+    grow with the number of rows. The workbook is closed once the iterator is exhausted.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    rows = workbook.worksheets[0].iter_rows(values_only=True)
+    header_rows = list(itertools.islice(rows, 3))
+    if len(header_rows) < 3:
+        workbook.close()
+        raise ValueError("Excel sheet does not contain the expected header rows.")
+
+    def data_rows() -> Iterator[Row]:
+        try:
+            for row in rows:
+                if any(value is not None for value in row):
+                    yield row
+        finally:
+            workbook.close()
+
+    return list(header_rows[1]), list(header_rows[2]), data_rows()
+
 
+def open_excel(path: Path, reader: str) -> Tuple[List[object], List[object], Iterable[Row]]:
+    if reader == "pandas":
+        supplier_row, header_row, data = read_excel(path)
+        return supplier_row, header_row, dataframe_rows(data)
+    return stream_excel(path)
 
-def extract_suppliers(supplier_row: pd.Series, header_row: pd.Series) -> List[SupplierColumn]:
+
+def extract_suppliers(supplier_row: Row, header_row: Row) -> List[SupplierColumn]:
     suppliers: List[SupplierColumn] = []
     for idx in range(SUPPLIER_GROUP_START, len(header_row), SUPPLIER_GROUP_WIDTH):
-        header_value = header_row.iloc[idx]
-        supplier_name = supplier_row.iloc[idx]
+        header_value = header_row[idx]
+        supplier_name = supplier_row[idx] if idx < len(supplier_row) else None
         if not isinstance(header_value, str):
             continue
         if not header_value.startswith("П") and not header_value.startswith("P"):
             # Expect "ПОСТАВЩИК" or similar; skip unrelated columns
             continue
-        if isinstance(supplier_name, float) or pd.isna(supplier_name):
+        if supplier_name is None or isinstance(supplier_name, float) or pd.isna(supplier_name):
             continue
         supplier_name = str(supplier_name).strip()
         if not supplier_name:
@@ -164,11 +266,15 @@ def value_or_none(row: Iterable, index: int) -> Optional[str]:
         value = row[index]
     except IndexError:
         return None
-    if pd.isna(value):
+    if value is None:
         return None
     if isinstance(value, str):
         text = value.strip()
+        if text in NA_STRINGS:
+            return None
         return text or None
+    if pd.isna(value):
+        return None
     return str(value)
 
 
@@ -244,7 +350,7 @@ def get_product_id(cur, cache: Dict[Tuple[str, str, Optional[str]], int], produc
     cur.execute(
         """
         select id from products
-        where part_number::text = %s
+        where part_number = %s
           and name = %s
           and coalesce(brand, '') = coalesce(%s, '')
         """,
@@ -313,7 +419,7 @@ def serial_as_int(raw: Optional[str]) -> Optional[int]:
         return None
 
 
-def build_product(row: List[object]) -> Dict[str, Optional[str]]:
+def build_product(row: Row) -> Dict[str, Optional[str]]:
     product = {
         "direction": value_or_none(row, COL_INDEXES["direction"]),
         "brand": value_or_none(row, COL_INDEXES["brand"]),
@@ -334,34 +440,82 @@ def build_product(row: List[object]) -> Dict[str, Optional[str]]:
     return product
 
 
-def ensure_schema(conn: PgConnection) -> None:
-    statements = [
-        """
-        alter table if exists products
-        alter column part_number type varchar(100)
-        using part_number::text,
-        alter column pos_scheme type varchar(100)
-        using pos_scheme::text
-        """,
-        """
-        alter table if exists request_items
-        alter column part_number type varchar(100)
-        using part_number::text,
-        alter column pos_scheme type varchar(100)
-        using pos_scheme::text
-        """
-    ]
+def prepare_product(row: Row) -> Optional[Dict[str, Optional[str]]]:
+    product = build_product(row)
+
+    if not product["name"]:
+        return None
+    if not product["part_number"]:
+        # Skip rows without part number to keep DB constraints consistent
+        return None
+    product["serial_number"] = serial_as_int(product["serial_number"])
+    return product
+
+
+def parse_rows(
+    rows: Iterable[Row], suppliers: List[SupplierColumn]
+) -> Iterator[Tuple[Dict[str, Optional[str]], List[Offer]]]:
+    """Yield importable products with the supplier offers found on their row."""
+    for row_values in rows:
+        product = prepare_product(row_values)
+        if product is None:
+            continue
+
+        offers: List[Offer] = []
+        for supplier in suppliers:
+            price = parse_price(row_values[supplier.price_idx]) if supplier.price_idx < len(row_values) else None
+            lead_time = parse_lead_time(row_values[supplier.lead_idx]) if supplier.lead_idx < len(row_values) else None
+            if price is None and lead_time is None:
+                continue
+            offers.append((supplier.name, price, lead_time))
+
+        yield product, offers
+
+
+def product_key(product: Dict[str, Optional[str]]) -> ProductKey:
+    return (product["part_number"], product["name"], product["brand"])
+
+
+def merge_offer(price_map: Dict, key: Tuple, price: Optional[float], lead_time: Optional[str]) -> None:
+    """Keep the latest non-empty price and lead time seen for ``key``."""
+    current_price, current_lead = price_map.get(key, (None, None))
+    new_price = price if price is not None else current_price
+    new_lead = lead_time if lead_time is not None else current_lead
+    price_map[key] = (new_price, new_lead)
+
+
+def schema_revisions(conn: PgConnection) -> Tuple[Set[str], Set[str]]:
+    """The database's Alembic stamp and the backend's migration heads.
+
+    The importer never changes the schema; ``flask --app main setup`` migrates it.
+    """
+    expected = set(ScriptDirectory(str(MIGRATIONS_DIRECTORY)).get_heads())
     cur = conn.cursor()
-    for stmt in statements:
-        try:
-            cur.execute(stmt)
-            conn.commit()
-        except psycopg2.Error:
-            conn.rollback()
+    try:
+        cur.execute("select version_num from alembic_version")
+        stamped = {row[0] for row in cur.fetchall()}
+    except psycopg2.errors.UndefinedTable:
+        # No alembic_version table: the database was never migrated
+        stamped = set()
+    conn.rollback()
     cur.close()
+    return stamped, expected
+
+
+def refresh_best_prices(cur, product_ids: List[int]) -> None:
+    """Recompute ``product_best_prices`` for the products whose offers were written.
+
+    Same SQL function the API calls after its price writes (migration 0006); databases that
+    have not been migrated that far are skipped.
+    """
+    if not product_ids:
+        return
+    cur.execute("select to_regprocedure('refresh_product_best_prices(integer[])') is not null")
+    if cur.fetchone()[0]:
+        cur.execute("select refresh_product_best_prices(%s)", (product_ids,))
 
 
-def import_data(conn: PgConnection, data: pd.DataFrame, suppliers: List[SupplierColumn]) -> Tuple[int, int]:
+def import_data(conn: PgConnection, rows: Iterable[Row], suppliers: List[SupplierColumn]) -> Tuple[int, int]:
     cur = conn.cursor()
     supplier_cache: Dict[str, int] = {}
     product_cache: Dict[Tuple[str, str, Optional[str]], int] = {}
@@ -369,35 +523,15 @@ def import_data(conn: PgConnection, data: pd.DataFrame, suppliers: List[Supplier
     price_map: Dict[Tuple[int, int], Tuple[Optional[float], Optional[str]]] = {}
     products_processed = 0
 
-    for idx, row in data.iterrows():
-        row_values = row.tolist()
-        product = build_product(row_values)
-
-        if not product["name"]:
-            continue
-        part_number = product["part_number"]
-        if not part_number:
-            # Skip rows without part number to keep DB constraints consistent
-            continue
-        product["serial_number"] = serial_as_int(product["serial_number"])
-
+    for product, offers in parse_rows(rows, suppliers):
         product_id = get_product_id(cur, product_cache, product)
         if product_id is None:
             continue
         products_processed += 1
 
-        for supplier in suppliers:
-            price = parse_price(row_values[supplier.price_idx]) if supplier.price_idx < len(row_values) else None
-            lead_time = parse_lead_time(row_values[supplier.lead_idx]) if supplier.lead_idx < len(row_values) else None
-            if price is None and lead_time is None:
-                continue
-
-            supplier_id = get_supplier_id(cur, supplier_cache, supplier.name)
-            key = (product_id, supplier_id)
-            current_price, current_lead = price_map.get(key, (None, None))
-            new_price = price if price is not None else current_price
-            new_lead = lead_time if lead_time is not None else current_lead
-            price_map[key] = (new_price, new_lead)
+        for supplier_name, price, lead_time in offers:
+            supplier_id = get_supplier_id(cur, supplier_cache, supplier_name)
+            merge_offer(price_map, (product_id, supplier_id), price, lead_time)
 
     price_rows = [
         (product_id, supplier_id, values[0], values[1])
@@ -420,15 +554,378 @@ def import_data(conn: PgConnection, data: pd.DataFrame, suppliers: List[Supplier
             """,
             [(p_id, s_id, price, lead, None) for p_id, s_id, price, lead in price_rows],
         )
+        refresh_best_prices(cur, sorted({product_id for product_id, _, _, _ in price_rows}))
 
     conn.commit()
     cur.close()
     return products_processed, len(price_rows)
 
 
+def copy_text_value(value: object) -> str:
+    """Render a value in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_text_line(row: Sequence[object]) -> str:
+    return "\t".join(copy_text_value(value) for value in row) + "\n"
+
+
+class CopyStream(io.TextIOBase):
+    """File-like object that feeds ``copy ... from stdin`` lazily from row tuples."""
+
+    def __init__(self, rows: Iterable[Sequence[object]]) -> None:
+        self._lines = (copy_text_line(row) for row in rows)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size is None or size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = "".join(chunks)
+        if size is None or size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+# Staging tables filled chunk by chunk; write_staged() folds them into import_products/import_prices
+STAGED_PRODUCT_COLUMNS = ("source_no", "chunk_no", *PRODUCT_COLUMNS)
+STAGED_PRICE_COLUMNS = ("source_no", "chunk_no", "part_number", "name", "brand", "supplier_name", "total_price", "lead_time")
+
+
+def create_staging(cur) -> None:
+    """Create the temp tables parsed chunks are copied into; they live until the import commits."""
+    cur.execute(
+        """
+        create temp table import_product_rows (
+          source_no integer not null,
+          chunk_no integer not null,
+          part_number varchar(100) not null,
+          name varchar(100) not null,
+          brand varchar(100),
+          model varchar(100),
+          serial_number integer,
+          scheme varchar(50),
+          pos_scheme varchar(100),
+          material varchar(100),
+          size varchar(300),
+          comment varchar(300),
+          category varchar(50)
+        ) on commit drop
+        """
+    )
+    cur.execute(
+        """
+        create temp table import_price_rows (
+          source_no integer not null,
+          chunk_no integer not null,
+          part_number varchar(100) not null,
+          name varchar(100) not null,
+          brand varchar(100),
+          supplier_name varchar(100) not null,
+          total_price double precision,
+          lead_time interval
+        ) on commit drop
+        """
+    )
+
+
+def staged_product_rows(batch: ParsedBatch, source_no: int, chunk_no: int) -> Iterator[Tuple[object, ...]]:
+    for product in batch.products.values():
+        yield (source_no, chunk_no, *(product[column] for column in PRODUCT_COLUMNS))
+
+
+def staged_price_rows(batch: ParsedBatch, source_no: int, chunk_no: int) -> Iterator[Tuple[object, ...]]:
+    for (key, supplier_name), (price, lead_time) in batch.price_map.items():
+        yield (source_no, chunk_no, *key, supplier_name, price, lead_time)
+
+
+def copy_staged(cur, product_lines: io.TextIOBase, price_lines: io.TextIOBase) -> None:
+    cur.copy_expert(f"copy import_product_rows ({', '.join(STAGED_PRODUCT_COLUMNS)}) from stdin", product_lines)
+    cur.copy_expert(f"copy import_price_rows ({', '.join(STAGED_PRICE_COLUMNS)}) from stdin", price_lines)
+
+
+def stage_batch(cur, batch: ParsedBatch, source_no: int, chunk_no: int) -> None:
+    copy_staged(
+        cur,
+        CopyStream(staged_product_rows(batch, source_no, chunk_no)),
+        CopyStream(staged_price_rows(batch, source_no, chunk_no)),
+    )
+
+
+def write_staged(conn: PgConnection, full: bool = False) -> ImportSummary:
+    """Merge the staged chunks with set-based statements and commit.
+
+    Chunks are combined the way rows of one sheet are: the first occurrence of a product wins,
+    and each offer keeps the latest non-empty price and lead time in (workbook, chunk) order.
+    Offers that would not change the stored price, lead time or currency are left untouched
+    unless ``full`` is set. The comparison is made against ``supplier_product_prices`` itself,
+    so a price edited through the API since the last import is restored from the sheet.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        create temp table import_products on commit drop as
+        select distinct on (part_number, name, brand) {', '.join(PRODUCT_COLUMNS)}
+        from import_product_rows
+        order by part_number, name, brand, source_no, chunk_no
+        """
+    )
+    cur.execute(
+        """
+        create temp table import_prices on commit drop as
+        select part_number, name, brand, supplier_name,
+               (array_agg(total_price order by source_no desc, chunk_no desc)
+                  filter (where total_price is not null))[1] as total_price,
+               (array_agg(lead_time order by source_no desc, chunk_no desc)
+                  filter (where lead_time is not null))[1] as lead_time
+        from import_price_rows
+        group by part_number, name, brand, supplier_name
+        """
+    )
+    cur.execute("analyze import_products")
+    cur.execute("analyze import_prices")
+
+    cur.execute(
+        """
+        insert into suppliers (name)
+        select distinct i.supplier_name
+        from import_prices i
+        where not exists (select 1 from suppliers s where s.name = i.supplier_name)
+        """
+    )
+    cur.execute(
+        f"""
+        insert into products ({', '.join(PRODUCT_COLUMNS)})
+        select {', '.join('i.' + column for column in PRODUCT_COLUMNS)}
+        from import_products i
+        where not exists (
+          select 1 from products p
+          where p.part_number = i.part_number
+            and p.name = i.name
+            and coalesce(p.brand, '') = coalesce(i.brand, '')
+        )
+        on conflict do nothing
+        """
+    )
+    summary = ImportSummary(products_inserted=cur.rowcount)
+
+    cur.execute(
+        """
+        create temp table import_resolved on commit drop as
+        with product_ids as (
+          select min(p.id) as id, p.part_number, p.name, coalesce(p.brand, '') as brand_key
+          from products p
+          join import_products i
+            on p.part_number = i.part_number
+           and p.name = i.name
+           and coalesce(p.brand, '') = coalesce(i.brand, '')
+          group by p.part_number, p.name, coalesce(p.brand, '')
+        ),
+        supplier_ids as (
+          select min(s.id) as id, s.name
+          from suppliers s
+          where s.name in (select supplier_name from import_prices)
+          group by s.name
+        ),
+        offers as (
+          select pi.id as product_id,
+                 si.id as supplier_id,
+                 i.total_price,
+                 i.lead_time,
+                 spp.id is not null as has_price,
+                 -- What the upsert below would leave in the row, compared with what is there
+                 (spp.total_price, spp.lead_time, spp.cy)
+                   is distinct from (i.total_price, coalesce(i.lead_time, spp.lead_time), null::varchar)
+                   as differs
+          from import_prices i
+          join product_ids pi
+            on pi.part_number = i.part_number
+           and pi.name = i.name
+           and pi.brand_key = coalesce(i.brand, '')
+          join supplier_ids si on si.name = i.supplier_name
+          left join supplier_product_prices spp
+            on spp.product_id = pi.id and spp.supplier_id = si.id
+        )
+        select *, %(full)s or not has_price or differs as changed
+        from offers
+        """,
+        {"full": full},
+    )
+    cur.execute(
+        """
+        insert into supplier_product_prices (
+          product_id, supplier_id, total_price, lead_time, cy
+        )
+        select product_id, supplier_id, total_price, lead_time, null
+        from import_resolved
+        where changed
+        on conflict (product_id, supplier_id)
+        do update set
+          total_price = excluded.total_price,
+          lead_time = coalesce(excluded.lead_time, supplier_product_prices.lead_time),
+          cy = excluded.cy
+        """
+    )
+    cur.execute(
+        """
+        select count(*) filter (where changed and not has_price),
+               count(*) filter (where changed and has_price),
+               count(*) filter (where not changed)
+        from import_resolved
+        """
+    )
+    summary.prices_inserted, summary.prices_updated, summary.prices_unchanged = cur.fetchone()
+
+    cur.execute("select coalesce(array_agg(distinct product_id), '{}') from import_resolved where changed")
+    refresh_best_prices(cur, cur.fetchone()[0])
+
+    conn.commit()
+    cur.close()
+    return summary
+
+
+def collect_parsed(rows: Iterable[Row], suppliers: List[SupplierColumn], source: str = "") -> ParsedBatch:
+    batch = ParsedBatch(source=source)
+    for product, offers in parse_rows(rows, suppliers):
+        key = product_key(product)
+        batch.products.setdefault(key, product)
+        batch.rows += 1
+        for supplier_name, price, lead_time in offers:
+            merge_offer(batch.price_map, (key, supplier_name), price, lead_time)
+    return batch
+
+
+def parse_chunks(
+    rows: Iterable[Row],
+    suppliers: List[SupplierColumn],
+    source: str = "",
+    chunk_rows: int = PARSE_CHUNK_ROWS,
+) -> Iterator[ParsedBatch]:
+    """Parse ``rows`` ``chunk_rows`` at a time; only offers repeated within a chunk are merged here."""
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, chunk_rows)):
+        yield collect_parsed(chunk, suppliers, source)
+
+
+def import_data_copy(conn: PgConnection, rows: Iterable[Row], suppliers: List[SupplierColumn]) -> Tuple[int, int]:
+    cur = conn.cursor()
+    create_staging(cur)
+    parsed_rows = 0
+    for chunk_no, batch in enumerate(parse_chunks(rows, suppliers)):
+        stage_batch(cur, batch, 0, chunk_no)
+        parsed_rows += batch.rows
+    return parsed_rows, write_staged(conn).prices_written
+
+
+def resolve_workbooks(pattern: str) -> List[Path]:
+    """Expand a workbook path, a directory of workbooks, or a glob pattern."""
+    path = Path(pattern)
+    if path.is_file():
+        return [path]
+    if path.is_dir():
+        candidates = list(path.iterdir())
+    else:
+        candidates = [Path(match) for match in glob.glob(pattern)]
+    return sorted(
+        candidate
+        for candidate in candidates
+        if candidate.is_file()
+        and candidate.suffix.lower() in EXCEL_SUFFIXES
+        and not candidate.name.startswith("~$")  # Excel lock files
+    )
+
+
+@dataclass(slots=True)
+class SpooledWorkbook:
+    """A workbook parsed by a worker process into COPY-ready staging files."""
+
+    source: str
+    rows: int
+    products_path: Path
+    prices_path: Path
+
+
+def parse_workbook(path: Path, reader: str) -> Iterator[ParsedBatch]:
+    supplier_row, header_row, rows = open_excel(path, reader)
+    suppliers = extract_suppliers(supplier_row, header_row)
+    if not suppliers:
+        raise ValueError(f"No suppliers found in the Excel header of '{path}'.")
+    return parse_chunks(rows, suppliers, str(path))
+
+
+def spool_workbook(source_no: int, path: Path, reader: str, directory: Path) -> SpooledWorkbook:
+    """Parse a workbook chunk by chunk into staging files, so a worker holds one chunk at a time."""
+    spooled = SpooledWorkbook(str(path), 0, directory / f"{source_no}.products", directory / f"{source_no}.prices")
+    with spooled.products_path.open("w", encoding="utf-8", newline="") as products, spooled.prices_path.open(
+        "w", encoding="utf-8", newline=""
+    ) as prices:
+        for chunk_no, batch in enumerate(parse_workbook(path, reader)):
+            products.writelines(copy_text_line(row) for row in staged_product_rows(batch, source_no, chunk_no))
+            prices.writelines(copy_text_line(row) for row in staged_price_rows(batch, source_no, chunk_no))
+            spooled.rows += batch.rows
+    return spooled
+
+
+def stage_workbooks(cur, paths: List[Path], reader: str, workers: int) -> int:
+    """Parse workbooks and COPY them into the staging tables; returns the number of product rows.
+
+    In-process parsing copies each chunk as soon as it is parsed. With several workbooks and
+    workers, each worker process spools its workbook to temp files that are copied in ``paths``
+    order, so neither side keeps more than a chunk of parsed rows in memory.
+    """
+    total = 0
+    if workers <= 1 or len(paths) == 1:
+        for source_no, path in enumerate(paths):
+            rows = 0
+            for chunk_no, batch in enumerate(parse_workbook(path, reader)):
+                stage_batch(cur, batch, source_no, chunk_no)
+                rows += batch.rows
+            print(f"Parsed {rows} product rows from '{path}'.")
+            total += rows
+        return total
+
+    with tempfile.TemporaryDirectory(prefix="import_excel_") as directory, ProcessPoolExecutor(
+        max_workers=min(workers, len(paths))
+    ) as pool:
+        spooled_workbooks = pool.map(
+            spool_workbook,
+            range(len(paths)),
+            paths,
+            itertools.repeat(reader),
+            itertools.repeat(Path(directory)),
+        )
+        for spooled in spooled_workbooks:
+            with spooled.products_path.open(encoding="utf-8") as products, spooled.prices_path.open(
+                encoding="utf-8"
+            ) as prices:
+                copy_staged(cur, products, prices)
+            spooled.products_path.unlink()
+            spooled.prices_path.unlink()
+            print(f"Parsed {spooled.rows} product rows from '{spooled.source}'.")
+            total += spooled.rows
+    return total
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Import suppliers, products, and prices from Excel.")
-    parser.add_argument("--excel", required=True, type=Path, help="Path to the Excel file to import.")
+    parser.add_argument(
+        "--excel",
+        required=True,
+        help="Excel file, directory of workbooks, or glob pattern (e.g. 'imports/ИТОГ *.xlsx').",
+    )
     parser.add_argument(
         "--env",
         type=Path,
@@ -444,10 +941,34 @@ def main() -> None:
         type=int,
         help="Override the database port.",
     )
+    parser.add_argument(
+        "--mode",
+        choices=("copy", "rows"),
+        default="copy",
+        help="'copy' stages rows with COPY and merges them set-based (default); 'rows' resolves products one by one.",
+    )
+    parser.add_argument(
+        "--reader",
+        choices=("stream", "pandas"),
+        default="stream",
+        help="'stream' reads the sheet lazily with openpyxl (default); 'pandas' loads it into a DataFrame.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes used to parse several workbooks in copy mode (defaults to the CPU count).",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="In copy mode, rewrite every supplier price even if it is unchanged since the last import.",
+    )
     args = parser.parse_args()
 
-    if not args.excel.is_file():
-        print(f"Excel file '{args.excel}' does not exist.", file=sys.stderr)
+    workbooks = resolve_workbooks(args.excel)
+    if not workbooks:
+        print(f"No Excel files found at '{args.excel}'.", file=sys.stderr)
         sys.exit(1)
 
     load_environment(args.env)
@@ -459,17 +980,47 @@ def main() -> None:
     prepared_url = prepare_connection_url(database_url, args.host, args.port)
     print(f"Using DATABASE_URL: {mask_connection_url(prepared_url)}")
 
-    supplier_row, header_row, data = read_excel(args.excel)
-    suppliers = extract_suppliers(supplier_row, header_row)
-    if not suppliers:
-        print("No suppliers found in the Excel header.", file=sys.stderr)
-        sys.exit(1)
+    if args.mode == "rows":
+        sources = []
+        for path in workbooks:
+            supplier_row, header_row, rows = open_excel(path, args.reader)
+            suppliers = extract_suppliers(supplier_row, header_row)
+            if not suppliers:
+                print(f"No suppliers found in the Excel header of '{path}'.", file=sys.stderr)
+                sys.exit(1)
+            sources.append((rows, suppliers))
 
     conn = psycopg2.connect(prepared_url)
     try:
-        ensure_schema(conn)
-        products_count, price_count = import_data(conn, data, suppliers)
-        print(f"Processed {products_count} product rows and upserted {price_count} supplier price entries.")
+        stamped, expected = schema_revisions(conn)
+        if stamped != expected:
+            print(
+                f"Database schema is at {', '.join(sorted(stamped)) or 'no revision'}, "
+                f"expected {', '.join(sorted(expected))}; run `flask --app main setup` first.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        if args.mode == "copy":
+            cur = conn.cursor()
+            create_staging(cur)
+            try:
+                parsed_rows = stage_workbooks(cur, workbooks, args.reader, args.workers)
+            except ValueError as exc:
+                print(str(exc), file=sys.stderr)
+                sys.exit(1)
+            summary = write_staged(conn, full=args.full)
+            print(
+                f"Processed {parsed_rows} product rows ({summary.products_inserted} new products). "
+                f"Supplier prices: {summary.prices_inserted} inserted, {summary.prices_updated} updated, "
+                f"{summary.prices_unchanged} unchanged."
+            )
+        else:
+            products_count = price_count = 0
+            for rows, suppliers in sources:
+                file_products, file_prices = import_data(conn, rows, suppliers)
+                products_count += file_products
+                price_count += file_prices
+            print(f"Processed {products_count} product rows and upserted {price_count} supplier price entries.")
     finally:
         conn.close()
 